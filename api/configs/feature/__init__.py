@@ -74,6 +74,16 @@ class AppExecutionConfig(BaseSettings):
         description="Maximum number of requests per app per day",
         default=5000,
     )
+    ANNOTATION_REPLY_EXACT_MATCH_MAX_ANNOTATIONS: NonNegativeInt = Field(
+        description="Apps with up to this many annotations answer queries that match an annotated question"
+        " (ignoring whitespace) from an in-memory table, without embedding the query. Set to 0 to disable",
+        default=1000,
+    )
+    CONVERSATION_HISTORY_CACHE_SIZE: NonNegativeInt = Field(
+        description="Maximum number of conversations per process whose history message files are cached between"
+        " turns, so a turn only loads the files of new messages. Set to 0 to disable",
+        default=256,
+    )
 
 
 class CodeExecutionSandboxConfig(BaseSettings):
@@ -639,6 +649,12 @@ class AuthConfig(BaseSettings):
         default=86400,
     )
 
+    SERVICE_API_AUTH_CACHE_TTL: NonNegativeInt = Field(
+        description="Time (in seconds) the service API keeps the validated API token, its workspace and owner cached,"
+        " deleted API tokens are revoked at once. Set to 0 to disable the cache",
+        default=60,
+    )
+
 
 class ModerationConfig(BaseSettings):
     """
@@ -650,6 +666,17 @@ class ModerationConfig(BaseSettings):
         default=300,
     )
 
+    MODERATION_WINDOW_ENABLED: bool = Field(
+        description="Only send the unchecked tail of streamed outputs to moderation instead of the whole answer,"
+        " in windows of at least MODERATION_BUFFER_SIZE characters",
+        default=False,
+    )
+
+    MODERATION_WINDOW_OVERLAP_SIZE: NonNegativeInt = Field(
+        description="Size (in characters) of the already checked text prepended to each moderation window",
+        default=50,
+    )
+
 
 class ToolConfig(BaseSettings):
     """
@@ -661,6 +688,21 @@ class ToolConfig(BaseSettings):
         default=3600,
     )
 
+    MCP_CLIENT_POOL_MAX_IDLE_PER_SERVER: NonNegativeInt = Field(
+        description="Maximum number of idle MCP client sessions kept per tenant and MCP server, 0 to disable pooling",
+        default=4,
+    )
+
+    MCP_CLIENT_POOL_IDLE_TIMEOUT: PositiveInt = Field(
+        description="Time (in seconds) after which an idle MCP client session is closed",
+        default=300,
+    )
+
+    MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL: NonNegativeInt = Field(
+        description="Time (in seconds) a MCP client session can stay idle before it is pinged on reuse",
+        default=30,
+    )
+
 
 class MailConfig(BaseSettings):
     """
@@ -760,6 +802,23 @@ class RagEtlConfig(BaseSettings):
         default="false",
     )
 
+    PDF_EXTRACTION_CACHE_ENABLED: bool = Field(
+        description="Cache the text extracted from PDF files in storage, keyed by file content, so estimating,"
+        " previewing and indexing the same file extract it only once",
+        default=True,
+    )
+
+    PDF_EXTRACTION_MAX_WORKERS: NonNegativeInt = Field(
+        description="Number of worker processes extracting the pages of large PDF files in parallel,"
+        " 0 or 1 to extract pages in the calling process",
+        default=0,
+    )
+
+    PDF_EXTRACTION_PARALLEL_MIN_PAGES: PositiveInt = Field(
+        description="Minimum number of pages of a PDF file to extract it with PDF_EXTRACTION_MAX_WORKERS processes",
+        default=200,
+    )
+
 
 class DataSetConfig(BaseSettings):
     """
@@ -823,6 +882,33 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    QA_GENERATION_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of concurrent LLM calls generating Q&A pairs for one document in Q&A mode",
+        default=10,
+    )
+
+    QA_GENERATION_MAX_RETRIES: NonNegativeInt = Field(
+        description="Number of retries with exponential backoff of a failed Q&A generation call for a chunk",
+        default=2,
+    )
+
+    QA_GENERATION_TENANT_RATE_LIMIT: NonNegativeInt = Field(
+        description="Maximum number of Q&A generation calls per minute per workspace, 0 for no limit",
+        default=0,
+    )
+
+    INDEXING_PIPELINE_BATCH_SIZE: NonNegativeInt = Field(
+        description="Number of extracted text documents (e.g. pages) cleaned, split, embedded and loaded per batch"
+        " during indexing, segments become searchable batch by batch. Set to 0 to index each document at once",
+        default=100,
+    )
+
+    DATASET_INDEXING_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of documents of a dataset indexed concurrently by one indexing task,"
+        " a failed or paused document does not stop the others. Set to 1 to index the documents one by one",
+        default=1,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -830,6 +916,12 @@ class MultiModalTransferConfig(BaseSettings):
         default="base64",
     )
 
+    MULTIMODAL_ENCODED_FILE_CACHE_SIZE: NonNegativeInt = Field(
+        description="Maximum total size in bytes of base64 encoded files cached per process for sending to models,"
+        " 0 to disable the cache",
+        default=32 * 1024 * 1024,
+    )
+
 
 class CeleryBeatConfig(BaseSettings):
     CELERY_BEAT_SCHEDULER_TIME: int = Field(
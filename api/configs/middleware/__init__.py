@@ -94,6 +94,12 @@ class VectorStoreConfig(BaseSettings):
         default="Vector_index",
     )
 
+    VECTOR_CREATE_PIPELINE_DEPTH: NonNegativeInt = Field(
+        description="Number of embedded batches that may wait to be written to the vector database while the next"
+        " batch is being embedded. Set to 0 to embed and write batches strictly one after another.",
+        default=1,
+    )
+
 
 class KeywordStoreConfig(BaseSettings):
     KEYWORD_STORE: str = Field(
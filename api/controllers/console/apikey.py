@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import Forbidden
 
+from core.helper.api_token_cache import ApiTokenCache
 from extensions.ext_database import db
 from libs.helper import TimestampField
 from libs.login import login_required
@@ -127,6 +128,8 @@ class BaseApiKeyResource(Resource):
 
         if key is None:
             flask_restful.abort(404, message="API key not found")
+        else:
+            ApiTokenCache(key.token, key.type).delete()
 
         db.session.query(ApiToken).where(ApiToken.id == api_key_id).delete()
         db.session.commit()
@@ -17,6 +17,7 @@ from controllers.console.wraps import (
     setup_required,
 )
 from core.errors.error import LLMBadRequestError, ProviderTokenNotInitError
+from core.helper.api_token_cache import ApiTokenCache
 from core.indexing_runner import IndexingRunner
 from core.model_runtime.entities.model_entities import ModelType
 from core.plugin.entities.plugin import ModelProviderID
@@ -630,6 +631,8 @@ class DatasetApiDeleteApi(Resource):
 
         if key is None:
             flask_restful.abort(404, message="API key not found")
+        else:
+            ApiTokenCache(key.token, key.type).delete()
 
         db.session.query(ApiToken).where(ApiToken.id == api_key_id).delete()
         db.session.commit()
@@ -1,6 +1,5 @@
 import time
 from collections.abc import Callable
-from datetime import timedelta
 from enum import Enum
 from functools import wraps
 from typing import Optional
@@ -13,6 +12,7 @@ from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import Forbidden, NotFound, Unauthorized
 
+from core.helper.api_token_cache import ApiTokenAuthContext, ApiTokenCache
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
 from libs.datetime_utils import naive_utc_now
@@ -60,26 +60,7 @@ def validate_app_token(view: Optional[Callable] = None, *, fetch_user_arg: Optio
             if tenant.status == TenantStatus.ARCHIVE:
                 raise Forbidden("The workspace's status is archived.")
 
-            tenant_account_join = (
-                db.session.query(Tenant, TenantAccountJoin)
-                .where(Tenant.id == api_token.tenant_id)
-                .where(TenantAccountJoin.tenant_id == Tenant.id)
-                .where(TenantAccountJoin.role.in_(["owner"]))
-                .where(Tenant.status == TenantStatus.NORMAL)
-                .one_or_none()
-            )  # TODO: only owner information is required, so only one is returned.
-            if tenant_account_join:
-                tenant, ta = tenant_account_join
-                account = db.session.query(Account).where(Account.id == ta.account_id).first()
-                # Login admin
-                if account:
-                    account.current_tenant = tenant
-                    current_app.login_manager._update_request_context_with_user(account)  # type: ignore
-                    user_logged_in.send(current_app._get_current_object(), user=_get_user())  # type: ignore
-                else:
-                    raise Unauthorized("Tenant owner account does not exist.")
-            else:
-                raise Unauthorized("Tenant does not exist.")
+            login_tenant_owner(api_token)
 
             kwargs["app_model"] = app_model
 
@@ -211,26 +192,7 @@ def validate_dataset_token(view=None):
         @wraps(view)
         def decorated(*args, **kwargs):
             api_token = validate_and_get_api_token("dataset")
-            tenant_account_join = (
-                db.session.query(Tenant, TenantAccountJoin)
-                .where(Tenant.id == api_token.tenant_id)
-                .where(TenantAccountJoin.tenant_id == Tenant.id)
-                .where(TenantAccountJoin.role.in_(["owner"]))
-                .where(Tenant.status == TenantStatus.NORMAL)
-                .one_or_none()
-            )  # TODO: only owner information is required, so only one is returned.
-            if tenant_account_join:
-                tenant, ta = tenant_account_join
-                account = db.session.query(Account).where(Account.id == ta.account_id).first()
-                # Login admin
-                if account:
-                    account.current_tenant = tenant
-                    current_app.login_manager._update_request_context_with_user(account)  # type: ignore
-                    user_logged_in.send(current_app._get_current_object(), user=_get_user())  # type: ignore
-                else:
-                    raise Unauthorized("Tenant owner account does not exist.")
-            else:
-                raise Unauthorized("Tenant does not exist.")
+            login_tenant_owner(api_token)
             return view(api_token.tenant_id, *args, **kwargs)
 
         return decorated
@@ -243,7 +205,25 @@ def validate_dataset_token(view=None):
     return decorator
 
 
-def validate_and_get_api_token(scope: str | None = None):
+def login_tenant_owner(api_token: ApiTokenAuthContext) -> None:
+    """
+    Login the owner of the API token's workspace.
+    """
+    tenant = db.session.get(Tenant, api_token.tenant_id)
+    if not tenant or tenant.status != TenantStatus.NORMAL or not api_token.owner_account_id:
+        raise Unauthorized("Tenant does not exist.")
+
+    account = db.session.get(Account, api_token.owner_account_id)
+    # Login admin
+    if account:
+        account.current_tenant = tenant
+        current_app.login_manager._update_request_context_with_user(account)  # type: ignore
+        user_logged_in.send(current_app._get_current_object(), user=_get_user())  # type: ignore
+    else:
+        raise Unauthorized("Tenant owner account does not exist.")
+
+
+def validate_and_get_api_token(scope: str | None = None) -> ApiTokenAuthContext:
     """
     Validate and get API token.
     """
@@ -257,33 +237,47 @@ def validate_and_get_api_token(scope: str | None = None):
     if auth_scheme != "bearer":
         raise Unauthorized("Authorization scheme must be 'Bearer'")
 
-    current_time = naive_utc_now()
-    cutoff_time = current_time - timedelta(minutes=1)
-    with Session(db.engine, expire_on_commit=False) as session:
-        update_stmt = (
-            update(ApiToken)
-            .where(
-                ApiToken.token == auth_token,
-                (ApiToken.last_used_at.is_(None) | (ApiToken.last_used_at < cutoff_time)),
-                ApiToken.type == scope,
+    api_token_cache = ApiTokenCache(auth_token, scope)
+    api_token = api_token_cache.get()
+    if api_token is None:
+        with Session(db.engine) as session:
+            token = session.scalar(select(ApiToken).where(ApiToken.token == auth_token, ApiToken.type == scope))
+            if not token:
+                raise Unauthorized("Access token is invalid")
+            if not token.tenant_id:
+                raise Unauthorized("Tenant does not exist.")
+
+            owner_account_id = session.scalar(
+                select(TenantAccountJoin.account_id)
+                .where(TenantAccountJoin.tenant_id == token.tenant_id, TenantAccountJoin.role == "owner")
+                .limit(1)
             )
-            .values(last_used_at=current_time)
-            .returning(ApiToken)
-        )
-        result = session.execute(update_stmt)
-        api_token = result.scalar_one_or_none()
+            api_token = ApiTokenAuthContext(
+                id=token.id,
+                type=token.type,
+                tenant_id=token.tenant_id,
+                app_id=token.app_id,
+                owner_account_id=owner_account_id,
+            )
+        api_token_cache.set(api_token)
 
-        if not api_token:
-            stmt = select(ApiToken).where(ApiToken.token == auth_token, ApiToken.type == scope)
-            api_token = session.scalar(stmt)
-            if not api_token:
-                raise Unauthorized("Access token is invalid")
-        else:
-            session.commit()
+    update_api_token_last_used_at(api_token.id)
 
     return api_token
 
 
+def update_api_token_last_used_at(api_token_id: str) -> None:
+    """
+    Update the last used time of the API token, at most once a minute per token.
+    """
+    if not redis_client.set(f"api_token_last_used_at_lock:{api_token_id}", 1, ex=60, nx=True):
+        return
+
+    with Session(db.engine) as session:
+        session.execute(update(ApiToken).where(ApiToken.id == api_token_id).values(last_used_at=naive_utc_now()))
+        session.commit()
+
+
 def create_or_update_end_user_for_user_id(app_model: App, user_id: Optional[str] = None) -> EndUser:
     """
     Create or update session terminal based on user ID.
@@ -258,6 +258,16 @@ class TextToSpeechEntity(BaseModel):
     language: Optional[str] = None
 
 
+class StreamChunkCoalescingEntity(BaseModel):
+    """
+    Stream Chunk Coalescing Entity.
+    """
+
+    enabled: bool
+    window_ms: int = 20
+    max_chars: int = 256
+
+
 class TracingConfigEntity(BaseModel):
     """
     Tracing Config Entity.
@@ -276,6 +286,7 @@ class AppAdditionalFeatures(BaseModel):
     more_like_this: bool = False
     speech_to_text: bool = False
     text_to_speech: Optional[TextToSpeechEntity] = None
+    stream_chunk_coalescing: Optional[StreamChunkCoalescingEntity] = None
     trace_config: Optional[TracingConfigEntity] = None
 
 
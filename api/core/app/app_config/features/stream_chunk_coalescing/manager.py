@@ -0,0 +1,53 @@
+from core.app.app_config.entities import StreamChunkCoalescingEntity
+
+
+class StreamChunkCoalescingConfigManager:
+    @classmethod
+    def convert(cls, config: dict):
+        """
+        Convert model config to model config
+
+        :param config: model config args
+        """
+        stream_chunk_coalescing = None
+        stream_chunk_coalescing_dict = config.get("stream_chunk_coalescing")
+        if stream_chunk_coalescing_dict:
+            if stream_chunk_coalescing_dict.get("enabled"):
+                stream_chunk_coalescing = StreamChunkCoalescingEntity(
+                    enabled=stream_chunk_coalescing_dict.get("enabled"),
+                    window_ms=stream_chunk_coalescing_dict.get("window_ms", 20),
+                    max_chars=stream_chunk_coalescing_dict.get("max_chars", 256),
+                )
+
+        return stream_chunk_coalescing
+
+    @classmethod
+    def validate_and_set_defaults(cls, config: dict) -> tuple[dict, list[str]]:
+        """
+        Validate and set defaults for stream chunk coalescing feature
+
+        :param config: app model config args
+        """
+        if not config.get("stream_chunk_coalescing"):
+            config["stream_chunk_coalescing"] = {"enabled": False}
+
+        if not isinstance(config["stream_chunk_coalescing"], dict):
+            raise ValueError("stream_chunk_coalescing must be of dict type")
+
+        if "enabled" not in config["stream_chunk_coalescing"] or not config["stream_chunk_coalescing"]["enabled"]:
+            config["stream_chunk_coalescing"]["enabled"] = False
+
+        if not isinstance(config["stream_chunk_coalescing"]["enabled"], bool):
+            raise ValueError("enabled in stream_chunk_coalescing must be of boolean type")
+
+        config["stream_chunk_coalescing"].setdefault("window_ms", 20)
+        window_ms = config["stream_chunk_coalescing"]["window_ms"]
+        if not isinstance(window_ms, int) or isinstance(window_ms, bool) or window_ms < 0:
+            raise ValueError("window_ms in stream_chunk_coalescing must be a non-negative integer")
+
+        config["stream_chunk_coalescing"].setdefault("max_chars", 256)
+        max_chars = config["stream_chunk_coalescing"]["max_chars"]
+        if not isinstance(max_chars, int) or isinstance(max_chars, bool) or max_chars <= 0:
+            raise ValueError("max_chars in stream_chunk_coalescing must be a positive integer")
+
+        return config, ["stream_chunk_coalescing"]
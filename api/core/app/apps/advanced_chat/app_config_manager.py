@@ -5,6 +5,7 @@ from core.app.app_config.features.file_upload.manager import FileUploadConfigMan
 from core.app.app_config.features.opening_statement.manager import OpeningStatementConfigManager
 from core.app.app_config.features.retrieval_resource.manager import RetrievalResourceConfigManager
 from core.app.app_config.features.speech_to_text.manager import SpeechToTextConfigManager
+from core.app.app_config.features.stream_chunk_coalescing.manager import StreamChunkCoalescingConfigManager
 from core.app.app_config.features.suggested_questions_after_answer.manager import (
     SuggestedQuestionsAfterAnswerConfigManager,
 )
@@ -73,6 +74,10 @@ class AdvancedChatAppConfigManager(BaseAppConfigManager):
         config, current_related_config_keys = TextToSpeechConfigManager.validate_and_set_defaults(config)
         related_config_keys.extend(current_related_config_keys)
 
+        # stream_chunk_coalescing
+        config, current_related_config_keys = StreamChunkCoalescingConfigManager.validate_and_set_defaults(config)
+        related_config_keys.extend(current_related_config_keys)
+
         # return retriever resource
         config, current_related_config_keys = RetrievalResourceConfigManager.validate_and_set_defaults(config)
         related_config_keys.extend(current_related_config_keys)
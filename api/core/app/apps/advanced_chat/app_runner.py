@@ -59,6 +59,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
             queue_manager=queue_manager,
             variable_loader=variable_loader,
             app_id=application_generate_entity.app_config.app_id,
+            stream_chunk_coalescing=application_generate_entity.app_config.additional_features.stream_chunk_coalescing,
         )
         self.application_generate_entity = application_generate_entity
         self.conversation = conversation
@@ -144,7 +145,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
             )
 
             # init graph
-            graph = self._init_graph(graph_config=self._workflow.graph_dict)
+            graph = self._init_graph(graph_config=self._workflow.graph_dict, workflow_id=self._workflow.id)
 
         db.session.close()
 
@@ -173,6 +174,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
 
         for event in generator:
             self._handle_event(workflow_entry, event)
+        self._flush_text_chunk()
 
     def handle_input_moderation(
         self,
@@ -1,9 +1,11 @@
 import queue
 import time
 from abc import abstractmethod
+from collections.abc import Mapping
 from enum import Enum
 from typing import Any, Optional
 
+from pydantic import BaseModel
 from sqlalchemy.orm import DeclarativeMeta
 
 from configs import dify_config
@@ -96,7 +98,9 @@ class AppQueueManager:
         :param pub_from:
         :return:
         """
-        self._check_for_sqlalchemy_models(event.model_dump())
+        # the check walks the whole payload of the event, so it only runs in debug mode
+        if dify_config.DEBUG:
+            self._check_for_sqlalchemy_models(event)
         self._publish(event, pub_from)
 
     @abstractmethod
@@ -157,11 +161,14 @@ class AppQueueManager:
         return f"generate_task_stopped:{task_id}"
 
     def _check_for_sqlalchemy_models(self, data: Any):
-        # from entity to dict or list
-        if isinstance(data, dict):
-            for key, value in data.items():
+        # walk the fields of entities in place instead of dumping them to dict
+        if isinstance(data, BaseModel):
+            for field_name in type(data).model_fields:
+                self._check_for_sqlalchemy_models(getattr(data, field_name))
+        elif isinstance(data, Mapping):
+            for value in data.values():
                 self._check_for_sqlalchemy_models(value)
-        elif isinstance(data, list):
+        elif isinstance(data, list | tuple | set):
             for item in data:
                 self._check_for_sqlalchemy_models(item)
         else:
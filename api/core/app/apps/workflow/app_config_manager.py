@@ -2,6 +2,7 @@ from core.app.app_config.base_app_config_manager import BaseAppConfigManager
 from core.app.app_config.common.sensitive_word_avoidance.manager import SensitiveWordAvoidanceConfigManager
 from core.app.app_config.entities import WorkflowUIBasedAppConfig
 from core.app.app_config.features.file_upload.manager import FileUploadConfigManager
+from core.app.app_config.features.stream_chunk_coalescing.manager import StreamChunkCoalescingConfigManager
 from core.app.app_config.features.text_to_speech.manager import TextToSpeechConfigManager
 from core.app.app_config.workflow_ui_based_app.variables.manager import WorkflowVariablesConfigManager
 from models.model import App, AppMode
@@ -53,6 +54,10 @@ class WorkflowAppConfigManager(BaseAppConfigManager):
         config, current_related_config_keys = TextToSpeechConfigManager.validate_and_set_defaults(config)
         related_config_keys.extend(current_related_config_keys)
 
+        # stream_chunk_coalescing
+        config, current_related_config_keys = StreamChunkCoalescingConfigManager.validate_and_set_defaults(config)
+        related_config_keys.extend(current_related_config_keys)
+
         # moderation validation
         config, current_related_config_keys = SensitiveWordAvoidanceConfigManager.validate_and_set_defaults(
             tenant_id=tenant_id, config=config, only_structure_validate=only_structure_validate
@@ -39,6 +39,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
             queue_manager=queue_manager,
             variable_loader=variable_loader,
             app_id=application_generate_entity.app_config.app_id,
+            stream_chunk_coalescing=application_generate_entity.app_config.additional_features.stream_chunk_coalescing,
         )
         self.application_generate_entity = application_generate_entity
         self.workflow_thread_pool_id = workflow_thread_pool_id
@@ -93,7 +94,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
             )
 
             # init graph
-            graph = self._init_graph(graph_config=self._workflow.graph_dict)
+            graph = self._init_graph(graph_config=self._workflow.graph_dict, workflow_id=self._workflow.id)
 
         # RUN WORKFLOW
         workflow_entry = WorkflowEntry(
@@ -119,3 +120,4 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
 
         for event in generator:
             self._handle_event(workflow_entry, event)
+        self._flush_text_chunk()
@@ -1,6 +1,8 @@
+import time
 from collections.abc import Mapping
-from typing import Any, cast
+from typing import Any, Optional
 
+from core.app.app_config.entities import StreamChunkCoalescingEntity
 from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
 from core.app.entities.queue_entities import (
     AppQueueEvent,
@@ -74,14 +76,18 @@ class WorkflowBasedAppRunner:
         queue_manager: AppQueueManager,
         variable_loader: VariableLoader = DUMMY_VARIABLE_LOADER,
         app_id: str,
+        stream_chunk_coalescing: Optional[StreamChunkCoalescingEntity] = None,
     ) -> None:
         self._queue_manager = queue_manager
         self._variable_loader = variable_loader
         self._app_id = app_id
+        self._stream_chunk_coalescing = stream_chunk_coalescing
+        self._pending_text_chunk: Optional[QueueTextChunkEvent] = None
+        self._pending_text_chunk_started_at = 0.0
 
-    def _init_graph(self, graph_config: Mapping[str, Any]) -> Graph:
+    def _init_graph(self, graph_config: Mapping[str, Any], workflow_id: Optional[str] = None) -> Graph:
         """
-        Init graph
+        Init graph, the graph is shared between runs of the same workflow graph when workflow_id is given
         """
         if "nodes" not in graph_config or "edges" not in graph_config:
             raise ValueError("nodes or edges not found in workflow graph")
@@ -92,7 +98,7 @@ class WorkflowBasedAppRunner:
         if not isinstance(graph_config.get("edges"), list):
             raise ValueError("edges in workflow graph must be a list")
         # init graph
-        graph = Graph.init(graph_config=graph_config)
+        graph = Graph.init_cached(workflow_id=workflow_id, graph_config=graph_config)
 
         if not graph:
             raise ValueError("graph not found in workflow")
@@ -113,7 +119,8 @@ class WorkflowBasedAppRunner:
         if not graph_config:
             raise ValueError("workflow graph not found")
 
-        graph_config = cast(dict[str, Any], graph_config)
+        # the graph of the workflow is shared, filter nodes and edges on a copy
+        graph_config = dict(graph_config)
 
         if "nodes" not in graph_config or "edges" not in graph_config:
             raise ValueError("nodes or edges not found in workflow graph")
@@ -210,7 +217,8 @@ class WorkflowBasedAppRunner:
         if not graph_config:
             raise ValueError("workflow graph not found")
 
-        graph_config = cast(dict[str, Any], graph_config)
+        # the graph of the workflow is shared, filter nodes and edges on a copy
+        graph_config = dict(graph_config)
 
         if "nodes" not in graph_config or "edges" not in graph_config:
             raise ValueError("nodes or edges not found in workflow graph")
@@ -298,6 +306,10 @@ class WorkflowBasedAppRunner:
         :param workflow_entry: workflow entry
         :param event: event
         """
+        if not isinstance(event, NodeRunStreamChunkEvent):
+            # keep the order of events, merged text chunks are published before the next event
+            self._flush_text_chunk()
+
         if isinstance(event, GraphRunStartedEvent):
             self._publish_event(
                 QueueWorkflowStartedEvent(graph_runtime_state=workflow_entry.graph_engine.graph_runtime_state)
@@ -517,7 +529,7 @@ class WorkflowBasedAppRunner:
                 )
             )
         elif isinstance(event, NodeRunStreamChunkEvent):
-            self._publish_event(
+            self._publish_text_chunk(
                 QueueTextChunkEvent(
                     text=event.chunk_content,
                     from_variable_selector=event.from_variable_selector,
@@ -696,3 +708,40 @@ class WorkflowBasedAppRunner:
 
     def _publish_event(self, event: AppQueueEvent) -> None:
         self._queue_manager.publish(event, PublishFrom.APPLICATION_MANAGER)
+
+    def _publish_text_chunk(self, event: QueueTextChunkEvent) -> None:
+        """
+        Publish text chunk, consecutive chunks of the same variable are merged when the app enables
+        stream chunk coalescing, until the window or the size limit is reached
+        """
+        coalescing = self._stream_chunk_coalescing
+        if not coalescing or not coalescing.enabled:
+            self._publish_event(event)
+            return
+
+        pending = self._pending_text_chunk
+        if (
+            pending is not None
+            and pending.from_variable_selector == event.from_variable_selector
+            and pending.in_iteration_id == event.in_iteration_id
+            and pending.in_loop_id == event.in_loop_id
+        ):
+            pending.text += event.text
+        else:
+            self._flush_text_chunk()
+            pending = self._pending_text_chunk = event
+            self._pending_text_chunk_started_at = time.perf_counter()
+
+        if (
+            len(pending.text) >= coalescing.max_chars
+            or (time.perf_counter() - self._pending_text_chunk_started_at) * 1000 >= coalescing.window_ms
+        ):
+            self._flush_text_chunk()
+
+    def _flush_text_chunk(self) -> None:
+        """
+        Publish the merged text chunk that is pending, if any
+        """
+        if self._pending_text_chunk is not None:
+            pending, self._pending_text_chunk = self._pending_text_chunk, None
+            self._publish_event(pending)
@@ -0,0 +1,82 @@
+import threading
+from typing import Optional
+
+from cachetools import LRUCache
+
+from configs import dify_config
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.model import MessageAnnotation
+
+
+class AnnotationReplyIndex:
+    """
+    In-process table of the normalized annotation questions of an app, to answer exact matches without
+    embedding the query.
+
+    Every process keeps the version of the table it built, the version in redis is bumped by `invalidate`
+    whenever the annotations of the app change.
+    """
+
+    _VERSION_KEY = "annotation_reply_index_version:{}"
+    # app id -> (version, normalized question -> annotation id), None when the app has too many annotations
+    _tables: LRUCache = LRUCache(maxsize=256)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    @classmethod
+    def get_annotation_id(cls, app_id: str, query: str) -> Optional[str]:
+        """
+        Get the id of the annotation whose question matches the query, ignoring whitespace.
+        """
+        max_annotations = dify_config.ANNOTATION_REPLY_EXACT_MATCH_MAX_ANNOTATIONS
+        if not max_annotations:
+            return None
+
+        # read the version before loading, a change committed meanwhile only causes another rebuild
+        version = redis_client.get(cls._VERSION_KEY.format(app_id)) or b"0"
+        with cls._lock:
+            cached = cls._tables.get(app_id)
+
+        table: Optional[dict[str, str]]
+        if cached is not None and cached[0] == version:
+            table = cached[1]
+        else:
+            table = cls._load_table(app_id, max_annotations)
+            with cls._lock:
+                cls._tables[app_id] = (version, table)
+
+        if table is None:
+            return None
+        return table.get(cls.normalize(query))
+
+    @classmethod
+    def invalidate(cls, app_id: str) -> None:
+        """
+        Invalidate the tables of the app in all processes, called after its annotations change.
+        """
+        redis_client.incr(cls._VERSION_KEY.format(app_id))
+        with cls._lock:
+            cls._tables.pop(app_id, None)
+
+    @classmethod
+    def _load_table(cls, app_id: str, max_annotations: int) -> Optional[dict[str, str]]:
+        annotations = (
+            db.session.query(MessageAnnotation.id, MessageAnnotation.question)
+            .where(MessageAnnotation.app_id == app_id)
+            .order_by(MessageAnnotation.created_at.desc())
+            .limit(max_annotations + 1)
+            .all()
+        )
+        if len(annotations) > max_annotations:
+            return None
+
+        table: dict[str, str] = {}
+        for annotation_id, question in annotations:
+            if question:
+                # the newest annotation wins when questions are duplicated
+                table.setdefault(cls.normalize(question), annotation_id)
+        return table
@@ -2,6 +2,7 @@ import logging
 from typing import Optional
 
 from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.features.annotation_reply.annotation_index import AnnotationReplyIndex
 from core.rag.datasource.vdb.vector_factory import Vector
 from extensions.ext_database import db
 from models.dataset import Dataset
@@ -32,35 +33,14 @@ class AnnotationReplyFeature:
         if not annotation_setting:
             return None
 
-        collection_binding_detail = annotation_setting.collection_binding_detail
-
         try:
-            score_threshold = annotation_setting.score_threshold or 1
-            embedding_provider_name = collection_binding_detail.provider_name
-            embedding_model_name = collection_binding_detail.model_name
-
-            dataset_collection_binding = DatasetCollectionBindingService.get_dataset_collection_binding(
-                embedding_provider_name, embedding_model_name, "annotation"
-            )
-
-            dataset = Dataset(
-                id=app_record.id,
-                tenant_id=app_record.tenant_id,
-                indexing_technique="high_quality",
-                embedding_model_provider=embedding_provider_name,
-                embedding_model=embedding_model_name,
-                collection_binding_id=dataset_collection_binding.id,
-            )
-
-            vector = Vector(dataset, attributes=["doc_id", "annotation_id", "app_id"])
-
-            documents = vector.search_by_vector(
-                query=query, top_k=1, score_threshold=score_threshold, filter={"group_id": [dataset.id]}
-            )
-
-            if documents and documents[0].metadata:
-                annotation_id = documents[0].metadata["annotation_id"]
-                score = documents[0].metadata["score"]
+            # verbatim repeats of an annotated question are answered without embedding the query
+            annotation_id = AnnotationReplyIndex.get_annotation_id(app_record.id, query)
+            score = 1.0
+            if not annotation_id:
+                annotation_id, score = self._search_annotation(app_record, annotation_setting, query)
+
+            if annotation_id:
                 annotation = AppAnnotationService.get_annotation_by_id(annotation_id)
                 if annotation:
                     if invoke_from in {InvokeFrom.SERVICE_API, InvokeFrom.WEB_APP}:
@@ -87,3 +67,39 @@ class AnnotationReplyFeature:
             return None
 
         return None
+
+    def _search_annotation(
+        self, app_record: App, annotation_setting: AppAnnotationSetting, query: str
+    ) -> tuple[Optional[str], float]:
+        """
+        Search the annotation most similar to the query in the annotation vector index
+        :return: annotation id and score
+        """
+        collection_binding_detail = annotation_setting.collection_binding_detail
+
+        score_threshold = annotation_setting.score_threshold or 1
+        embedding_provider_name = collection_binding_detail.provider_name
+        embedding_model_name = collection_binding_detail.model_name
+
+        dataset_collection_binding = DatasetCollectionBindingService.get_dataset_collection_binding(
+            embedding_provider_name, embedding_model_name, "annotation"
+        )
+
+        dataset = Dataset(
+            id=app_record.id,
+            tenant_id=app_record.tenant_id,
+            indexing_technique="high_quality",
+            embedding_model_provider=embedding_provider_name,
+            embedding_model=embedding_model_name,
+            collection_binding_id=dataset_collection_binding.id,
+        )
+
+        vector = Vector(dataset, attributes=["doc_id", "annotation_id", "app_id"])
+
+        documents = vector.search_by_vector(
+            query=query, top_k=1, score_threshold=score_threshold, filter={"group_id": [dataset.id]}
+        )
+
+        if documents and documents[0].metadata:
+            return documents[0].metadata["annotation_id"], documents[0].metadata["score"]
+        return None, 0.0
@@ -1,22 +1,39 @@
 import logging
+import threading
 import time
 import uuid
 from collections.abc import Generator, Mapping
 from datetime import timedelta
-from typing import Any, Optional, Union
+from typing import Any, NoReturn, Optional, Union
 
 from core.errors.error import AppInvokeQuotaExceededError
 from extensions.ext_redis import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Remove the stale requests, check the limit and add the request in one round trip.
+# KEYS[1]: sorted set of active request ids scored by their start time
+# ARGV: now, max alive time of a request, max active requests, request id, ttl of the key
+# Returns the number of active requests including the new one, or 0 when the limit is reached.
+ENTER_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+local count = redis.call('ZCARD', KEYS[1])
+if count >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return count + 1
+"""
+
 
 class RateLimit:
     _MAX_ACTIVE_REQUESTS_KEY = "dify:rate_limit:{}:max_active_requests"
-    _ACTIVE_REQUESTS_KEY = "dify:rate_limit:{}:active_requests"
+    _ACTIVE_REQUESTS_KEY = "dify:rate_limit:{}:active_requests_by_start_time"
     _UNLIMITED_REQUEST_ID = "unlimited_request_id"
     _REQUEST_MAX_ALIVE_TIME = 10 * 60  # 10 minutes
-    _ACTIVE_REQUESTS_COUNT_FLUSH_INTERVAL = 5 * 60  # recalculate request_count from request_detail every 5 minutes
+    _ACTIVE_REQUESTS_KEY_TTL = 24 * 60 * 60  # 1 day
+    _ACTIVE_REQUESTS_COUNT_FLUSH_INTERVAL = 5 * 60  # sync max_active_requests from redis every 5 minutes
     _instance_dict: dict[str, "RateLimit"] = {}
 
     def __new__(cls: type["RateLimit"], client_id: str, max_active_requests: int):
@@ -37,6 +54,10 @@ class RateLimit:
         self.active_requests_key = self._ACTIVE_REQUESTS_KEY.format(client_id)
         self.max_active_requests_key = self._MAX_ACTIVE_REQUESTS_KEY.format(client_id)
         self.last_recalculate_time = float("-inf")
+        # start times of the requests admitted by this process
+        self._local_requests: dict[str, float] = {}
+        self._local_requests_lock = threading.Lock()
+        self._enter_script = redis_client.register_script(ENTER_SCRIPT)
         self.flush_cache(use_local_value=True)
 
     def flush_cache(self, use_local_value=False):
@@ -50,40 +71,59 @@ class RateLimit:
             self.max_active_requests = int(redis_client.get(self.max_active_requests_key).decode("utf-8"))
             redis_client.expire(self.max_active_requests_key, timedelta(days=1))
 
-        # flush max active requests (in-transit request list)
-        if not redis_client.exists(self.active_requests_key):
-            return
-        request_details = redis_client.hgetall(self.active_requests_key)
-        redis_client.expire(self.active_requests_key, timedelta(days=1))
-        timeout_requests = [
-            k
-            for k, v in request_details.items()
-            if time.time() - float(v.decode("utf-8")) > RateLimit._REQUEST_MAX_ALIVE_TIME
-        ]
-        if timeout_requests:
-            redis_client.hdel(self.active_requests_key, *timeout_requests)
-
     def enter(self, request_id: Optional[str] = None) -> str:
         if self.disabled():
             return RateLimit._UNLIMITED_REQUEST_ID
-        if time.time() - self.last_recalculate_time > RateLimit._ACTIVE_REQUESTS_COUNT_FLUSH_INTERVAL:
+        now = time.time()
+        if now - self.last_recalculate_time > RateLimit._ACTIVE_REQUESTS_COUNT_FLUSH_INTERVAL:
             self.flush_cache()
         if not request_id:
             request_id = RateLimit.gen_request_key()
 
-        active_requests_count = redis_client.hlen(self.active_requests_key)
-        if active_requests_count >= self.max_active_requests:
-            raise AppInvokeQuotaExceededError(
-                f"Too many requests. Please try again later. The current maximum concurrent requests allowed "
-                f"for {self.client_id} is {self.max_active_requests}."
-            )
-        redis_client.hset(self.active_requests_key, request_id, str(time.time()))
+        # the requests of this process alone reach the limit, no need to ask redis
+        if self._count_local_requests(now) >= self.max_active_requests:
+            self._raise_quota_exceeded()
+
+        admitted = self._enter_script(
+            keys=[self.active_requests_key],
+            args=[
+                now,
+                RateLimit._REQUEST_MAX_ALIVE_TIME,
+                self.max_active_requests,
+                request_id,
+                self._ACTIVE_REQUESTS_KEY_TTL,
+            ],
+        )
+        if not admitted:
+            self._raise_quota_exceeded()
+
+        with self._local_requests_lock:
+            self._local_requests[request_id] = now
         return request_id
 
     def exit(self, request_id: str):
         if request_id == RateLimit._UNLIMITED_REQUEST_ID:
             return
-        redis_client.hdel(self.active_requests_key, request_id)
+        with self._local_requests_lock:
+            self._local_requests.pop(request_id, None)
+        redis_client.zrem(self.active_requests_key, request_id)
+
+    def _count_local_requests(self, now: float) -> int:
+        with self._local_requests_lock:
+            expired = [
+                request_id
+                for request_id, started_at in self._local_requests.items()
+                if now - started_at > RateLimit._REQUEST_MAX_ALIVE_TIME
+            ]
+            for request_id in expired:
+                del self._local_requests[request_id]
+            return len(self._local_requests)
+
+    def _raise_quota_exceeded(self) -> NoReturn:
+        raise AppInvokeQuotaExceededError(
+            f"Too many requests. Please try again later. The current maximum concurrent requests allowed "
+            f"for {self.client_id} is {self.max_active_requests}."
+        )
 
     def disabled(self):
         return self.max_active_requests <= 0
@@ -1,6 +1,10 @@
 import base64
+import contextlib
+import threading
 from collections.abc import Mapping
 
+from cachetools import LRUCache
+
 from configs import dify_config
 from core.helper import ssrf_proxy
 from core.model_runtime.entities import (
@@ -18,6 +22,15 @@ from . import helpers
 from .enums import FileAttribute
 from .models import File, FileTransferMethod, FileType
 
+# base64 encodes every 3 bytes separately, so the content can be encoded in chunks of a multiple of 3 bytes
+_BASE64_BLOCK_SIZE = 3
+
+# Encoded content of stored files by storage key, sized by the length of the encoded string.
+_encoded_file_cache: LRUCache[str, str] = LRUCache(
+    maxsize=dify_config.MULTIMODAL_ENCODED_FILE_CACHE_SIZE, getsizeof=len
+)
+_encoded_file_cache_lock = threading.Lock()
+
 
 def get_attr(*, file: File, attr: FileAttribute):
     match attr:
@@ -133,14 +146,53 @@ def _get_encoded_string(f: File, /):
             response.raise_for_status()
             data = response.content
         case FileTransferMethod.LOCAL_FILE:
-            data = _download_file_content(f._storage_key)
+            return _get_encoded_file_content(f._storage_key)
         case FileTransferMethod.TOOL_FILE:
-            data = _download_file_content(f._storage_key)
+            return _get_encoded_file_content(f._storage_key)
 
     encoded_string = base64.b64encode(data).decode("utf-8")
     return encoded_string
 
 
+def _get_encoded_file_content(path: str, /) -> str:
+    """
+    Get the base64 encoded content of a file in storage.
+
+    Stored files are not modified after they are saved, so the encoded content is cached by storage key,
+    e.g. for the same image sent in every turn of a conversation.
+    """
+    if dify_config.MULTIMODAL_ENCODED_FILE_CACHE_SIZE <= 0:
+        return _encode_file_content(path)
+
+    with _encoded_file_cache_lock:
+        encoded_string = _encoded_file_cache.get(path)
+    if encoded_string is not None:
+        return encoded_string
+
+    encoded_string = _encode_file_content(path)
+    with _encoded_file_cache_lock, contextlib.suppress(ValueError):
+        # raises ValueError if the file alone is larger than the cache
+        _encoded_file_cache[path] = encoded_string
+    return encoded_string
+
+
+def _encode_file_content(path: str, /) -> str:
+    """
+    Base64 encode a file in storage while streaming it, the raw content is not loaded as a whole.
+    """
+    encoded_chunks: list[str] = []
+    remainder = b""
+    for chunk in storage.load(path, stream=True):
+        if remainder:
+            chunk = remainder + chunk
+        size = len(chunk) - len(chunk) % _BASE64_BLOCK_SIZE
+        encoded_chunks.append(base64.b64encode(memoryview(chunk)[:size]).decode("utf-8"))
+        remainder = bytes(chunk[size:])
+    if remainder:
+        encoded_chunks.append(base64.b64encode(remainder).decode("utf-8"))
+    return "".join(encoded_chunks)
+
+
 def _to_url(f: File, /):
     if f.transfer_method == FileTransferMethod.REMOTE_URL:
         if f.remote_url is None:
@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+from pydantic import BaseModel, ValidationError
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+
+# entries of other processes are not revoked, so they are kept for a few seconds only
+LOCAL_CACHE_TTL = 5
+
+_local_cache: TTLCache = TTLCache(maxsize=4096, ttl=LOCAL_CACHE_TTL)
+_local_cache_lock = threading.Lock()
+
+
+class ApiTokenAuthContext(BaseModel):
+    """
+    Validated API token with the ids the service API needs to authenticate a request.
+    """
+
+    id: str
+    type: str
+    tenant_id: str
+    app_id: Optional[str] = None
+    owner_account_id: Optional[str] = None
+
+
+class ApiTokenCache:
+    def __init__(self, token: str, scope: Optional[str]):
+        # the token itself is a secret, only its hash is used in the key
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        self.cache_key = f"api_token_auth:{scope}:{token_hash}"
+
+    def get(self) -> Optional[ApiTokenAuthContext]:
+        """
+        Get the cached auth context of the token, the in-process cache is checked before redis.
+
+        :return:
+        """
+        if not dify_config.SERVICE_API_AUTH_CACHE_TTL:
+            return None
+
+        with _local_cache_lock:
+            auth_context: Optional[ApiTokenAuthContext] = _local_cache.get(self.cache_key)
+        if auth_context is not None:
+            return auth_context
+
+        cached_auth_context = redis_client.get(self.cache_key)
+        if not cached_auth_context:
+            return None
+        try:
+            auth_context = ApiTokenAuthContext.model_validate_json(cached_auth_context)
+        except ValidationError:
+            return None
+
+        with _local_cache_lock:
+            _local_cache[self.cache_key] = auth_context
+        return auth_context
+
+    def set(self, auth_context: ApiTokenAuthContext) -> None:
+        """Cache the auth context of the token."""
+        if not dify_config.SERVICE_API_AUTH_CACHE_TTL:
+            return
+
+        redis_client.setex(self.cache_key, dify_config.SERVICE_API_AUTH_CACHE_TTL, auth_context.model_dump_json())
+        with _local_cache_lock:
+            _local_cache[self.cache_key] = auth_context
+
+    def delete(self) -> None:
+        """
+        Revoke the cached auth context of the token.
+
+        :return:
+        """
+        redis_client.delete(self.cache_key)
+        with _local_cache_lock:
+            _local_cache.pop(self.cache_key, None)
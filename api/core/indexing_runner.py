@@ -6,6 +6,7 @@ import re
 import threading
 import time
 import uuid
+from collections.abc import Generator
 from typing import Any, Optional, cast
 
 from flask import current_app
@@ -38,6 +39,7 @@ from libs import helper
 from models.dataset import ChildChunk, Dataset, DatasetProcessRule, DocumentSegment
 from models.dataset import Document as DatasetDocument
 from models.model import UploadFile
+from services.entities.knowledge_entities.knowledge_entities import ParentMode
 from services.feature_service import FeatureService
 
 
@@ -69,20 +71,34 @@ class IndexingRunner:
                 # extract
                 text_docs = self._extract(index_processor, dataset_document, processing_rule.to_dict())
 
-                # transform
-                documents = self._transform(
-                    index_processor, dataset, text_docs, dataset_document.doc_language, processing_rule.to_dict()
-                )
-                # save segment
-                self._load_segments(dataset, dataset_document, documents)
-
-                # load
-                self._load(
-                    index_processor=index_processor,
-                    dataset=dataset,
-                    dataset_document=dataset_document,
-                    documents=documents,
-                )
+                # transform, save segments and load batch by batch
+                indexing_latency = 0.0
+                tokens = 0
+                for batch_index, documents in enumerate(
+                    self._transform_batches(
+                        index_processor,
+                        dataset,
+                        text_docs,
+                        dataset_document.doc_language,
+                        processing_rule.to_dict(),
+                    )
+                ):
+                    # save segment
+                    self._load_segments(
+                        dataset, dataset_document, documents, update_document_status=batch_index == 0, only_new=True
+                    )
+
+                    # load
+                    indexing_start_at = time.perf_counter()
+                    tokens += self._load_documents(
+                        index_processor=index_processor,
+                        dataset=dataset,
+                        dataset_document=dataset_document,
+                        documents=documents,
+                    )
+                    indexing_latency += time.perf_counter() - indexing_start_at
+
+                self._complete_document(dataset_document, tokens, indexing_latency)
             except DocumentIsPausedError:
                 raise DocumentIsPausedError(f"Document paused, document id: {dataset_document.id}")
             except ProviderTokenNotInitError as e:
@@ -523,18 +539,23 @@ class IndexingRunner:
         """
         insert index and update document/segment status to completed
         """
+        indexing_start_at = time.perf_counter()
+        tokens = self._load_documents(index_processor, dataset, dataset_document, documents)
+        indexing_end_at = time.perf_counter()
 
-        embedding_model_instance = None
-        if dataset.indexing_technique == "high_quality":
-            embedding_model_instance = self.model_manager.get_model_instance(
-                tenant_id=dataset.tenant_id,
-                provider=dataset.embedding_model_provider,
-                model_type=ModelType.TEXT_EMBEDDING,
-                model=dataset.embedding_model,
-            )
+        self._complete_document(dataset_document, tokens, indexing_end_at - indexing_start_at)
 
+    def _load_documents(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset: Dataset,
+        dataset_document: DatasetDocument,
+        documents: list[Document],
+    ) -> int:
+        """
+        insert index and update segment status to completed, return the number of tokens embedded
+        """
         # chunk nodes by chunk size
-        indexing_start_at = time.perf_counter()
         tokens = 0
         if dataset_document.doc_form != IndexType.PARENT_CHILD_INDEX and dataset.indexing_technique == "economy":
             # create keyword index
@@ -568,7 +589,6 @@ class IndexingRunner:
                             chunk_documents,
                             dataset,
                             dataset_document,
-                            embedding_model_instance,
                         )
                     )
 
@@ -576,8 +596,10 @@ class IndexingRunner:
                     tokens += future.result()
         if dataset_document.doc_form != IndexType.PARENT_CHILD_INDEX and dataset.indexing_technique == "economy":
             create_keyword_thread.join()
-        indexing_end_at = time.perf_counter()
 
+        return tokens
+
+    def _complete_document(self, dataset_document: DatasetDocument, tokens: int, indexing_latency: float) -> None:
         # update document status to completed
         self._update_document_index_status(
             document_id=dataset_document.id,
@@ -585,7 +607,7 @@ class IndexingRunner:
             extra_update_params={
                 DatasetDocument.tokens: tokens,
                 DatasetDocument.completed_at: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
-                DatasetDocument.indexing_latency: indexing_end_at - indexing_start_at,
+                DatasetDocument.indexing_latency: indexing_latency,
                 DatasetDocument.error: None,
             },
         )
@@ -615,20 +637,13 @@ class IndexingRunner:
 
                 db.session.commit()
 
-    def _process_chunk(
-        self, flask_app, index_processor, chunk_documents, dataset, dataset_document, embedding_model_instance
-    ):
+    def _process_chunk(self, flask_app, index_processor, chunk_documents, dataset, dataset_document):
         with flask_app.app_context():
             # check document is paused
             self._check_document_paused_status(dataset_document.id)
 
-            tokens = 0
-            if embedding_model_instance:
-                page_content_list = [document.page_content for document in chunk_documents]
-                tokens += sum(embedding_model_instance.get_text_embedding_num_tokens(page_content_list))
-
-            # load index
-            index_processor.load(dataset, chunk_documents, with_keywords=False)
+            # load index, the tokens are taken from the embedding usage
+            tokens = index_processor.load(dataset, chunk_documents, with_keywords=False)
 
             document_ids = [document.metadata["doc_id"] for document in chunk_documents]
             db.session.query(DocumentSegment).where(
@@ -718,7 +733,42 @@ class IndexingRunner:
 
         return documents
 
-    def _load_segments(self, dataset, dataset_document, documents):
+    def _transform_batches(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset: Dataset,
+        text_docs: list[Document],
+        doc_language: str,
+        process_rule: dict,
+    ) -> Generator[list[Document], None, None]:
+        """
+        Transform the text documents in batches of INDEXING_PIPELINE_BATCH_SIZE, the next batch is only
+        cleaned and split once the caller has loaded the previous one.
+        """
+        batch_size = dify_config.INDEXING_PIPELINE_BATCH_SIZE
+        rules = process_rule.get("rules") or {}
+        # full doc parent chunks are built from all the text documents at once
+        if batch_size <= 0 or len(text_docs) <= batch_size or rules.get("parent_mode") == ParentMode.FULL_DOC:
+            yield self._transform(index_processor, dataset, text_docs, doc_language, process_rule)
+            return
+
+        for i in range(0, len(text_docs), batch_size):
+            yield self._transform(index_processor, dataset, text_docs[i : i + batch_size], doc_language, process_rule)
+
+    def _load_segments(
+        self,
+        dataset: Dataset,
+        dataset_document: DatasetDocument,
+        documents: list[Document],
+        update_document_status: bool = True,
+        only_new: bool = False,
+    ) -> None:
+        """
+        Save the documents as segments in indexing status.
+
+        :param update_document_status: whether to move the document to indexing status
+        :param only_new: only move the given segments to indexing status instead of all segments of the document
+        """
         # save node to document segment
         doc_store = DatasetDocumentStore(
             dataset=dataset, user_id=dataset_document.created_by, document_id=dataset_document.id
@@ -728,25 +778,33 @@ class IndexingRunner:
         doc_store.add_documents(docs=documents, save_child=dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX)
 
         # update document status to indexing
-        cur_time = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
-        self._update_document_index_status(
-            document_id=dataset_document.id,
-            after_indexing_status="indexing",
-            extra_update_params={
-                DatasetDocument.cleaning_completed_at: cur_time,
-                DatasetDocument.splitting_completed_at: cur_time,
-            },
-        )
+        if update_document_status:
+            cur_time = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+            self._update_document_index_status(
+                document_id=dataset_document.id,
+                after_indexing_status="indexing",
+                extra_update_params={
+                    DatasetDocument.cleaning_completed_at: cur_time,
+                    DatasetDocument.splitting_completed_at: cur_time,
+                },
+            )
 
         # update segment status to indexing
-        self._update_segments_by_document(
-            dataset_document_id=dataset_document.id,
-            update_params={
-                DocumentSegment.status: "indexing",
-                DocumentSegment.indexing_at: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
-            },
-        )
-        pass
+        update_params = {
+            DocumentSegment.status: "indexing",
+            DocumentSegment.indexing_at: datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+        }
+        if not only_new:
+            self._update_segments_by_document(dataset_document_id=dataset_document.id, update_params=update_params)
+            return
+
+        document_ids = [document.metadata["doc_id"] for document in documents if document.metadata]
+        if document_ids:
+            db.session.query(DocumentSegment).where(
+                DocumentSegment.document_id == dataset_document.id,
+                DocumentSegment.index_node_id.in_(document_ids),
+            ).update(update_params)  # type: ignore
+            db.session.commit()
 
 
 class DocumentIsPausedError(Exception):
@@ -140,6 +140,13 @@ class MCPClient:
         tools = response.tools
         return tools
 
+    def ping(self) -> None:
+        """Check that the session is still alive"""
+        if not self._initialized or not self._session:
+            raise ValueError("Session not initialized.")
+        self._session.check_receiver_status()
+        self._session.send_ping()
+
     def invoke_tool(self, tool_name: str, tool_args: dict):
         """Call a tool"""
         if not self._initialized or not self._session:
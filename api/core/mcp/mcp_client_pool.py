@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from configs import dify_config
+from core.mcp.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MCPClientPoolKey:
+    tenant_id: str
+    provider_id: str
+    server_url: str
+    headers: tuple[tuple[str, str], ...] = ()
+    timeout: Optional[float] = None
+    sse_read_timeout: Optional[float] = None
+
+
+@dataclass
+class _IdleClient:
+    client: MCPClient
+    last_used_at: float
+
+
+class MCPClientPool:
+    """
+    Pool of initialized MCP client sessions, grouped by tenant and server.
+
+    A session is lent to one caller at a time, the MCP client session does not support concurrent requests.
+    Idle sessions are closed after `idle_timeout` seconds, and sessions idle for more than
+    `health_check_interval` seconds are pinged before being lent out again.
+    """
+
+    def __init__(self, max_idle_per_key: int, idle_timeout: float, health_check_interval: float) -> None:
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._idle_clients: dict[MCPClientPoolKey, list[_IdleClient]] = {}
+
+    @contextmanager
+    def client(
+        self, key: MCPClientPoolKey, client_factory: Callable[[], MCPClient]
+    ) -> Generator[MCPClient, None, None]:
+        """
+        Borrow an initialized client for the key, a new one is created with client_factory if none is idle.
+
+        The client is returned to the pool when the block exits normally, and closed if the block raises.
+        """
+        if self.max_idle_per_key <= 0:
+            with client_factory() as mcp_client:
+                yield mcp_client
+            return
+
+        mcp_client = self._acquire(key)
+        if mcp_client is None:
+            mcp_client = client_factory()
+            mcp_client.__enter__()
+
+        try:
+            yield mcp_client
+        except BaseException:
+            self._close(mcp_client)
+            raise
+
+        self._release(key, mcp_client)
+
+    def remove(self, tenant_id: str, provider_id: str) -> None:
+        """
+        Close all idle clients of a provider, e.g. after its server url or credentials changed.
+        """
+        with self._lock:
+            keys = [key for key in self._idle_clients if key.tenant_id == tenant_id and key.provider_id == provider_id]
+            removed = [idle for key in keys for idle in self._idle_clients.pop(key)]
+
+        for idle in removed:
+            self._close(idle.client)
+
+    def clear(self) -> None:
+        with self._lock:
+            removed = [idle for idle_clients in self._idle_clients.values() for idle in idle_clients]
+            self._idle_clients.clear()
+
+        for idle in removed:
+            self._close(idle.client)
+
+    def _acquire(self, key: MCPClientPoolKey) -> Optional[MCPClient]:
+        now = time.monotonic()
+        expired = self._pop_expired(now)
+        for idle in expired:
+            self._close(idle.client)
+
+        while True:
+            with self._lock:
+                idle_clients = self._idle_clients.get(key)
+                if not idle_clients:
+                    return None
+                # reuse the most recently used client, it is the most likely to be alive
+                idle = idle_clients.pop()
+
+            if now - idle.last_used_at < self.health_check_interval:
+                return idle.client
+
+            try:
+                idle.client.ping()
+                return idle.client
+            except Exception:
+                logger.debug("Idle MCP client failed the health check, provider_id: %s", key.provider_id)
+                self._close(idle.client)
+
+    def _release(self, key: MCPClientPoolKey, mcp_client: MCPClient) -> None:
+        with self._lock:
+            idle_clients = self._idle_clients.setdefault(key, [])
+            if len(idle_clients) < self.max_idle_per_key:
+                idle_clients.append(_IdleClient(client=mcp_client, last_used_at=time.monotonic()))
+                return
+
+        self._close(mcp_client)
+
+    def _pop_expired(self, now: float) -> list[_IdleClient]:
+        expired: list[_IdleClient] = []
+        with self._lock:
+            for key in list(self._idle_clients):
+                alive = []
+                for idle in self._idle_clients[key]:
+                    if now - idle.last_used_at >= self.idle_timeout:
+                        expired.append(idle)
+                    else:
+                        alive.append(idle)
+                if alive:
+                    self._idle_clients[key] = alive
+                else:
+                    del self._idle_clients[key]
+        return expired
+
+    @staticmethod
+    def _close(mcp_client: MCPClient) -> None:
+        try:
+            mcp_client.cleanup()
+        except Exception:
+            logger.debug("Error closing MCP client", exc_info=True)
+
+
+mcp_client_pool = MCPClientPool(
+    max_idle_per_key=dify_config.MCP_CLIENT_POOL_MAX_IDLE_PER_SERVER,
+    idle_timeout=dify_config.MCP_CLIENT_POOL_IDLE_TIMEOUT,
+    health_check_interval=dify_config.MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL,
+)
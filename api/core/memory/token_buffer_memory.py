@@ -1,10 +1,15 @@
+import threading
+from collections import defaultdict
 from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Optional
 
+from cachetools import TTLCache
 from sqlalchemy import select
 
+from configs import dify_config
 from core.app.app_config.features.file_upload.manager import FileUploadConfigManager
-from core.file import file_manager
+from core.file import File, FileUploadConfig, file_manager
 from core.model_manager import ModelInstance
 from core.model_runtime.entities import (
     AssistantPromptMessage,
@@ -18,9 +23,44 @@ from core.model_runtime.entities.message_entities import PromptMessageContentUni
 from core.prompt.utils.extract_thread_messages import extract_thread_messages
 from extensions.ext_database import db
 from factories import file_factory
-from models.model import AppMode, Conversation, Message, MessageFile
+from models.model import App, AppMode, Conversation, Message, MessageFile
 from models.workflow import Workflow, WorkflowRun
 
+# the cached history of a conversation expires when the conversation has no turns for this many seconds
+_HISTORY_CACHE_TTL = 600
+
+
+@dataclass(frozen=True)
+class _MessageFiles:
+    """
+    The files sent along with a query of the conversation history.
+    """
+
+    files: Sequence[File] = ()
+    image_detail: ImagePromptMessageContent.DETAIL = ImagePromptMessageContent.DETAIL.LOW
+
+    def to_user_prompt_message(self, query: str) -> UserPromptMessage:
+        if not self.files:
+            return UserPromptMessage(content=query)
+
+        prompt_message_contents: list[PromptMessageContentUnionTypes] = [
+            file_manager.to_prompt_message_content(file, image_detail_config=self.image_detail) for file in self.files
+        ]
+        prompt_message_contents.append(TextPromptMessageContent(data=query))
+        return UserPromptMessage(content=prompt_message_contents)
+
+
+_NO_FILES = _MessageFiles()
+
+# Files of the history messages of recent conversations by message id.
+# The files of a message are saved with its answer and the file upload config of a conversation does not change,
+# so they are only loaded for the messages added since the previous turn. The query and answer are always taken
+# from the loaded messages.
+_history_files_cache: TTLCache[str, dict[str, _MessageFiles]] = TTLCache(
+    maxsize=dify_config.CONVERSATION_HISTORY_CACHE_SIZE, ttl=_HISTORY_CACHE_TTL
+)
+_history_files_cache_lock = threading.Lock()
+
 
 class TokenBufferMemory:
     def __init__(
@@ -65,67 +105,131 @@ class TokenBufferMemory:
 
         messages = list(reversed(thread_messages))
 
+        cached_files = self._get_cached_files()
+        loaded_files = self._load_message_files(
+            app_record, [message for message in messages if message.id not in cached_files]
+        )
+        history_files: dict[str, _MessageFiles] = {}
         prompt_messages: list[PromptMessage] = []
         for message in messages:
-            files = db.session.query(MessageFile).where(MessageFile.message_id == message.id).all()
-            if files:
-                file_extra_config = None
-                if self.conversation.mode in {AppMode.AGENT_CHAT, AppMode.COMPLETION, AppMode.CHAT}:
-                    file_extra_config = FileUploadConfigManager.convert(self.conversation.model_config)
-                elif self.conversation.mode in {AppMode.ADVANCED_CHAT, AppMode.WORKFLOW}:
-                    workflow_run = db.session.scalar(
-                        select(WorkflowRun).where(WorkflowRun.id == message.workflow_run_id)
-                    )
-                    if not workflow_run:
-                        raise ValueError(f"Workflow run not found: {message.workflow_run_id}")
-                    workflow = db.session.scalar(select(Workflow).where(Workflow.id == workflow_run.workflow_id))
-                    if not workflow:
-                        raise ValueError(f"Workflow not found: {workflow_run.workflow_id}")
-                    file_extra_config = FileUploadConfigManager.convert(workflow.features_dict, is_vision=False)
-                else:
-                    raise AssertionError(f"Invalid app mode: {self.conversation.mode}")
-
-                detail = ImagePromptMessageContent.DETAIL.LOW
-                if file_extra_config and app_record:
-                    file_objs = file_factory.build_from_message_files(
-                        message_files=files, tenant_id=app_record.tenant_id, config=file_extra_config
-                    )
-                    if file_extra_config.image_config and file_extra_config.image_config.detail:
-                        detail = file_extra_config.image_config.detail
-                else:
-                    file_objs = []
-
-                if not file_objs:
-                    prompt_messages.append(UserPromptMessage(content=message.query))
-                else:
-                    prompt_message_contents: list[PromptMessageContentUnionTypes] = []
-                    for file in file_objs:
-                        prompt_message = file_manager.to_prompt_message_content(
-                            file,
-                            image_detail_config=detail,
-                        )
-                        prompt_message_contents.append(prompt_message)
-                    prompt_message_contents.append(TextPromptMessageContent(data=message.query))
-
-                    prompt_messages.append(UserPromptMessage(content=prompt_message_contents))
-
-            else:
-                prompt_messages.append(UserPromptMessage(content=message.query))
+            message_files = cached_files.get(message.id) or loaded_files[message.id]
+            # messages without an answer may be still running, their files may not be saved yet
+            if message.answer:
+                history_files[message.id] = message_files
 
+            prompt_messages.append(message_files.to_user_prompt_message(message.query))
             prompt_messages.append(AssistantPromptMessage(content=message.answer))
 
+        # only the messages of the current thread are kept, e.g. the ones replaced by regenerated messages are dropped
+        self._set_cached_files(history_files)
+
         if not prompt_messages:
             return []
 
-        # prune the chat message if it exceeds the max token limit
-        curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+        return self._prune_prompt_messages(prompt_messages, max_token_limit)
 
-        if curr_message_tokens > max_token_limit:
-            while curr_message_tokens > max_token_limit and len(prompt_messages) > 1:
-                prompt_messages.pop(0)
-                curr_message_tokens = self.model_instance.get_llm_num_tokens(prompt_messages)
+    def _load_message_files(self, app_record: Optional[App], messages: Sequence[Message]) -> dict[str, _MessageFiles]:
+        """
+        Load the files of the messages with a single query, and resolve their file upload configs once.
+        """
+        if not messages:
+            return {}
+
+        files_by_message_id: defaultdict[str, list[MessageFile]] = defaultdict(list)
+        stmt = select(MessageFile).where(MessageFile.message_id.in_([message.id for message in messages]))
+        for message_file in db.session.scalars(stmt).all():
+            files_by_message_id[message_file.message_id].append(message_file)
 
-        return prompt_messages
+        messages_with_files = [message for message in messages if message.id in files_by_message_id]
+        file_extra_configs = self._get_file_extra_configs(messages_with_files)
+
+        loaded_files = dict.fromkeys((message.id for message in messages), _NO_FILES)
+        for message in messages_with_files:
+            file_extra_config = file_extra_configs[message.id]
+            detail = ImagePromptMessageContent.DETAIL.LOW
+            if file_extra_config and app_record:
+                file_objs = file_factory.build_from_message_files(
+                    message_files=files_by_message_id[message.id],
+                    tenant_id=app_record.tenant_id,
+                    config=file_extra_config,
+                )
+                if file_extra_config.image_config and file_extra_config.image_config.detail:
+                    detail = file_extra_config.image_config.detail
+            else:
+                file_objs = []
+
+            loaded_files[message.id] = _MessageFiles(files=file_objs, image_detail=detail)
+
+        return loaded_files
+
+    def _get_file_extra_configs(self, messages: Sequence[Message]) -> dict[str, Optional[FileUploadConfig]]:
+        """
+        Get the file upload config of each message, chat apps use the config of the conversation and workflow apps
+        the config of the workflow that answered the message.
+        """
+        if not messages:
+            return {}
+
+        if self.conversation.mode in {AppMode.AGENT_CHAT, AppMode.COMPLETION, AppMode.CHAT}:
+            file_extra_config = FileUploadConfigManager.convert(self.conversation.model_config)
+            return dict.fromkeys((message.id for message in messages), file_extra_config)
+
+        if self.conversation.mode not in {AppMode.ADVANCED_CHAT, AppMode.WORKFLOW}:
+            raise AssertionError(f"Invalid app mode: {self.conversation.mode}")
+
+        workflow_run_ids = list({message.workflow_run_id for message in messages if message.workflow_run_id})
+        workflow_ids_by_run_id: dict[str, str] = dict(
+            db.session.execute(
+                select(WorkflowRun.id, WorkflowRun.workflow_id).where(WorkflowRun.id.in_(workflow_run_ids))
+            ).tuples()
+        )
+        workflows = db.session.scalars(
+            select(Workflow).where(Workflow.id.in_(list(set(workflow_ids_by_run_id.values()))))
+        ).all()
+        file_extra_configs_by_workflow_id = {
+            workflow.id: FileUploadConfigManager.convert(workflow.features_dict, is_vision=False)
+            for workflow in workflows
+        }
+
+        file_extra_configs: dict[str, Optional[FileUploadConfig]] = {}
+        for message in messages:
+            workflow_id = workflow_ids_by_run_id.get(message.workflow_run_id) if message.workflow_run_id else None
+            if not workflow_id:
+                raise ValueError(f"Workflow run not found: {message.workflow_run_id}")
+            if workflow_id not in file_extra_configs_by_workflow_id:
+                raise ValueError(f"Workflow not found: {workflow_id}")
+            file_extra_configs[message.id] = file_extra_configs_by_workflow_id[workflow_id]
+        return file_extra_configs
+
+    def _get_cached_files(self) -> dict[str, _MessageFiles]:
+        if dify_config.CONVERSATION_HISTORY_CACHE_SIZE <= 0:
+            return {}
+        with _history_files_cache_lock:
+            return _history_files_cache.get(self.conversation.id) or {}
+
+    def _set_cached_files(self, history_files: dict[str, _MessageFiles]) -> None:
+        if dify_config.CONVERSATION_HISTORY_CACHE_SIZE <= 0:
+            return
+        with _history_files_cache_lock:
+            _history_files_cache[self.conversation.id] = history_files
+
+    def _prune_prompt_messages(self, prompt_messages: list[PromptMessage], max_token_limit: int) -> list[PromptMessage]:
+        """
+        Remove the oldest messages until the remaining ones fit in the max token limit, the last message is kept.
+        """
+        if len(prompt_messages) <= 1 or self.model_instance.get_llm_num_tokens(prompt_messages) <= max_token_limit:
+            return prompt_messages
+
+        # fewer messages have fewer tokens, so the first message to keep is found with a binary search
+        # instead of counting the tokens again after every removed message
+        low, high = 1, len(prompt_messages) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.model_instance.get_llm_num_tokens(prompt_messages[middle:]) <= max_token_limit:
+                high = middle
+            else:
+                low = middle + 1
+        return prompt_messages[low:]
 
     def get_history_prompt_text(
         self,
@@ -1,7 +1,7 @@
-from collections.abc import Sequence
-from typing import Any
+from typing import Any, Optional
 
 from core.moderation.base import Moderation, ModerationAction, ModerationInputsResult, ModerationOutputsResult
+from core.moderation.keywords.matcher import KeywordsMatcher, KeywordsStreamMatcher, get_keywords_matcher
 
 
 class KeywordsModeration(Moderation):
@@ -40,10 +40,7 @@ class KeywordsModeration(Moderation):
             if query:
                 inputs["query__"] = query
 
-            # Filter out empty values
-            keywords_list = [keyword for keyword in self.config["keywords"].split("\n") if keyword]
-
-            flagged = self._is_violated(inputs, keywords_list)
+            flagged = self._is_violated(inputs, get_keywords_matcher(self.config["keywords"]))
 
         return ModerationInputsResult(
             flagged=flagged, action=ModerationAction.DIRECT_OUTPUT, preset_response=preset_response
@@ -56,18 +53,29 @@ class KeywordsModeration(Moderation):
             raise ValueError("The config is not set.")
 
         if self.config["outputs_config"]["enabled"]:
-            # Filter out empty values
-            keywords_list = [keyword for keyword in self.config["keywords"].split("\n") if keyword]
-
-            flagged = self._is_violated({"text": text}, keywords_list)
+            flagged = self._is_violated({"text": text}, get_keywords_matcher(self.config["keywords"]))
             preset_response = self.config["outputs_config"]["preset_response"]
 
         return ModerationOutputsResult(
             flagged=flagged, action=ModerationAction.DIRECT_OUTPUT, preset_response=preset_response
         )
 
-    def _is_violated(self, inputs: dict, keywords_list: list) -> bool:
-        return any(self._check_keywords_in_value(keywords_list, value) for value in inputs.values())
+    def create_outputs_stream_matcher(self) -> Optional[KeywordsStreamMatcher]:
+        """
+        Create an incremental matcher for streamed outputs, only the newly appended text needs to be fed.
+
+        :return: the stream matcher, or None if outputs moderation is disabled
+        """
+        if self.config is None:
+            raise ValueError("The config is not set.")
+
+        if not self.config["outputs_config"]["enabled"]:
+            return None
+
+        return get_keywords_matcher(self.config["keywords"]).stream()
+
+    def _is_violated(self, inputs: dict, matcher: KeywordsMatcher) -> bool:
+        return any(self._check_keywords_in_value(matcher, value) for value in inputs.values())
 
-    def _check_keywords_in_value(self, keywords_list: Sequence[str], value: Any) -> bool:
-        return any(keyword.lower() in str(value).lower() for keyword in keywords_list)
+    def _check_keywords_in_value(self, matcher: KeywordsMatcher, value: Any) -> bool:
+        return matcher.search(str(value))
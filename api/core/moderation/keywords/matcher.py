@@ -0,0 +1,110 @@
+from collections import deque
+from collections.abc import Iterable
+from functools import lru_cache
+
+
+class KeywordsMatcher:
+    """
+    Case-insensitive Aho-Corasick automaton over a fixed set of keywords.
+    Text is compared casefolded, which unlike str.lower() gives the same result for a chunk as for the whole text.
+
+    Matching cost is linear in the length of the scanned text, independent of the number of keywords.
+    The automaton is immutable once built and can be shared between threads.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        # node 0 is the root, each node is a dict of char -> next node
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[bool] = [False]
+
+        for keyword in keywords:
+            if keyword:
+                self._add_keyword(keyword.casefold())
+
+        self._build_failure_links()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._goto[0]
+
+    def _add_keyword(self, keyword: str) -> None:
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(False)
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node] = True
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(char, 0)
+                if self._output[self._fail[next_node]]:
+                    self._output[next_node] = True
+
+    def advance(self, state: int, text: str) -> tuple[int, bool]:
+        """
+        Feed text into the automaton starting from the given state.
+
+        :param state: automaton state returned by a previous call, 0 to start from scratch
+        :param text: text to scan, will be casefolded
+        :return: the new state and whether any keyword was matched
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for char in text.casefold():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return state, True
+        return state, False
+
+    def search(self, text: str) -> bool:
+        """
+        Check whether any keyword occurs in the text.
+        """
+        if self.is_empty:
+            return False
+        return self.advance(0, text)[1]
+
+    def stream(self) -> "KeywordsStreamMatcher":
+        return KeywordsStreamMatcher(self)
+
+
+class KeywordsStreamMatcher:
+    """
+    Incremental matcher for streamed text, only the newly appended text is scanned on each feed.
+    Keywords spanning chunk boundaries are still detected.
+    """
+
+    def __init__(self, matcher: KeywordsMatcher) -> None:
+        self._matcher = matcher
+        self._state = 0
+        self.matched = False
+
+    def feed(self, text: str) -> bool:
+        if not self.matched and text and not self._matcher.is_empty:
+            self._state, self.matched = self._matcher.advance(self._state, text)
+        return self.matched
+
+
+@lru_cache(maxsize=256)
+def get_keywords_matcher(keywords: str) -> KeywordsMatcher:
+    """
+    Get the compiled matcher for a newline separated keywords config, cached per config.
+    """
+    return KeywordsMatcher(keyword for keyword in keywords.split("\n") if keyword)
@@ -4,13 +4,15 @@ import time
 from typing import Any, Optional
 
 from flask import Flask, current_app
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from configs import dify_config
 from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
 from core.app.entities.queue_entities import QueueMessageReplaceEvent
 from core.moderation.base import ModerationAction, ModerationOutputsResult
 from core.moderation.factory import ModerationFactory
+from core.moderation.keywords.keywords import KeywordsModeration
+from core.moderation.keywords.matcher import KeywordsStreamMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +31,7 @@ class OutputModeration(BaseModel):
 
     thread: Optional[threading.Thread] = None
     thread_running: bool = True
-    buffer: str = ""
+    buffer: list[str] = Field(default_factory=list)
     is_final_chunk: bool = False
     final_output: Optional[str] = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -41,13 +43,12 @@ class OutputModeration(BaseModel):
         return self.final_output or ""
 
     def append_new_token(self, token: str) -> None:
-        self.buffer += token
+        self.buffer.append(token)
 
         if not self.thread:
             self.thread = self.start_thread()
 
     def moderation_completion(self, completion: str, public_event: bool = False) -> tuple[str, bool]:
-        self.buffer = completion
         self.is_final_chunk = True
 
         result = self.moderation(tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=completion)
@@ -77,6 +78,8 @@ class OutputModeration(BaseModel):
             kwargs={
                 "flask_app": current_app._get_current_object(),  # type: ignore
                 "buffer_size": buffer_size if buffer_size > 0 else dify_config.MODERATION_BUFFER_SIZE,
+                "window_enabled": dify_config.MODERATION_WINDOW_ENABLED,
+                "window_overlap_size": dify_config.MODERATION_WINDOW_OVERLAP_SIZE,
             },
         )
 
@@ -88,23 +91,44 @@ class OutputModeration(BaseModel):
         if self.thread and self.thread.is_alive():
             self.thread_running = False
 
-    def worker(self, flask_app: Flask, buffer_size: int):
+    def worker(self, flask_app: Flask, buffer_size: int, window_enabled: bool = False, window_overlap_size: int = 0):
         with flask_app.app_context():
-            current_length = 0
+            current_chunk_count = 0
+            # raw text checked so far, the whole of it is sent when the window is disabled
+            checked_text = ""
+            # moderated text checked so far, later windows are spliced onto it when the window is enabled
+            moderated_text = ""
+            keywords_stream_matcher = self._create_keywords_stream_matcher()
             while self.thread_running:
-                moderation_buffer = self.buffer
-                buffer_length = len(moderation_buffer)
-                if not self.is_final_chunk:
-                    chunk_length = buffer_length - current_length
-                    if 0 <= chunk_length < buffer_size:
-                        time.sleep(1)
-                        continue
-
-                current_length = buffer_length
+                chunk_count = len(self.buffer)
+                new_text = "".join(self.buffer[current_chunk_count:chunk_count])
+                if len(new_text) < buffer_size and not (self.is_final_chunk and new_text):
+                    time.sleep(1)
+                    continue
 
-                result = self.moderation(
-                    tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=moderation_buffer
-                )
+                current_chunk_count = chunk_count
+
+                result: Optional[ModerationOutputsResult]
+                if keywords_stream_matcher:
+                    # keywords only need to be matched against the newly appended text
+                    result = self._keywords_moderation_for_new_text(keywords_stream_matcher, new_text)
+                elif window_enabled:
+                    # only send the unchecked tail, with some checked text before it for context
+                    overlap_text = moderated_text[-window_overlap_size:] if window_overlap_size > 0 else ""
+                    moderated_text = moderated_text[: len(moderated_text) - len(overlap_text)]
+                    moderation_buffer = overlap_text + new_text
+                    result = self.moderation(
+                        tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=moderation_buffer
+                    )
+                    if result and result.flagged and result.action == ModerationAction.OVERRIDDEN:
+                        moderated_text += result.text
+                    else:
+                        moderated_text += moderation_buffer
+                else:
+                    checked_text += new_text
+                    result = self.moderation(
+                        tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=checked_text
+                    )
 
                 if not result or not result.flagged:
                     continue
@@ -113,7 +137,8 @@ class OutputModeration(BaseModel):
                     final_output = result.preset_response
                     self.final_output = final_output
                 else:
-                    final_output = result.text + self.buffer[len(moderation_buffer) :]
+                    unchecked_text = "".join(self.buffer[current_chunk_count:])
+                    final_output = (moderated_text if window_enabled else result.text) + unchecked_text
 
                 # trigger replace event
                 if self.thread_running:
@@ -127,6 +152,30 @@ class OutputModeration(BaseModel):
                 if result.action == ModerationAction.DIRECT_OUTPUT:
                     break
 
+    def _create_keywords_stream_matcher(self) -> Optional[KeywordsStreamMatcher]:
+        if self.rule.type != KeywordsModeration.name:
+            return None
+
+        try:
+            keywords_moderation = KeywordsModeration(
+                app_id=self.app_id, tenant_id=self.tenant_id, config=self.rule.config
+            )
+            return keywords_moderation.create_outputs_stream_matcher()
+        except Exception:
+            logger.exception("Create keywords stream matcher error, app_id: %s", self.app_id)
+
+        return None
+
+    def _keywords_moderation_for_new_text(
+        self, keywords_stream_matcher: KeywordsStreamMatcher, new_text: str
+    ) -> ModerationOutputsResult:
+        flagged = keywords_stream_matcher.feed(new_text)
+        return ModerationOutputsResult(
+            flagged=flagged,
+            action=ModerationAction.DIRECT_OUTPUT,
+            preset_response=self.rule.config["outputs_config"]["preset_response"] if flagged else "",
+        )
+
     def moderation(self, tenant_id: str, app_id: str, moderation_buffer: str) -> Optional[ModerationOutputsResult]:
         try:
             moderation_factory = ModerationFactory(
@@ -1,16 +1,25 @@
 import re
 
+# control characters and U+FFFE
+INVALID_SYMBOLS_PATTERN = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F\xEF\xBF\xBE\uFFFE]")
+
+EXTRA_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+EXTRA_SPACES_PATTERN = re.compile(r"[\t\f\r\x20\u00a0\u1680\u180e\u2000-\u200a\u202f\u205f\u3000]{2,}")
+
+EMAIL_PATTERN = re.compile(r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)")
+
+MARKDOWN_IMAGE_PATTERN = re.compile(r"!\[.*?\]\((https?://[^\s)]+)\)")
+MARKDOWN_IMAGE_PLACEHOLDER_PATTERN = re.compile(r"__MARKDOWN_IMAGE_URL_(\d+)__")
+URL_PATTERN = re.compile(r"https?://[^\s)]+")
+
 
 class CleanProcessor:
     @classmethod
     def clean(cls, text: str, process_rule: dict) -> str:
         # default clean
-        # remove invalid symbol
-        text = re.sub(r"<\|", "<", text)
-        text = re.sub(r"\|>", ">", text)
-        text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F\xEF\xBF\xBE]", "", text)
-        # Unicode  U+FFFE
-        text = re.sub("\ufffe", "", text)
+        # remove invalid symbol, including Unicode U+FFFE
+        text = text.replace("<|", "<").replace("|>", ">")
+        text = INVALID_SYMBOLS_PATTERN.sub("", text)
 
         rules = process_rule["rules"] if process_rule else {}
         if "pre_processing_rules" in rules:
@@ -18,35 +27,34 @@ class CleanProcessor:
             for pre_processing_rule in pre_processing_rules:
                 if pre_processing_rule["id"] == "remove_extra_spaces" and pre_processing_rule["enabled"] is True:
                     # Remove extra spaces
-                    pattern = r"\n{3,}"
-                    text = re.sub(pattern, "\n\n", text)
-                    pattern = r"[\t\f\r\x20\u00a0\u1680\u180e\u2000-\u200a\u202f\u205f\u3000]{2,}"
-                    text = re.sub(pattern, " ", text)
+                    text = EXTRA_NEWLINES_PATTERN.sub("\n\n", text)
+                    text = EXTRA_SPACES_PATTERN.sub(" ", text)
                 elif pre_processing_rule["id"] == "remove_urls_emails" and pre_processing_rule["enabled"] is True:
                     # Remove email
-                    pattern = r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
-                    text = re.sub(pattern, "", text)
+                    text = EMAIL_PATTERN.sub("", text)
 
                     # Remove URL but keep Markdown image URLs
                     # First, temporarily replace Markdown image URLs with a placeholder
-                    markdown_image_pattern = r"!\[.*?\]\((https?://[^\s)]+)\)"
                     placeholders: list[str] = []
 
-                    def replace_with_placeholder(match, placeholders=placeholders):
-                        url = match.group(1)
+                    def replace_with_placeholder(match: re.Match, placeholders=placeholders) -> str:
                         placeholder = f"__MARKDOWN_IMAGE_URL_{len(placeholders)}__"
-                        placeholders.append(url)
+                        placeholders.append(match.group(1))
                         return f"![image]({placeholder})"
 
-                    text = re.sub(markdown_image_pattern, replace_with_placeholder, text)
+                    text = MARKDOWN_IMAGE_PATTERN.sub(replace_with_placeholder, text)
 
                     # Now remove all remaining URLs
-                    url_pattern = r"https?://[^\s)]+"
-                    text = re.sub(url_pattern, "", text)
+                    text = URL_PATTERN.sub("", text)
+
+                    # Finally, restore the Markdown image URLs in a single pass
+                    if placeholders:
+
+                        def restore_placeholder(match: re.Match[str], placeholders=placeholders) -> str:
+                            index = int(match.group(1))
+                            return placeholders[index] if index < len(placeholders) else match.group()
 
-                    # Finally, restore the Markdown image URLs
-                    for i, url in enumerate(placeholders):
-                        text = text.replace(f"__MARKDOWN_IMAGE_URL_{i}__", url)
+                        text = MARKDOWN_IMAGE_PLACEHOLDER_PATTERN.sub(restore_placeholder, text)
         return text
 
     def filter_string(self, text):
@@ -203,6 +203,21 @@ class MilvusVector(BaseVector):
 
         return len(result) > 0
 
+    def filter_existing_ids(self, ids: list[str]) -> set[str]:
+        """
+        Get the IDs that already exist in the collection with a single query.
+        """
+        if not ids or not self._client.has_collection(self._collection_name):
+            return set()
+
+        result = self._client.query(
+            collection_name=self._collection_name,
+            filter=f'metadata["doc_id"] in {ids}',
+            output_fields=[Field.METADATA_KEY.value],
+        )
+
+        return {item[Field.METADATA_KEY.value]["doc_id"] for item in result}
+
     def field_exists(self, field: str) -> bool:
         """
         Check if a field exists in the collection.
@@ -328,6 +328,17 @@ class QdrantVector(BaseVector):
 
         return len(response) > 0
 
+    def filter_existing_ids(self, ids: list[str]) -> set[str]:
+        if not ids:
+            return set()
+        if not self._client.collection_exists(self._collection_name):
+            return set()
+        response = self._client.retrieve(
+            collection_name=self._collection_name, ids=ids, with_payload=False, with_vectors=False
+        )
+
+        return {str(record.id) for record in response}
+
     def search_by_vector(self, query_vector: list[float], **kwargs: Any) -> list[Document]:
         from qdrant_client.http import models
 
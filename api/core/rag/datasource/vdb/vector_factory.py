@@ -1,8 +1,12 @@
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Optional
 
+from flask import current_app, has_app_context
+
 from configs import dify_config
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
@@ -179,22 +183,68 @@ class Vector:
             case _:
                 raise ValueError(f"Vector store {vector_type} is not supported.")
 
-    def create(self, texts: Optional[list] = None, **kwargs):
+    def create(self, texts: Optional[list] = None, **kwargs) -> int:
+        """
+        Embed and insert the documents, return the number of tokens of the embedded texts.
+
+        Documents are processed in batches, with VECTOR_CREATE_PIPELINE_DEPTH > 0 the next batch is embedded
+        while the previous ones are written to the vector database.
+        """
+        tokens = 0
         if texts:
             start = time.time()
             logger.info("start embedding %s texts %s", len(texts), start)
             batch_size = 1000
-            total_batches = len(texts) + batch_size - 1
+            total_batches = (len(texts) + batch_size - 1) // batch_size
+            pipeline_depth = dify_config.VECTOR_CREATE_PIPELINE_DEPTH
+            if pipeline_depth > 0 and total_batches > 1 and has_app_context():
+                tokens = self._create_pipelined(texts, batch_size, total_batches, pipeline_depth, **kwargs)
+            else:
+                for i in range(0, len(texts), batch_size):
+                    batch = texts[i : i + batch_size]
+                    batch_embeddings, batch_tokens = self._embed_batch(batch, i // batch_size + 1, total_batches)
+                    tokens += batch_tokens
+                    self._vector_processor.create(texts=batch, embeddings=batch_embeddings, **kwargs)
+            logger.info("Embedding %s texts took %s s", len(texts), time.time() - start)
+        return tokens
+
+    def _embed_batch(self, batch: list[Document], batch_number: int, total_batches: int) -> tuple[list, int]:
+        batch_start = time.time()
+        logger.info("Processing batch %s/%s (%s texts)", batch_number, total_batches, len(batch))
+        batch_embeddings, batch_tokens = self._embeddings.embed_documents_with_usage(
+            [document.page_content for document in batch]
+        )
+        logger.info("Embedding batch %s/%s took %s s", batch_number, total_batches, time.time() - batch_start)
+        return batch_embeddings, batch_tokens
+
+    def _create_pipelined(
+        self, texts: list[Document], batch_size: int, total_batches: int, pipeline_depth: int, **kwargs
+    ) -> int:
+        """
+        Embed batches in the calling thread and write them in order from a single writer thread,
+        at most pipeline_depth embedded batches are pending, the first failed batch raises.
+        """
+        flask_app = current_app._get_current_object()  # type: ignore
+
+        def insert(batch: list[Document], batch_embeddings: list) -> None:
+            with flask_app.app_context():
+                self._vector_processor.create(texts=batch, embeddings=batch_embeddings, **kwargs)
+
+        tokens = 0
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector_create") as executor:
             for i in range(0, len(texts), batch_size):
                 batch = texts[i : i + batch_size]
-                batch_start = time.time()
-                logger.info("Processing batch %s/%s (%s texts)", i // batch_size + 1, total_batches, len(batch))
-                batch_embeddings = self._embeddings.embed_documents([document.page_content for document in batch])
-                logger.info(
-                    "Embedding batch %s/%s took %s s", i // batch_size + 1, total_batches, time.time() - batch_start
-                )
-                self._vector_processor.create(texts=batch, embeddings=batch_embeddings, **kwargs)
-            logger.info("Embedding %s texts took %s s", len(texts), time.time() - start)
+                batch_embeddings, batch_tokens = self._embed_batch(batch, i // batch_size + 1, total_batches)
+                tokens += batch_tokens
+                while len(pending) >= pipeline_depth:
+                    pending.popleft().result()
+                pending.append(executor.submit(insert, batch, batch_embeddings))
+
+            while pending:
+                pending.popleft().result()
+
+        return tokens
 
     def add_texts(self, documents: list[Document], **kwargs):
         if kwargs.get("duplicate_check", False):
@@ -226,7 +276,7 @@ class Vector:
             collection_exist_cache_key = f"vector_indexing_{self._vector_processor.collection_name}"
             redis_client.delete(collection_exist_cache_key)
 
-    def _get_embeddings(self) -> Embeddings:
+    def _get_embeddings(self) -> CacheEmbedding:
         model_manager = ModelManager()
 
         embedding_model = model_manager.get_model_instance(
@@ -238,16 +288,18 @@ class Vector:
         return CacheEmbedding(embedding_model)
 
     def _filter_duplicate_texts(self, texts: list[Document]) -> list[Document]:
-        for text in texts.copy():
-            if text.metadata is None:
-                continue
-            doc_id = text.metadata["doc_id"]
-            if doc_id:
-                exists_duplicate_node = self.text_exists(doc_id)
-                if exists_duplicate_node:
-                    texts.remove(text)
-
-        return texts
+        doc_ids = [text.metadata["doc_id"] for text in texts if text.metadata is not None and text.metadata["doc_id"]]
+        existing_ids: set[str] = set()
+        # check the ids in bounded batches to keep each query of the vector store small
+        batch_size = 1000
+        for i in range(0, len(doc_ids), batch_size):
+            existing_ids.update(self._vector_processor.filter_existing_ids(doc_ids[i : i + batch_size]))
+
+        return [
+            text
+            for text in texts
+            if text.metadata is None or not text.metadata["doc_id"] or text.metadata["doc_id"] not in existing_ids
+        ]
 
     def __getattr__(self, name):
         if self._vector_processor is not None:
@@ -171,6 +171,26 @@ class WeaviateVector(BaseVector):
 
         return True
 
+    def filter_existing_ids(self, ids: list[str]) -> set[str]:
+        collection_name = self._collection_name
+        schema = self._default_schema(self._collection_name)
+
+        # check whether the index already exists
+        if not ids or not self._client.schema.contains(schema):
+            return set()
+        operands = [{"path": ["doc_id"], "operator": "Equal", "valueText": id} for id in ids]
+        result = (
+            self._client.query.get(collection_name, ["doc_id"])
+            .with_where({"operator": "Or", "operands": operands})
+            .with_limit(len(ids))
+            .do()
+        )
+
+        if "errors" in result:
+            raise ValueError(f"Error during query: {result['errors']}")
+
+        return {entry["doc_id"] for entry in result["data"]["Get"][collection_name]}
+
     def delete_by_ids(self, ids: list[str]) -> None:
         # check whether the index already exists
         schema = self._default_schema(self._collection_name)
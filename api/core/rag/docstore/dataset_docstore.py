@@ -5,6 +5,7 @@ from sqlalchemy import func
 
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
+from core.rag.embedding.cached_embedding import get_text_embedding_num_tokens
 from core.rag.models.document import Document
 from extensions.ext_database import db
 from models.dataset import ChildChunk, Dataset, DocumentSegment
@@ -81,7 +82,7 @@ class DatasetDocumentStore:
 
         if embedding_model:
             page_content_list = [doc.page_content for doc in docs]
-            tokens_list = embedding_model.get_text_embedding_num_tokens(page_content_list)
+            tokens_list = get_text_embedding_num_tokens(embedding_model, page_content_list)
         else:
             tokens_list = [0] * len(docs)
 
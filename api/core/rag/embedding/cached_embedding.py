@@ -1,8 +1,10 @@
 import base64
 import logging
+import threading
 from typing import Any, Optional, cast
 
 import numpy as np
+from cachetools import LRUCache
 from sqlalchemy.exc import IntegrityError
 
 from configs import dify_config
@@ -18,6 +20,35 @@ from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
+# number of tokens of texts by (provider, model, text hash)
+_text_tokens_cache: LRUCache[tuple[str, str, str], int] = LRUCache(maxsize=100000)
+_text_tokens_cache_lock = threading.Lock()
+
+
+def _set_text_tokens(model_instance: ModelInstance, text_hash: str, tokens: int) -> None:
+    with _text_tokens_cache_lock:
+        _text_tokens_cache[(model_instance.provider, model_instance.model, text_hash)] = tokens
+
+
+def get_text_embedding_num_tokens(model_instance: ModelInstance, texts: list[str]) -> list[int]:
+    """
+    Get the number of tokens of each text, memoized by text hash.
+    Only the texts that were never counted or embedded alone are counted by the model.
+    """
+    keys = [(model_instance.provider, model_instance.model, helper.generate_text_hash(text)) for text in texts]
+    with _text_tokens_cache_lock:
+        tokens_list = [_text_tokens_cache.get(key) for key in keys]
+
+    missing_indices = [i for i, tokens in enumerate(tokens_list) if tokens is None]
+    if missing_indices:
+        missing_tokens = model_instance.get_text_embedding_num_tokens([texts[i] for i in missing_indices])
+        with _text_tokens_cache_lock:
+            for i, tokens in zip(missing_indices, missing_tokens):
+                tokens_list[i] = tokens
+                _text_tokens_cache[keys[i]] = tokens
+
+    return cast(list[int], tokens_list)
+
 
 class CacheEmbedding(Embeddings):
     def __init__(self, model_instance: ModelInstance, user: Optional[str] = None) -> None:
@@ -26,8 +57,19 @@ class CacheEmbedding(Embeddings):
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embed search docs in batches of 10."""
+        return self.embed_documents_with_usage(texts)[0]
+
+    def embed_documents_with_usage(self, texts: list[str]) -> tuple[list[list[float]], int]:
+        """
+        Embed search docs, also return the number of tokens of the texts.
+
+        Tokens of embedded texts are taken from the usage of the embedding result,
+        tokens of texts served from the embedding cache are memoized by text hash.
+        """
         # use doc embedding cache or store if not exists
         text_embeddings: list[Any] = [None for _ in range(len(texts))]
+        tokens = 0
+        cached_indices = []
         embedding_queue_indices = []
         for i, text in enumerate(texts):
             hash = helper.generate_text_hash(text)
@@ -40,6 +82,7 @@ class CacheEmbedding(Embeddings):
             )
             if embedding:
                 text_embeddings[i] = embedding.get_embedding()
+                cached_indices.append(i)
             else:
                 embedding_queue_indices.append(i)
         if embedding_queue_indices:
@@ -61,6 +104,10 @@ class CacheEmbedding(Embeddings):
                     embedding_result = self._model_instance.invoke_text_embedding(
                         texts=batch_texts, user=self._user, input_type=EmbeddingInputType.DOCUMENT
                     )
+                    batch_tokens = embedding_result.usage.tokens
+                    tokens += batch_tokens
+                    if len(batch_texts) == 1:
+                        _set_text_tokens(self._model_instance, helper.generate_text_hash(batch_texts[0]), batch_tokens)
 
                     for vector in embedding_result.embeddings:
                         try:
@@ -98,7 +145,10 @@ class CacheEmbedding(Embeddings):
                 logger.exception("Failed to embed documents: %s")
                 raise ex
 
-        return text_embeddings
+        if cached_indices:
+            tokens += sum(get_text_embedding_num_tokens(self._model_instance, [texts[i] for i in cached_indices]))
+
+        return text_embeddings, tokens
 
     def embed_query(self, text: str) -> list[float]:
         """Embed query text."""
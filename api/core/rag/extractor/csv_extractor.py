@@ -18,6 +18,9 @@ class CSVExtractor(BaseExtractor):
         file_path: Path to the file to load.
     """
 
+    # number of rows parsed into a dataframe at a time
+    chunk_size = 10000
+
     def __init__(
         self,
         file_path: str,
@@ -57,21 +60,22 @@ class CSVExtractor(BaseExtractor):
     def _read_from_file(self, csvfile) -> list[Document]:
         docs = []
         try:
-            # load csv file into pandas dataframe
-            df = pd.read_csv(csvfile, on_bad_lines="skip", **self.csv_args)
-
-            # check source column exists
-            if self.source_column and self.source_column not in df.columns:
-                raise ValueError(f"Source column '{self.source_column}' not found in CSV file.")
-
-            # create document objects
+            # read the csv file in chunks of rows, only one chunk is held as a dataframe at a time,
+            # values are kept as written since types inferred per chunk could differ between chunks
+            csv_args = {"dtype": str, **self.csv_args}
+            with pd.read_csv(csvfile, on_bad_lines="skip", chunksize=self.chunk_size, **csv_args) as reader:
+                for df in reader:
+                    # check source column exists
+                    if self.source_column and self.source_column not in df.columns:
+                        raise ValueError(f"Source column '{self.source_column}' not found in CSV file.")
 
-            for i, row in df.iterrows():
-                content = ";".join(f"{col.strip()}: {str(row[col]).strip()}" for col in df.columns)
-                source = row[self.source_column] if self.source_column else ""
-                metadata = {"source": source, "row": i}
-                doc = Document(page_content=content, metadata=metadata)
-                docs.append(doc)
+                    # create document objects
+                    for i, row in df.iterrows():
+                        content = ";".join(f"{col.strip()}: {str(row[col]).strip()}" for col in df.columns)
+                        source = row[self.source_column] if self.source_column else ""
+                        metadata = {"source": source, "row": i}
+                        doc = Document(page_content=content, metadata=metadata)
+                        docs.append(doc)
         except csv.Error as e:
             raise e
 
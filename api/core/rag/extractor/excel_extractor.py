@@ -1,14 +1,22 @@
 """Abstract interface for document loader implementations."""
 
 import os
-from typing import Optional, cast
+from collections.abc import Iterator
+from typing import Any, Optional
+from xml.etree.ElementTree import iterparse
 
 import pandas as pd
 from openpyxl import load_workbook  # type: ignore
+from openpyxl.packaging.relationship import get_dependents, get_rels_path  # type: ignore
+from openpyxl.utils import get_column_letter, range_boundaries  # type: ignore
+from openpyxl.xml.constants import REL_NS, SHEET_MAIN_NS  # type: ignore
 
 from core.rag.extractor.extractor_base import BaseExtractor
 from core.rag.models.document import Document
 
+HYPERLINK_TAG = f"{{{SHEET_MAIN_NS}}}hyperlink"
+ROW_TAG = f"{{{SHEET_MAIN_NS}}}row"
+
 
 class ExcelExtractor(BaseExtractor):
     """Load Excel files.
@@ -26,37 +34,14 @@ class ExcelExtractor(BaseExtractor):
 
     def extract(self) -> list[Document]:
         """Load from Excel file in xls or xlsx format using Pandas and openpyxl."""
-        documents = []
+        return list(self.load())
+
+    def load(self) -> Iterator[Document]:
+        """Lazily load rows as documents, xlsx files are read row by row without loading the whole workbook."""
         file_extension = os.path.splitext(self._file_path)[-1].lower()
 
         if file_extension == ".xlsx":
-            wb = load_workbook(self._file_path, data_only=True)
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                data = sheet.values
-                try:
-                    cols = next(data)
-                except StopIteration:
-                    continue
-                df = pd.DataFrame(data, columns=cols)
-
-                df.dropna(how="all", inplace=True)
-
-                for index, row in df.iterrows():
-                    page_content = []
-                    for col_index, (k, v) in enumerate(row.items()):
-                        if pd.notna(v):
-                            cell = sheet.cell(
-                                row=cast(int, index) + 2, column=col_index + 1
-                            )  # +2 to account for header and 1-based index
-                            if cell.hyperlink:
-                                value = f"[{v}]({cell.hyperlink.target})"
-                                page_content.append(f'"{k}":"{value}"')
-                            else:
-                                page_content.append(f'"{k}":"{v}"')
-                    documents.append(
-                        Document(page_content=";".join(page_content), metadata={"source": self._file_path})
-                    )
+            yield from self._load_xlsx()
 
         elif file_extension == ".xls":
             excel_file = pd.ExcelFile(self._file_path, engine="xlrd")
@@ -69,10 +54,72 @@ class ExcelExtractor(BaseExtractor):
                     for k, v in row.items():
                         if pd.notna(v):
                             page_content.append(f'"{k}":"{v}"')
-                    documents.append(
-                        Document(page_content=";".join(page_content), metadata={"source": self._file_path})
-                    )
+                    yield Document(page_content=";".join(page_content), metadata={"source": self._file_path})
         else:
             raise ValueError(f"Unsupported file extension: {file_extension}")
 
-        return documents
+    def _load_xlsx(self) -> Iterator[Document]:
+        wb = load_workbook(self._file_path, read_only=True, data_only=True)
+        try:
+            for sheet in wb.worksheets:
+                # the stored dimensions may be wrong, read all rows that are present instead
+                sheet.reset_dimensions()
+                hyperlinks = self._read_hyperlinks(wb, sheet)
+                cols: Optional[tuple] = None
+                for row_number, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+                    if cols is None:
+                        # the first non-empty row is the header
+                        if any(v is not None for v in values):
+                            cols = values
+                        continue
+
+                    page_content = []
+                    for col_index, (k, v) in enumerate(zip(cols, values)):
+                        if v is None:
+                            continue
+                        coordinate = f"{get_column_letter(col_index + 1)}{row_number}"
+                        if coordinate in hyperlinks:
+                            value = f"[{v}]({hyperlinks[coordinate]})"
+                            page_content.append(f'"{k}":"{value}"')
+                        else:
+                            page_content.append(f'"{k}":"{v}"')
+                    # skip empty rows
+                    if page_content:
+                        yield Document(page_content=";".join(page_content), metadata={"source": self._file_path})
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _read_hyperlinks(wb: Any, sheet: Any) -> dict[str, Optional[str]]:
+        """
+        Get the hyperlink targets of a read-only sheet by cell coordinate.
+
+        Hyperlinks are stored after the rows in the sheet xml and read-only sheets do not bind them to cells,
+        so they are read with a separate pass that discards the rows.
+        """
+        archive = wb._archive
+        worksheet_path = sheet._worksheet_path
+        rels_path = get_rels_path(worksheet_path)
+        rels = get_dependents(archive, rels_path) if rels_path in archive.namelist() else None
+
+        hyperlinks: dict[str, Optional[str]] = {}
+        with archive.open(worksheet_path) as source:
+            for _, element in iterparse(source):
+                if element.tag == HYPERLINK_TAG:
+                    rel_id = element.get(f"{{{REL_NS}}}id")
+                    target = None
+                    if rel_id and rels is not None:
+                        try:
+                            target = rels.get(rel_id).Target
+                        except KeyError:
+                            pass
+                    min_col, min_row, max_col, max_row = range_boundaries(element.get("ref", ""))
+                    if min_col and min_row and max_col and max_row:
+                        for row in range(min_row, max_row + 1):
+                            for col in range(min_col, max_col + 1):
+                                hyperlinks[f"{get_column_letter(col)}{row}"] = target
+                    element.clear()
+                elif element.tag == ROW_TAG:
+                    element.clear()
+
+        return hyperlinks
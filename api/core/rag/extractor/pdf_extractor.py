@@ -1,14 +1,40 @@
 """Abstract interface for document loader implementations."""
 
 import contextlib
+import hashlib
+import json
+import logging
+import multiprocessing
 from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, cast
 
+from configs import dify_config
 from core.rag.extractor.blob.blob import Blob
 from core.rag.extractor.extractor_base import BaseExtractor
 from core.rag.models.document import Document
 from extensions.ext_storage import storage
 
+logger = logging.getLogger(__name__)
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[str]:
+    """Extract the text of pages [start, stop), runs in a worker process."""
+    import pypdfium2  # type: ignore
+
+    pdf_reader = pypdfium2.PdfDocument(file_path, autoclose=True)
+    try:
+        texts = []
+        for page_number in range(start, stop):
+            page = pdf_reader[page_number]
+            text_page = page.get_textpage()
+            texts.append(text_page.get_text_range())
+            text_page.close()
+            page.close()
+        return texts
+    finally:
+        pdf_reader.close()
+
 
 class PdfExtractor(BaseExtractor):
     """Load pdf files.
@@ -16,6 +42,7 @@ class PdfExtractor(BaseExtractor):
 
     Args:
         file_path: Path to the file to load.
+        file_cache_key: Storage key of the extracted pages, defaults to a key derived from the file content.
     """
 
     def __init__(self, file_path: str, file_cache_key: Optional[str] = None):
@@ -24,21 +51,24 @@ class PdfExtractor(BaseExtractor):
         self._file_cache_key = file_cache_key
 
     def extract(self) -> list[Document]:
-        plaintext_file_exists = False
-        if self._file_cache_key:
-            with contextlib.suppress(FileNotFoundError):
-                text = cast(bytes, storage.load(self._file_cache_key)).decode("utf-8")
-                plaintext_file_exists = True
-                return [Document(page_content=text)]
+        file_cache_key = self._file_cache_key
+        if not file_cache_key and dify_config.PDF_EXTRACTION_CACHE_ENABLED:
+            file_cache_key = self._content_cache_key()
+
+        if file_cache_key:
+            with contextlib.suppress(FileNotFoundError, ValueError):
+                texts = json.loads(cast(bytes, storage.load(file_cache_key)).decode("utf-8"))
+                return [
+                    Document(page_content=text, metadata={"source": self._file_path, "page": page_number})
+                    for page_number, text in enumerate(texts)
+                ]
+
         documents = list(self.load())
-        text_list = []
-        for document in documents:
-            text_list.append(document.page_content)
-        text = "\n\n".join(text_list)
 
-        # save plaintext file for caching
-        if not plaintext_file_exists and self._file_cache_key:
-            storage.save(self._file_cache_key, text.encode("utf-8"))
+        # save extracted pages for caching, they are shared by estimating, previewing and indexing the same file
+        if file_cache_key:
+            texts = [document.page_content for document in documents]
+            storage.save(file_cache_key, json.dumps(texts).encode("utf-8"))
 
         return documents
 
@@ -56,6 +86,13 @@ class PdfExtractor(BaseExtractor):
         with blob.as_bytes_io() as file_path:
             pdf_reader = pypdfium2.PdfDocument(file_path, autoclose=True)
             try:
+                page_count = len(pdf_reader)
+                if blob.path and self._should_extract_in_parallel(page_count):
+                    pdf_reader.close()
+                    for page_number, content in enumerate(self._extract_in_parallel(str(blob.path), page_count)):
+                        yield Document(page_content=content, metadata={"source": blob.source, "page": page_number})
+                    return
+
                 for page_number, page in enumerate(pdf_reader):
                     text_page = page.get_textpage()
                     content = text_page.get_text_range()
@@ -65,3 +102,32 @@ class PdfExtractor(BaseExtractor):
                     yield Document(page_content=content, metadata=metadata)
             finally:
                 pdf_reader.close()
+
+    @staticmethod
+    def _should_extract_in_parallel(page_count: int) -> bool:
+        if dify_config.PDF_EXTRACTION_MAX_WORKERS < 2:
+            return False
+        if page_count < dify_config.PDF_EXTRACTION_PARALLEL_MIN_PAGES:
+            return False
+        # daemonic processes, e.g. prefork celery workers, are not allowed to have children
+        return not multiprocessing.current_process().daemon
+
+    @staticmethod
+    def _extract_in_parallel(file_path: str, page_count: int) -> Iterator[str]:
+        """Extract page ranges in worker processes, the texts are yielded in page order."""
+        max_workers = dify_config.PDF_EXTRACTION_MAX_WORKERS
+        # a few ranges per worker to balance pages of uneven size
+        range_size = max(1, -(-page_count // (max_workers * 4)))
+        ranges = [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges]
+            for future in futures:
+                yield from future.result()
+
+    def _content_cache_key(self) -> str:
+        sha256 = hashlib.sha256()
+        with open(self._file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return f"extract_files/pdf/{sha256.hexdigest()}.json"
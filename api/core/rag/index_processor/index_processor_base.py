@@ -27,7 +27,10 @@ class BaseIndexProcessor(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs):
+    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs) -> int:
+        """
+        Load the documents into the index, return the number of tokens embedded.
+        """
         raise NotImplementedError
 
     def clean(self, dataset: Dataset, node_ids: Optional[list[str]], with_keywords: bool = True, **kwargs):
@@ -72,10 +72,11 @@ class ParagraphIndexProcessor(BaseIndexProcessor):
             all_documents.extend(split_documents)
         return all_documents
 
-    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs):
+    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs) -> int:
+        tokens = 0
         if dataset.indexing_technique == "high_quality":
             vector = Vector(dataset)
-            vector.create(documents)
+            tokens = vector.create(documents)
             with_keywords = False
         if with_keywords:
             keywords_list = kwargs.get("keywords_list")
@@ -84,6 +85,7 @@ class ParagraphIndexProcessor(BaseIndexProcessor):
                 keyword.add_texts(documents, keywords_list=keywords_list)
             else:
                 keyword.add_texts(documents)
+        return tokens
 
     def clean(self, dataset: Dataset, node_ids: Optional[list[str]], with_keywords: bool = True, **kwargs):
         if dataset.indexing_technique == "high_quality":
@@ -98,7 +98,8 @@ class ParentChildIndexProcessor(BaseIndexProcessor):
 
         return all_documents
 
-    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs):
+    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs) -> int:
+        tokens = 0
         if dataset.indexing_technique == "high_quality":
             vector = Vector(dataset)
             for document in documents:
@@ -107,7 +108,8 @@ class ParentChildIndexProcessor(BaseIndexProcessor):
                     formatted_child_documents = [
                         Document(**child_document.model_dump()) for child_document in child_documents
                     ]
-                    vector.create(formatted_child_documents)
+                    tokens += vector.create(formatted_child_documents)
+        return tokens
 
     def clean(self, dataset: Dataset, node_ids: Optional[list[str]], with_keywords: bool = True, **kwargs):
         # node_ids is segment's node_ids
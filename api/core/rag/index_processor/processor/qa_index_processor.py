@@ -2,14 +2,16 @@
 
 import logging
 import re
-import threading
+import time
 import uuid
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, cast
 
 import pandas as pd
 from flask import Flask, current_app
 from werkzeug.datastructures import FileStorage
 
+from configs import dify_config
 from core.llm_generator.llm_generator import LLMGenerator
 from core.rag.cleaner.clean_processor import CleanProcessor
 from core.rag.datasource.retrieval_service import RetrievalService
@@ -19,6 +21,7 @@ from core.rag.extractor.extract_processor import ExtractProcessor
 from core.rag.index_processor.index_processor_base import BaseIndexProcessor
 from core.rag.models.document import Document
 from core.tools.utils.text_processing_utils import remove_leading_symbols
+from extensions.ext_redis import redis_client
 from libs import helper
 from models.dataset import Dataset
 from services.entities.knowledge_entities.knowledge_entities import Rule
@@ -74,32 +77,21 @@ class QAIndexProcessor(BaseIndexProcessor):
                     split_documents.append(document_node)
             all_documents.extend(split_documents)
         if preview:
-            self._format_qa_document(
+            all_qa_documents.extend(
+                self._format_qa_document(
+                    current_app._get_current_object(),  # type: ignore
+                    kwargs.get("tenant_id"),  # type: ignore
+                    all_documents[0],
+                    kwargs.get("doc_language", "English"),
+                )
+            )
+        else:
+            all_qa_documents = self._generate_qa_documents(
                 current_app._get_current_object(),  # type: ignore
                 kwargs.get("tenant_id"),  # type: ignore
-                all_documents[0],
-                all_qa_documents,
+                all_documents,
                 kwargs.get("doc_language", "English"),
             )
-        else:
-            for i in range(0, len(all_documents), 10):
-                threads = []
-                sub_documents = all_documents[i : i + 10]
-                for doc in sub_documents:
-                    document_format_thread = threading.Thread(
-                        target=self._format_qa_document,
-                        kwargs={
-                            "flask_app": current_app._get_current_object(),  # type: ignore
-                            "tenant_id": kwargs.get("tenant_id"),  # type: ignore
-                            "document_node": doc,
-                            "all_qa_documents": all_qa_documents,
-                            "document_language": kwargs.get("doc_language", "English"),
-                        },
-                    )
-                    threads.append(document_format_thread)
-                    document_format_thread.start()
-                for thread in threads:
-                    thread.join()
         return all_qa_documents
 
     def format_by_template(self, file: FileStorage, **kwargs) -> list[Document]:
@@ -121,10 +113,12 @@ class QAIndexProcessor(BaseIndexProcessor):
             raise ValueError(str(e))
         return text_docs
 
-    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs):
+    def load(self, dataset: Dataset, documents: list[Document], with_keywords: bool = True, **kwargs) -> int:
+        tokens = 0
         if dataset.indexing_technique == "high_quality":
             vector = Vector(dataset)
-            vector.create(documents)
+            tokens = vector.create(documents)
+        return tokens
 
     def clean(self, dataset: Dataset, node_ids: Optional[list[str]], with_keywords: bool = True, **kwargs):
         vector = Vector(dataset)
@@ -161,14 +155,30 @@ class QAIndexProcessor(BaseIndexProcessor):
                 docs.append(doc)
         return docs
 
-    def _format_qa_document(self, flask_app: Flask, tenant_id: str, document_node, all_qa_documents, document_language):
-        format_documents = []
+    def _generate_qa_documents(
+        self, flask_app: Flask, tenant_id: str, document_nodes: list[Document], document_language: str
+    ) -> list[Document]:
+        """
+        Generate the Q&A documents of the chunks with a bounded pool of workers, a worker picks up the next
+        chunk as soon as it is done so a slow response only holds one worker. The chunk order is kept.
+        """
+        with ThreadPoolExecutor(max_workers=dify_config.QA_GENERATION_MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(self._format_qa_document, flask_app, tenant_id, document_node, document_language)
+                for document_node in document_nodes
+            ]
+            return [qa_document for future in futures for qa_document in future.result()]
+
+    def _format_qa_document(
+        self, flask_app: Flask, tenant_id: str, document_node: Document, document_language: str
+    ) -> list[Document]:
+        format_documents: list[Document] = []
         if document_node.page_content is None or not document_node.page_content.strip():
-            return
+            return format_documents
         with flask_app.app_context():
             try:
                 # qa model document
-                response = LLMGenerator.generate_qa_document(tenant_id, document_node.page_content, document_language)
+                response = self._generate_qa_response(tenant_id, document_node.page_content, document_language)
                 document_qa_list = self._format_split_text(response)
                 qa_documents = []
                 for result in document_qa_list:
@@ -184,7 +194,53 @@ class QAIndexProcessor(BaseIndexProcessor):
             except Exception as e:
                 logging.exception("Failed to format qa document")
 
-            all_qa_documents.extend(format_documents)
+        return format_documents
+
+    def _generate_qa_response(self, tenant_id: str, text: str, document_language: str) -> str:
+        """
+        Generate the Q&A pairs of a chunk, retrying failed calls with exponential backoff.
+
+        Responses are kept in redis for a day, so indexing a document again after a failure or a pause
+        does not generate the chunks that were already done.
+        """
+        cache_key = f"qa_document_generation:{tenant_id}:{helper.generate_text_hash(f'{document_language}:{text}')}"
+        cached_response = redis_client.get(cache_key)
+        if cached_response:
+            return cast(bytes, cached_response).decode("utf-8")
+
+        max_retries = dify_config.QA_GENERATION_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            self._wait_for_rate_limit(tenant_id)
+            try:
+                response: str = LLMGenerator.generate_qa_document(tenant_id, text, document_language)
+                break
+            except Exception:
+                if attempt >= max_retries:
+                    raise
+                logging.warning("Failed to generate qa document, retrying, attempt: %s", attempt + 1)
+                time.sleep(2**attempt)
+
+        redis_client.setex(cache_key, 86400, response)
+        return response
+
+    @staticmethod
+    def _wait_for_rate_limit(tenant_id: str) -> None:
+        """
+        Wait until the tenant is below QA_GENERATION_TENANT_RATE_LIMIT calls in the current minute.
+        """
+        rate_limit = dify_config.QA_GENERATION_TENANT_RATE_LIMIT
+        if rate_limit <= 0:
+            return
+
+        while True:
+            now = time.time()
+            rate_limit_key = f"qa_document_generation_rate_limit:{tenant_id}:{int(now // 60)}"
+            count = redis_client.incr(rate_limit_key)
+            if count == 1:
+                redis_client.expire(rate_limit_key, 60)
+            if count <= rate_limit:
+                return
+            time.sleep(60 - now % 60)
 
     def _format_split_text(self, text):
         regex = r"Q\d+:\s*(.*?)\s*A\d+:\s*([\s\S]*?)(?=Q\d+:|$)"
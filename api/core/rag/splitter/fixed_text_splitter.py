@@ -87,16 +87,15 @@ class FixedRecursiveCharacterTextSplitter(EnhanceRecursiveCharacterTextSplitter)
                 new_separators = self._separators[i + 1 :]
                 break
 
-        # Now that we have the separator, split the text
-        if separator:
-            if separator == " ":
-                splits = text.split()
-            else:
-                splits = text.split(separator)
-                splits = [item + separator if i < len(splits) else item for i, item in enumerate(splits)]
+        # Now that we have the separator, split and filter the text in one pass
+        if separator == " ":
+            splits = text.split()
+        elif separator:
+            splits = [s + separator for s in text.split(separator)]
+            if separator == "\n":
+                splits = [s for s in splits if s != "\n"]
         else:
-            splits = list(text)
-        splits = [s for s in splits if (s not in {"", "\n"})]
+            splits = [s for s in text if s != "\n"]
         _good_splits = []
         _good_splits_lengths = []  # cache the lengths of the splits
         _separator = "" if self._keep_separator else separator
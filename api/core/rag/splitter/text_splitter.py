@@ -105,37 +105,35 @@ class TextSplitter(BaseDocumentTransformer, ABC):
     def _merge_splits(self, splits: Iterable[str], separator: str, lengths: list[int]) -> list[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
+        # The current chunk is the span splits[start:end], the lengths of the pieces are already measured
+        # so popping a piece off the front of the span only moves its start.
         separator_len = self._length_function([separator])[0]
+        splits = splits if isinstance(splits, list) else list(splits)
 
         docs = []
-        current_doc: list[str] = []
+        start = 0
         total = 0
-        index = 0
-        for d in splits:
-            _len = lengths[index]
-            if total + _len + (separator_len if len(current_doc) > 0 else 0) > self._chunk_size:
+        for end, d in enumerate(splits):
+            _len = lengths[end]
+            if total + _len + (separator_len if end > start else 0) > self._chunk_size:
                 if total > self._chunk_size:
                     logger.warning(
                         "Created a chunk of size %s, which is longer than the specified %s", total, self._chunk_size
                     )
-                if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
+                if end > start:
+                    doc = self._join_docs(splits[start:end], separator)
                     if doc is not None:
                         docs.append(doc)
                     # Keep on popping if:
                     # - we have a larger chunk than in the chunk overlap
                     # - or if we still have any chunks and the length is long
                     while total > self._chunk_overlap or (
-                        total + _len + (separator_len if len(current_doc) > 0 else 0) > self._chunk_size and total > 0
+                        total + _len + (separator_len if end > start else 0) > self._chunk_size and total > 0
                     ):
-                        total -= self._length_function([current_doc[0]])[0] + (
-                            separator_len if len(current_doc) > 1 else 0
-                        )
-                        current_doc = current_doc[1:]
-            current_doc.append(d)
-            total += _len + (separator_len if len(current_doc) > 1 else 0)
-            index += 1
-        doc = self._join_docs(current_doc, separator)
+                        total -= lengths[start] + (separator_len if end - start > 1 else 0)
+                        start += 1
+            total += _len + (separator_len if end > start else 0)
+        doc = self._join_docs(splits[start:], separator)
         if doc is not None:
             docs.append(doc)
         return docs
@@ -5,6 +5,7 @@ from typing import Any, Optional
 
 from core.mcp.error import MCPAuthError, MCPConnectionError
 from core.mcp.mcp_client import MCPClient
+from core.mcp.mcp_client_pool import MCPClientPoolKey, mcp_client_pool
 from core.mcp.types import ImageContent, TextContent
 from core.tools.__base.tool import Tool
 from core.tools.__base.tool_runtime import ToolRuntime
@@ -47,15 +48,7 @@ class MCPTool(Tool):
         from core.tools.errors import ToolInvokeError
 
         try:
-            with MCPClient(
-                self.server_url,
-                self.provider_id,
-                self.tenant_id,
-                authed=True,
-                headers=self.headers,
-                timeout=self.timeout,
-                sse_read_timeout=self.sse_read_timeout,
-            ) as mcp_client:
+            with mcp_client_pool.client(self._pool_key(), self._create_mcp_client) as mcp_client:
                 tool_parameters = self._handle_none_parameter(tool_parameters)
                 result = mcp_client.invoke_tool(tool_name=self.entity.identity.name, tool_args=tool_parameters)
         except MCPAuthError as e:
@@ -84,6 +77,27 @@ class MCPTool(Tool):
                     blob=base64.b64decode(content.data), meta={"mime_type": content.mimeType}
                 )
 
+    def _pool_key(self) -> MCPClientPoolKey:
+        return MCPClientPoolKey(
+            tenant_id=self.tenant_id,
+            provider_id=self.provider_id,
+            server_url=self.server_url,
+            headers=tuple(sorted(self.headers.items())),
+            timeout=self.timeout,
+            sse_read_timeout=self.sse_read_timeout,
+        )
+
+    def _create_mcp_client(self) -> MCPClient:
+        return MCPClient(
+            self.server_url,
+            self.provider_id,
+            self.tenant_id,
+            authed=True,
+            headers=self.headers,
+            timeout=self.timeout,
+            sse_read_timeout=self.sse_read_timeout,
+        )
+
     def fork_tool_runtime(self, runtime: ToolRuntime) -> "MCPTool":
         return MCPTool(
             entity=self.entity,
@@ -1,14 +1,15 @@
 import re
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
-from typing import Annotated, Any, Union, cast
+from functools import lru_cache
+from typing import Annotated, Any, Optional, Union, cast
 
 from pydantic import BaseModel, Field
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, Variable
 from core.variables.consts import SELECTORS_LENGTH
-from core.variables.segments import FileSegment, ObjectSegment
+from core.variables.segments import FileSegment, ObjectSegment, StringSegment
 from core.variables.variables import VariableUnion
 from core.workflow.constants import CONVERSATION_VARIABLE_NODE_ID, ENVIRONMENT_VARIABLE_NODE_ID, SYSTEM_VARIABLE_NODE_ID
 from core.workflow.system_variable import SystemVariable
@@ -18,6 +19,25 @@ VariableValue = Union[str, int, float, dict, list, File]
 
 VARIABLE_PATTERN = re.compile(r"\{\{#([a-zA-Z0-9_]{1,50}(?:\.[a-zA-Z_][a-zA-Z0-9_]{0,29}){1,10})#\}\}")
 
+_FILE_ATTRIBUTES = frozenset(item.value for item in FileAttribute)
+
+# A compiled template part, the literal text of the part and the selector to look up if it may refer to a variable.
+_TemplatePart = tuple[StringSegment, Optional[tuple[str, ...]]]
+
+
+@lru_cache(maxsize=1024)
+def _compile_template(template: str, /) -> tuple[_TemplatePart, ...]:
+    """
+    Split a template into its parts, cached per template since the same templates are rendered on every run.
+    """
+    parts: list[_TemplatePart] = []
+    for part in VARIABLE_PATTERN.split(template):
+        if not part:
+            continue
+        selector = tuple(part.split(".")) if "." in part else None
+        parts.append((StringSegment(value=part), selector))
+    return tuple(parts)
+
 
 class VariablePool(BaseModel):
     # Variable dictionary is a dictionary for looking up variables by their selector.
@@ -88,8 +108,9 @@ class VariablePool(BaseModel):
         elif isinstance(value, Segment):
             variable = variable_factory.segment_to_variable(segment=value, selector=selector)
         else:
+            # the segment is built from the value here, its validated value is not referenced anywhere else
             segment = variable_factory.build_segment(value)
-            variable = variable_factory.segment_to_variable(segment=segment, selector=selector)
+            variable = variable_factory.segment_to_variable(segment=segment, selector=selector, validate=False)
 
         node_id, name = self._selector_to_keys(selector)
         # Based on the definition of `VariableUnion`,
@@ -133,7 +154,11 @@ class VariablePool(BaseModel):
             return None
 
         node_id, name = self._selector_to_keys(selector)
-        segment: Segment | None = self.variable_dictionary[node_id].get(name)
+        # do not use `self.variable_dictionary[node_id]`, it would add an empty entry for unknown nodes
+        node_variables = self.variable_dictionary.get(node_id)
+        if node_variables is None:
+            return None
+        segment: Segment | None = node_variables.get(name)
 
         if segment is None:
             return None
@@ -144,7 +169,7 @@ class VariablePool(BaseModel):
         if isinstance(segment, FileSegment):
             attr = selector[2]
             # Python support `attr in FileAttribute` after 3.12
-            if attr not in {item.value for item in FileAttribute}:
+            if attr not in _FILE_ATTRIBUTES:
                 return None
             attr = FileAttribute(attr)
             attr_value = file_manager.get_attr(file=segment.value, attr=attr)
@@ -184,20 +209,22 @@ class VariablePool(BaseModel):
         if not selector:
             return
         if len(selector) == 1:
-            self.variable_dictionary[selector[0]] = {}
+            self.variable_dictionary.pop(selector[0], None)
             return
         key, hash_key = self._selector_to_keys(selector)
-        self.variable_dictionary[key].pop(hash_key, None)
+        node_variables = self.variable_dictionary.get(key)
+        if node_variables is not None:
+            node_variables.pop(hash_key, None)
 
     def convert_template(self, template: str, /):
-        parts = VARIABLE_PATTERN.split(template)
-        segments = []
-        for part in filter(lambda x: x, parts):
-            if "." in part and (variable := self.get(part.split("."))):
+        segments: list[Segment] = []
+        for literal, selector in _compile_template(template):
+            if selector is not None and (variable := self.get(selector)):
                 segments.append(variable)
             else:
-                segments.append(variable_factory.build_segment(part))
-        return SegmentGroup(value=segments)
+                segments.append(literal)
+        # all parts are segments already, validating them again is costly for templates with many parts
+        return SegmentGroup.model_construct(value=segments)
 
     def get_file(self, selector: Sequence[str], /) -> FileSegment | None:
         segment = self.get(selector)
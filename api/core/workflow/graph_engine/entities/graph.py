@@ -12,6 +12,7 @@ from core.workflow.nodes.answer.answer_stream_generate_router import AnswerStrea
 from core.workflow.nodes.answer.entities import AnswerStreamGenerateRoute
 from core.workflow.nodes.end.end_stream_generate_router import EndStreamGeneratorRouter
 from core.workflow.nodes.end.entities import EndStreamParam
+from core.workflow.workflow_cache import WorkflowCache
 
 
 class GraphEdge(BaseModel):
@@ -153,7 +154,9 @@ class Graph(BaseModel):
 
         # fetch all node ids from root node
         node_ids = [root_node_id]
-        cls._recursively_add_node_ids(node_ids=node_ids, edge_mapping=edge_mapping, node_id=root_node_id)
+        cls._recursively_add_node_ids(
+            node_ids=node_ids, edge_mapping=edge_mapping, node_id=root_node_id, visited_node_ids={root_node_id}
+        )
 
         node_id_config_mapping = {node_id: all_node_id_config_mapping[node_id] for node_id in node_ids}
 
@@ -204,6 +207,27 @@ class Graph(BaseModel):
 
         return graph
 
+    @classmethod
+    def init_cached(
+        cls, workflow_id: Optional[str], graph_config: Mapping[str, Any], root_node_id: Optional[str] = None
+    ) -> "Graph":
+        """
+        Init graph, reusing the graph compiled for the same workflow graph config and root node.
+
+        The returned graph is shared between concurrent runs of the workflow and must not be modified.
+
+        :param workflow_id: workflow id, the graph is not cached without it
+        :param graph_config: graph config
+        :param root_node_id: root node id
+        :return: graph
+        """
+        return WorkflowCache.get_or_create(
+            workflow_id,
+            f"graph_structure:{root_node_id or ''}",
+            graph_config,
+            lambda: cls.init(graph_config=graph_config, root_node_id=root_node_id),
+        )
+
     def add_extra_edge(
         self, source_node_id: str, target_node_id: str, run_condition: Optional[RunCondition] = None
     ) -> None:
@@ -247,7 +271,11 @@ class Graph(BaseModel):
 
     @classmethod
     def _recursively_add_node_ids(
-        cls, node_ids: list[str], edge_mapping: dict[str, list[GraphEdge]], node_id: str
+        cls,
+        node_ids: list[str],
+        edge_mapping: dict[str, list[GraphEdge]],
+        node_id: str,
+        visited_node_ids: Optional[set[str]] = None,
     ) -> None:
         """
         Recursively add node ids
@@ -255,14 +283,22 @@ class Graph(BaseModel):
         :param node_ids: node ids
         :param edge_mapping: edge mapping
         :param node_id: node id
+        :param visited_node_ids: set of the node ids already added, to avoid scanning node_ids
         """
+        if visited_node_ids is None:
+            visited_node_ids = set(node_ids)
+
         for graph_edge in edge_mapping.get(node_id, []):
-            if graph_edge.target_node_id in node_ids:
+            if graph_edge.target_node_id in visited_node_ids:
                 continue
 
             node_ids.append(graph_edge.target_node_id)
+            visited_node_ids.add(graph_edge.target_node_id)
             cls._recursively_add_node_ids(
-                node_ids=node_ids, edge_mapping=edge_mapping, node_id=graph_edge.target_node_id
+                node_ids=node_ids,
+                edge_mapping=edge_mapping,
+                node_id=graph_edge.target_node_id,
+                visited_node_ids=visited_node_ids,
             )
 
     @classmethod
@@ -350,13 +386,9 @@ class Graph(BaseModel):
                     parallel_node_ids = []
                     for _, node_ids in in_branch_node_ids.items():
                         for node_id in node_ids:
-                            in_parent_parallel = True
-                            if parent_parallel_id:
-                                in_parent_parallel = False
-                                for parallel_node_id, parallel_id in node_parallel_mapping.items():
-                                    if parallel_id == parent_parallel_id and parallel_node_id == node_id:
-                                        in_parent_parallel = True
-                                        break
+                            in_parent_parallel = (
+                                not parent_parallel_id or node_parallel_mapping.get(node_id) == parent_parallel_id
+                            )
 
                             if in_parent_parallel:
                                 parallel_node_ids.append(node_id)
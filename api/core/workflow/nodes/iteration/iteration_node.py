@@ -145,7 +145,9 @@ class IterationNode(BaseNode):
         root_node_id = self._node_data.start_node_id
 
         # init graph
-        iteration_graph = Graph.init(graph_config=graph_config, root_node_id=root_node_id)
+        iteration_graph = Graph.init_cached(
+            workflow_id=self.workflow_id, graph_config=graph_config, root_node_id=root_node_id
+        )
 
         if not iteration_graph:
             raise IterationGraphNotFoundError("iteration graph not found")
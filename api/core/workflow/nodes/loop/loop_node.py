@@ -91,7 +91,9 @@ class LoopNode(BaseNode):
             raise ValueError(f"field start_node_id in loop {self.node_id} not found")
 
         # Initialize graph
-        loop_graph = Graph.init(graph_config=self.graph_config, root_node_id=self._node_data.start_node_id)
+        loop_graph = Graph.init_cached(
+            workflow_id=self.workflow_id, graph_config=self.graph_config, root_node_id=self._node_data.start_node_id
+        )
         if not loop_graph:
             raise ValueError("loop graph not found")
 
@@ -1,5 +1,6 @@
 import re
 from collections.abc import Mapping, Sequence
+from functools import lru_cache
 from typing import Any
 
 from core.workflow.entities.variable_entities import VariableSelector
@@ -9,6 +10,15 @@ REGEX = re.compile(r"\{\{(#[a-zA-Z0-9_]{1,50}(\.[a-zA-Z_][a-zA-Z0-9_]{0,29}){1,1
 SELECTOR_PATTERN = re.compile(r"\{\{(#[a-zA-Z0-9_]{1,50}(?:\.[a-zA-Z_][a-zA-Z0-9_]{0,29}){1,10}#)\}\}")
 
 
+@lru_cache(maxsize=1024)
+def _extract_variable_keys(template: str, /) -> tuple[str, ...]:
+    """
+    Get the distinct template variable keys of a template, cached per template since the same templates are
+    parsed on every run.
+    """
+    return tuple({match[0] for match in REGEX.findall(template)})
+
+
 def extract_selectors_from_template(template: str, /) -> Sequence[VariableSelector]:
     parts = SELECTOR_PATTERN.split(template)
     selectors = []
@@ -64,12 +74,7 @@ class VariableTemplateParser:
         Returns:
             A list of template variable keys.
         """
-        # Regular expression to match the template rules
-        matches = re.findall(REGEX, self.template)
-
-        first_group_matches = [match[0] for match in matches]
-
-        return list(set(first_group_matches))
+        return list(_extract_variable_keys(self.template))
 
     def extract_variable_selectors(self) -> list[VariableSelector]:
         """
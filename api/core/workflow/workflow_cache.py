@@ -0,0 +1,64 @@
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+from cachetools import LRUCache
+
+T = TypeVar("T")
+
+
+class WorkflowCache:
+    """
+    Process-level cache of values derived from the raw columns of a workflow, such as the parsed graph.
+
+    Entries are grouped by workflow id and keyed by name, each entry remembers the raw value it was derived from,
+    so a changed column is never served from a stale entry even before `invalidate` is called.
+    Cached values are shared between requests and threads and must be treated as read-only.
+    """
+
+    _lock = threading.Lock()
+    _cache: LRUCache[str, dict[str, tuple[Any, Any]]] = LRUCache(maxsize=512)
+
+    @classmethod
+    def get_or_create(cls, workflow_id: str | None, name: str, raw: Any, factory: Callable[[], T]) -> T:
+        """
+        Get the cached value derived from raw, or create it with factory.
+
+        :param workflow_id: workflow id, values of workflows without an id are not cached
+        :param name: name of the cached value, e.g. "graph"
+        :param raw: the raw value the cached value is derived from
+        :param factory: function to derive the value from raw
+        :return: the cached value
+        """
+        if not workflow_id:
+            return factory()
+
+        with cls._lock:
+            entries = cls._cache.get(workflow_id)
+            cached = entries.get(name) if entries is not None else None
+
+        if cached is not None and (cached[0] is raw or cached[0] == raw):
+            return cast(T, cached[1])
+
+        value = factory()
+        with cls._lock:
+            entries = cls._cache.get(workflow_id)
+            if entries is None:
+                entries = {}
+                cls._cache[workflow_id] = entries
+            entries[name] = (raw, value)
+
+        return value
+
+    @classmethod
+    def invalidate(cls, workflow_id: str) -> None:
+        """
+        Drop all cached values of a workflow, e.g. after its draft was synced.
+        """
+        with cls._lock:
+            cls._cache.pop(workflow_id, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
@@ -10,7 +10,6 @@ from core.variables.segments import (
     ArrayFileSegment,
     ArrayNumberSegment,
     ArrayObjectSegment,
-    ArraySegment,
     ArrayStringSegment,
     FileSegment,
     FloatSegment,
@@ -48,7 +47,7 @@ class TypeMismatchError(Exception):
 
 
 # Define the constant
-SEGMENT_TO_VARIABLE_MAP = {
+SEGMENT_TO_VARIABLE_MAP: Mapping[type[Segment], type[Variable]] = {
     StringSegment: StringVariable,
     IntegerSegment: IntegerVariable,
     FloatSegment: FloatVariable,
@@ -138,32 +137,59 @@ def build_segment(value: Any, /) -> Segment:
     if isinstance(value, File):
         return FileSegment(value=value)
     if isinstance(value, list):
-        items = [build_segment(item) for item in value]
-        types = {item.value_type for item in items}
-        if all(isinstance(item, ArraySegment) for item in items):
-            return ArrayAnySegment(value=value)
-        elif len(types) != 1:
-            if types.issubset({SegmentType.NUMBER, SegmentType.INTEGER, SegmentType.FLOAT}):
-                return ArrayNumberSegment(value=value)
-            return ArrayAnySegment(value=value)
+        segment_type = _infer_array_segment_type(value)
+        return _segment_factory[segment_type](value_type=segment_type, value=value)
+    raise ValueError(f"not supported value {value}")
 
-        match types.pop():
-            case SegmentType.STRING:
-                return ArrayStringSegment(value=value)
-            case SegmentType.NUMBER | SegmentType.INTEGER | SegmentType.FLOAT:
-                return ArrayNumberSegment(value=value)
-            case SegmentType.OBJECT:
-                return ArrayObjectSegment(value=value)
-            case SegmentType.FILE:
-                return ArrayFileSegment(value=value)
-            case SegmentType.NONE:
-                return ArrayAnySegment(value=value)
-            case _:
-                # This should be unreachable.
-                raise ValueError(f"not supported value {value}")
+
+def _infer_value_segment_type(value: Any, /) -> SegmentType:
+    """
+    Get the type of the segment `build_segment` builds for the value, without building it.
+    """
+    if value is None:
+        return SegmentType.NONE
+    if isinstance(value, str):
+        return SegmentType.STRING
+    if isinstance(value, int):
+        return SegmentType.INTEGER
+    if isinstance(value, float):
+        return SegmentType.FLOAT
+    if isinstance(value, dict):
+        return SegmentType.OBJECT
+    if isinstance(value, File):
+        return SegmentType.FILE
+    if isinstance(value, list):
+        return _infer_array_segment_type(value)
     raise ValueError(f"not supported value {value}")
 
 
+def _infer_array_segment_type(value: list, /) -> SegmentType:
+    # the items are only classified, building a segment for each of them would validate and copy them
+    types = [_infer_value_segment_type(item) for item in value]
+    if all(item_type.is_array_type() for item_type in types):
+        return SegmentType.ARRAY_ANY
+    distinct_types = set(types)
+    if len(distinct_types) != 1:
+        if distinct_types.issubset({SegmentType.NUMBER, SegmentType.INTEGER, SegmentType.FLOAT}):
+            return SegmentType.ARRAY_NUMBER
+        return SegmentType.ARRAY_ANY
+
+    match distinct_types.pop():
+        case SegmentType.STRING:
+            return SegmentType.ARRAY_STRING
+        case SegmentType.NUMBER | SegmentType.INTEGER | SegmentType.FLOAT:
+            return SegmentType.ARRAY_NUMBER
+        case SegmentType.OBJECT:
+            return SegmentType.ARRAY_OBJECT
+        case SegmentType.FILE:
+            return SegmentType.ARRAY_FILE
+        case SegmentType.NONE:
+            return SegmentType.ARRAY_ANY
+        case _:
+            # This should be unreachable.
+            raise ValueError(f"not supported value {value}")
+
+
 _segment_factory: Mapping[SegmentType, type[Segment]] = {
     SegmentType.NONE: NoneSegment,
     SegmentType.STRING: StringSegment,
@@ -260,7 +286,15 @@ def segment_to_variable(
     id: str | None = None,
     name: str | None = None,
     description: str = "",
+    validate: bool = True,
 ) -> Variable:
+    """
+    Convert a segment to a variable of the matching type.
+
+    The segment value has been validated when the segment was built, pass `validate=False` to skip validating
+    it again. The variable then shares the value of the segment instead of a validated copy, so this should only
+    be used when the value is immutable or not referenced anywhere else.
+    """
     if isinstance(segment, Variable):
         return segment
     name = name or selector[-1]
@@ -271,13 +305,14 @@ def segment_to_variable(
         raise UnsupportedSegmentTypeError(f"not supported segment type {segment_type}")
 
     variable_class = SEGMENT_TO_VARIABLE_MAP[segment_type]
-    return cast(
-        Variable,
-        variable_class(
-            id=id,
-            name=name,
-            description=description,
-            value=segment.value,
-            selector=list(selector),
-        ),
-    )
+    fields = {
+        "id": id,
+        "name": name,
+        "description": description,
+        "value_type": segment.value_type,
+        "value": segment.value,
+        "selector": list(selector),
+    }
+    if not validate:
+        return variable_class.model_construct(**fields)
+    return variable_class(**fields)
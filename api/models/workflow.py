@@ -16,6 +16,7 @@ from core.variables import utils as variable_utils
 from core.variables.variables import FloatVariable, IntegerVariable, StringVariable
 from core.workflow.constants import CONVERSATION_VARIABLE_NODE_ID, SYSTEM_VARIABLE_NODE_ID
 from core.workflow.nodes.enums import NodeType
+from core.workflow.workflow_cache import WorkflowCache
 from factories.variable_factory import TypeMismatchError, build_segment_with_type
 from libs.datetime_utils import naive_utc_now
 from libs.helper import extract_tenant_id
@@ -191,25 +192,17 @@ class Workflow(Base):
 
     @property
     def graph_dict(self) -> Mapping[str, Any]:
-        # TODO(QuantumGhost): Consider caching `graph_dict` to avoid repeated JSON decoding.
-        #
-        # Using `functools.cached_property` could help, but some code in the codebase may
-        # modify the returned dict, which can cause issues elsewhere.
-        #
-        # For example, changing this property to a cached property led to errors like the
-        # following when single stepping an `Iteration` node:
-        #
-        #     Root node id 1748401971780start not found in the graph
-        #
-        # There is currently no standard way to make a dict deeply immutable in Python,
-        # and tracking modifications to the returned dict is difficult. For now, we leave
-        # the code as-is to avoid these issues.
-        #
-        # Currently, the following functions / methods would mutate the returned dict:
-        #
-        # - `_get_graph_and_variable_pool_of_single_iteration`.
-        # - `_get_graph_and_variable_pool_of_single_loop`.
-        return json.loads(self.graph) if self.graph else {}
+        """
+        The parsed workflow graph.
+
+        The parsed graph is cached per workflow and shared between callers, so it must not be mutated.
+        Callers that need to change the graph (e.g. single stepping an `Iteration` or `Loop` node, or
+        exporting the DSL) should build a new mapping or use `to_dict`, which returns a private copy.
+        """
+        if not self.graph:
+            return {}
+
+        return WorkflowCache.get_or_create(self.id, "graph", self.graph, lambda: json.loads(self.graph))
 
     def get_node_config_by_id(self, node_id: str) -> Mapping[str, Any]:
         """Extract a node configuration from the workflow graph by node ID.
@@ -357,24 +350,31 @@ class Workflow(Base):
         if not tenant_id:
             return []
 
-        environment_variables_dict: dict[str, Any] = json.loads(self._environment_variables)
-        results = [
-            variable_factory.build_environment_variable_from_mapping(v) for v in environment_variables_dict.values()
-        ]
-
-        # decrypt secret variables value
-        def decrypt_func(var):
-            if isinstance(var, SecretVariable):
-                return var.model_copy(update={"value": encrypter.decrypt_token(tenant_id=tenant_id, token=var.value)})
-            elif isinstance(var, (StringVariable, IntegerVariable, FloatVariable)):
-                return var
-            else:
-                raise AssertionError("this statement should be unreachable.")
-
-        decrypted_results: list[SecretVariable | StringVariable | IntegerVariable | FloatVariable] = list(
-            map(decrypt_func, results)
+        def load_environment_variables() -> list[SecretVariable | StringVariable | IntegerVariable | FloatVariable]:
+            environment_variables_dict: dict[str, Any] = json.loads(self._environment_variables)
+            results = [
+                variable_factory.build_environment_variable_from_mapping(v) for v in environment_variables_dict.values()
+            ]
+
+            # decrypt secret variables value
+            def decrypt_func(var):
+                if isinstance(var, SecretVariable):
+                    return var.model_copy(
+                        update={"value": encrypter.decrypt_token(tenant_id=tenant_id, token=var.value)}
+                    )
+                elif isinstance(var, (StringVariable, IntegerVariable, FloatVariable)):
+                    return var
+                else:
+                    raise AssertionError("this statement should be unreachable.")
+
+            return list(map(decrypt_func, results))
+
+        # variables are immutable, only the list needs to be copied
+        return list(
+            WorkflowCache.get_or_create(
+                self.id, f"environment_variables:{tenant_id}", self._environment_variables, load_environment_variables
+            )
         )
-        return decrypted_results
 
     @environment_variables.setter
     def environment_variables(self, value: Sequence[Variable]):
@@ -422,7 +422,8 @@ class Workflow(Base):
         ]
 
         result = {
-            "graph": self.graph_dict,
+            # the exported graph may be modified by the caller, so don't hand out the cached one
+            "graph": json.loads(self.graph) if self.graph else {},
             "features": self.features_dict,
             "environment_variables": [var.model_dump(mode="json") for var in environment_variables],
             "conversation_variables": [var.model_dump(mode="json") for var in self.conversation_variables],
@@ -435,9 +436,15 @@ class Workflow(Base):
         if self._conversation_variables is None:
             self._conversation_variables = "{}"
 
-        variables_dict: dict[str, Any] = json.loads(self._conversation_variables)
-        results = [variable_factory.build_conversation_variable_from_mapping(v) for v in variables_dict.values()]
-        return results
+        def load_conversation_variables() -> list[Variable]:
+            variables_dict: dict[str, Any] = json.loads(self._conversation_variables)
+            return [variable_factory.build_conversation_variable_from_mapping(v) for v in variables_dict.values()]
+
+        return list(
+            WorkflowCache.get_or_create(
+                self.id, "conversation_variables", self._conversation_variables, load_conversation_variables
+            )
+        )
 
     @conversation_variables.setter
     def conversation_variables(self, value: Sequence[Variable]) -> None:
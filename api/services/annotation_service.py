@@ -8,6 +8,7 @@ from sqlalchemy import or_, select
 from werkzeug.datastructures import FileStorage
 from werkzeug.exceptions import NotFound
 
+from core.app.features.annotation_reply.annotation_index import AnnotationReplyIndex
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
 from models.model import App, AppAnnotationHitHistory, AppAnnotationSetting, Message, MessageAnnotation
@@ -60,6 +61,7 @@ class AppAnnotationService:
             )
         db.session.add(annotation)
         db.session.commit()
+        AnnotationReplyIndex.invalidate(app_id)
         # if annotation reply is enabled , add annotation to index
         annotation_setting = db.session.query(AppAnnotationSetting).where(AppAnnotationSetting.app_id == app_id).first()
         if annotation_setting:
@@ -178,6 +180,7 @@ class AppAnnotationService:
         )
         db.session.add(annotation)
         db.session.commit()
+        AnnotationReplyIndex.invalidate(app_id)
         # if annotation reply is enabled , add annotation to index
         annotation_setting = db.session.query(AppAnnotationSetting).where(AppAnnotationSetting.app_id == app_id).first()
         if annotation_setting:
@@ -211,6 +214,7 @@ class AppAnnotationService:
         annotation.question = args["question"]
 
         db.session.commit()
+        AnnotationReplyIndex.invalidate(app_id)
         # if annotation reply is enabled , add annotation to index
         app_annotation_setting = (
             db.session.query(AppAnnotationSetting).where(AppAnnotationSetting.app_id == app_id).first()
@@ -256,6 +260,7 @@ class AppAnnotationService:
                 db.session.delete(annotation_hit_history)
 
         db.session.commit()
+        AnnotationReplyIndex.invalidate(app_id)
         # if annotation reply is enabled , delete annotation index
         app_annotation_setting = (
             db.session.query(AppAnnotationSetting).where(AppAnnotationSetting.app_id == app_id).first()
@@ -312,6 +317,7 @@ class AppAnnotationService:
         )
 
         db.session.commit()
+        AnnotationReplyIndex.invalidate(app_id)
         return {"deleted_count": deleted_count}
 
     @classmethod
@@ -522,4 +528,5 @@ class AppAnnotationService:
             db.session.delete(annotation)
 
         db.session.commit()
+        AnnotationReplyIndex.invalidate(app_id)
         return {"result": "success"}
@@ -10,6 +10,7 @@ from core.helper import encrypter
 from core.helper.provider_cache import NoOpProviderCredentialCache
 from core.mcp.error import MCPAuthError, MCPError
 from core.mcp.mcp_client import MCPClient
+from core.mcp.mcp_client_pool import mcp_client_pool
 from core.tools.entities.api_entities import ToolProviderApiEntity
 from core.tools.entities.common_entities import I18nObject
 from core.tools.entities.tool_entities import ToolProviderType
@@ -158,6 +159,7 @@ class MCPToolManageService:
 
         db.session.delete(mcp_tool)
         db.session.commit()
+        mcp_client_pool.remove(tenant_id, mcp_tool.server_identifier)
 
     @classmethod
     def update_mcp_provider(
@@ -174,6 +176,7 @@ class MCPToolManageService:
         sse_read_timeout: float | None = None,
     ):
         mcp_provider = cls.get_mcp_provider_by_provider_id(provider_id, tenant_id)
+        original_server_identifier = mcp_provider.server_identifier
 
         reconnect_result = None
         encrypted_server_url = None
@@ -208,6 +211,8 @@ class MCPToolManageService:
             if sse_read_timeout is not None:
                 mcp_provider.sse_read_timeout = sse_read_timeout
             db.session.commit()
+            # pooled sessions may be connected to the previous server url
+            mcp_client_pool.remove(tenant_id, original_server_identifier)
         except IntegrityError as e:
             db.session.rollback()
             error_msg = str(e.orig)
@@ -239,6 +244,7 @@ class MCPToolManageService:
         if not authed:
             mcp_provider.tools = "[]"
         db.session.commit()
+        mcp_client_pool.remove(mcp_provider.tenant_id, mcp_provider.server_identifier)
 
     @classmethod
     def _re_connect_mcp_provider(cls, server_url: str, provider_id: str, tenant_id: str):
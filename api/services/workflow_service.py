@@ -28,6 +28,7 @@ from core.workflow.nodes.event.types import NodeEvent
 from core.workflow.nodes.node_mapping import LATEST_VERSION, NODE_TYPE_CLASSES_MAPPING
 from core.workflow.nodes.start.entities import StartNodeData
 from core.workflow.system_variable import SystemVariable
+from core.workflow.workflow_cache import WorkflowCache
 from core.workflow.workflow_entry import WorkflowEntry
 from events.app_event import app_draft_workflow_was_synced, app_published_workflow_was_updated
 from extensions.ext_database import db
@@ -244,6 +245,9 @@ class WorkflowService:
         # commit db session changes
         db.session.commit()
 
+        # drop the parsed graph and variables of the previous draft
+        WorkflowCache.invalidate(workflow.id)
+
         # trigger app workflow events
         app_draft_workflow_was_synced.send(app_model, synced_draft_workflow=workflow)
 
@@ -676,6 +680,7 @@ class WorkflowService:
             raise WorkflowInUseError("Cannot delete workflow that is published as a tool")
 
         session.delete(workflow)
+        WorkflowCache.invalidate(workflow.id)
         return True
 
 
@@ -1,8 +1,12 @@
 import logging
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import click
 from celery import shared_task  # type: ignore
+from flask import Flask, current_app
 
 from configs import dify_config
 from core.indexing_runner import DocumentIsPausedError, IndexingRunner
@@ -74,8 +78,12 @@ def document_indexing_task(dataset_id: str, document_ids: list):
     db.session.commit()
 
     try:
-        indexing_runner = IndexingRunner()
-        indexing_runner.run(documents)
+        max_workers = min(dify_config.DATASET_INDEXING_MAX_WORKERS, len(documents))
+        if max_workers > 1:
+            _run_concurrently(dataset_id, [document.id for document in documents], max_workers)
+        else:
+            indexing_runner = IndexingRunner()
+            indexing_runner.run(documents)
         end_at = time.perf_counter()
         logging.info(click.style(f"Processed dataset: {dataset_id} latency: {end_at - start_at}", fg="green"))
     except DocumentIsPausedError as ex:
@@ -84,3 +92,36 @@ def document_indexing_task(dataset_id: str, document_ids: list):
         logging.exception("Document indexing task failed, dataset_id: %s", dataset_id)
     finally:
         db.session.close()
+
+
+def _run_concurrently(dataset_id: str, document_ids: list[str], max_workers: int) -> None:
+    """
+    Index the documents concurrently, each one with its own session, and log how many ended in each status.
+    """
+    flask_app = current_app._get_current_object()  # type: ignore
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        statuses = list(executor.map(lambda document_id: _run_document(flask_app, document_id), document_ids))
+
+    summary = ", ".join(f"{status}: {count}" for status, count in Counter(statuses).items())
+    logging.info(click.style(f"Indexed documents of dataset: {dataset_id}, {summary}", fg="green"))
+
+
+def _run_document(flask_app: Flask, document_id: str) -> Optional[str]:
+    with flask_app.app_context():
+        try:
+            document = db.session.query(Document).where(Document.id == document_id).first()
+            if not document:
+                return "deleted"
+            IndexingRunner().run([document])
+            status: Optional[str] = (
+                db.session.query(Document.indexing_status).where(Document.id == document_id).scalar()
+            )
+            return status
+        except DocumentIsPausedError as ex:
+            logging.info(click.style(str(ex), fg="yellow"))
+            return "paused"
+        except Exception:
+            logging.exception("Document indexing failed, document_id: %s", document_id)
+            return "error"
+        finally:
+            db.session.close()
@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from werkzeug.exceptions import Unauthorized
+
+from controllers.service_api.wraps import validate_and_get_api_token
+from core.helper.api_token_cache import ApiTokenAuthContext
+from extensions.ext_redis import redis_client
+
+
+def _auth_context() -> ApiTokenAuthContext:
+    return ApiTokenAuthContext(id="token-id", type="app", tenant_id="tenant-id", app_id="app-id", owner_account_id="a")
+
+
+@patch("controllers.service_api.wraps.Session")
+@patch("controllers.service_api.wraps.ApiTokenCache")
+def test_cached_token_is_validated_without_database(mock_cache_cls, mock_session_cls, app):
+    mock_cache_cls.return_value.get.return_value = _auth_context()
+    # last_used_at was updated less than a minute ago
+    redis_client.set.return_value = None  # type: ignore
+
+    with app.test_request_context(headers={"Authorization": "Bearer app-secret"}):
+        api_token = validate_and_get_api_token("app")
+
+    assert api_token == _auth_context()
+    mock_cache_cls.assert_called_once_with("app-secret", "app")
+    mock_session_cls.assert_not_called()
+
+
+@patch("controllers.service_api.wraps.db")
+@patch("controllers.service_api.wraps.Session")
+@patch("controllers.service_api.wraps.ApiTokenCache")
+def test_token_is_loaded_and_cached_on_miss(mock_cache_cls, mock_session_cls, mock_db, app):
+    mock_cache_cls.return_value.get.return_value = None
+    session = mock_session_cls.return_value.__enter__.return_value
+    token = MagicMock(id="token-id", type="app", tenant_id="tenant-id", app_id="app-id")
+    session.scalar.side_effect = [token, "a"]
+    redis_client.set.return_value = True  # type: ignore
+
+    with app.test_request_context(headers={"Authorization": "Bearer app-secret"}):
+        api_token = validate_and_get_api_token("app")
+
+    assert api_token == _auth_context()
+    mock_cache_cls.return_value.set.assert_called_once_with(_auth_context())
+    # last_used_at is updated once the lock of the minute is taken
+    session.execute.assert_called_once()
+    session.commit.assert_called_once()
+
+
+@patch("controllers.service_api.wraps.db")
+@patch("controllers.service_api.wraps.Session")
+@patch("controllers.service_api.wraps.ApiTokenCache")
+def test_invalid_token(mock_cache_cls, mock_session_cls, mock_db, app):
+    mock_cache_cls.return_value.get.return_value = None
+    mock_session_cls.return_value.__enter__.return_value.scalar.return_value = None
+
+    with app.test_request_context(headers={"Authorization": "Bearer app-secret"}):
+        with pytest.raises(Unauthorized):
+            validate_and_get_api_token("app")
+
+    mock_cache_cls.return_value.set.assert_not_called()
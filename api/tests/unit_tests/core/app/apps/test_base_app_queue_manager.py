@@ -0,0 +1,59 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.entities.queue_entities import QueueNodeSucceededEvent, QueueTextChunkEvent
+from core.workflow.nodes.base.entities import BaseNodeData
+from core.workflow.nodes.enums import NodeType
+from models.model import App
+
+
+class _QueueManager(AppQueueManager):
+    def __init__(self) -> None:
+        super().__init__(task_id="task-id", user_id="user-id", invoke_from=InvokeFrom.SERVICE_API)
+        self.published = MagicMock()
+
+    def _publish(self, event, pub_from):
+        self.published(event, pub_from)
+
+
+def _node_succeeded_event(outputs: dict) -> QueueNodeSucceededEvent:
+    return QueueNodeSucceededEvent(
+        node_execution_id="node-execution-id",
+        node_id="node-id",
+        node_type=NodeType.CODE,
+        node_data=BaseNodeData(title="code"),
+        start_at=datetime.now(),
+        outputs=outputs,
+    )
+
+
+def test_publish_rejects_sqlalchemy_models_in_debug_mode():
+    queue_manager = _QueueManager()
+    event = _node_succeeded_event({"result": [{"app": App()}]})
+
+    with patch("core.app.apps.base_app_queue_manager.dify_config.DEBUG", True):
+        with pytest.raises(TypeError):
+            queue_manager.publish(event, PublishFrom.APPLICATION_MANAGER)
+
+        text_chunk_event = QueueTextChunkEvent(text="hello")
+        queue_manager.publish(text_chunk_event, PublishFrom.APPLICATION_MANAGER)
+
+    queue_manager.published.assert_called_once_with(text_chunk_event, PublishFrom.APPLICATION_MANAGER)
+
+
+def test_publish_skips_payload_check_outside_debug_mode():
+    queue_manager = _QueueManager()
+    event = _node_succeeded_event({"result": [{"app": App()}]})
+
+    with (
+        patch("core.app.apps.base_app_queue_manager.dify_config.DEBUG", False),
+        patch.object(queue_manager, "_check_for_sqlalchemy_models") as mock_check,
+    ):
+        queue_manager.publish(event, PublishFrom.APPLICATION_MANAGER)
+
+    mock_check.assert_not_called()
+    queue_manager.published.assert_called_once_with(event, PublishFrom.APPLICATION_MANAGER)
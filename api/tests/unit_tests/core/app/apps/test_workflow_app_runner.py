@@ -0,0 +1,90 @@
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.app_config.entities import StreamChunkCoalescingEntity
+from core.app.app_config.features.stream_chunk_coalescing.manager import StreamChunkCoalescingConfigManager
+from core.app.apps.workflow_app_runner import WorkflowBasedAppRunner
+from core.app.entities.queue_entities import QueueTextChunkEvent, QueueWorkflowSucceededEvent
+from core.workflow.graph_engine.entities.event import GraphRunSucceededEvent
+
+
+def _create_runner(stream_chunk_coalescing: Optional[StreamChunkCoalescingEntity]) -> WorkflowBasedAppRunner:
+    return WorkflowBasedAppRunner(
+        queue_manager=MagicMock(), app_id="app-id", stream_chunk_coalescing=stream_chunk_coalescing
+    )
+
+
+def _published_events(runner: WorkflowBasedAppRunner) -> list:
+    return [call.args[0] for call in runner._queue_manager.publish.call_args_list]  # type: ignore
+
+
+def test_text_chunks_are_published_one_by_one_without_coalescing():
+    runner = _create_runner(None)
+
+    runner._publish_text_chunk(QueueTextChunkEvent(text="a"))
+    runner._publish_text_chunk(QueueTextChunkEvent(text="b"))
+
+    assert [event.text for event in _published_events(runner)] == ["a", "b"]
+
+
+def test_text_chunks_are_merged_up_to_max_chars():
+    runner = _create_runner(StreamChunkCoalescingEntity(enabled=True, window_ms=60000, max_chars=4))
+
+    for text in ["ab", "c", "de", "f"]:
+        runner._publish_text_chunk(QueueTextChunkEvent(text=text, from_variable_selector=["llm", "text"]))
+    assert [event.text for event in _published_events(runner)] == ["abcde"]
+
+    runner._flush_text_chunk()
+    assert [event.text for event in _published_events(runner)] == ["abcde", "f"]
+
+
+def test_text_chunks_of_different_variables_are_not_merged():
+    runner = _create_runner(StreamChunkCoalescingEntity(enabled=True, window_ms=60000, max_chars=256))
+
+    runner._publish_text_chunk(QueueTextChunkEvent(text="a", from_variable_selector=["llm1", "text"]))
+    runner._publish_text_chunk(QueueTextChunkEvent(text="b", from_variable_selector=["llm1", "text"]))
+    runner._publish_text_chunk(QueueTextChunkEvent(text="c", from_variable_selector=["llm2", "text"]))
+    runner._flush_text_chunk()
+
+    assert [event.text for event in _published_events(runner)] == ["ab", "c"]
+
+
+def test_text_chunk_is_published_when_window_elapses():
+    runner = _create_runner(StreamChunkCoalescingEntity(enabled=True, window_ms=20, max_chars=256))
+
+    with patch("core.app.apps.workflow_app_runner.time.perf_counter", side_effect=[0.0, 0.01, 0.03]):
+        runner._publish_text_chunk(QueueTextChunkEvent(text="a"))
+        runner._publish_text_chunk(QueueTextChunkEvent(text="b"))
+
+    assert [event.text for event in _published_events(runner)] == ["ab"]
+
+
+def test_pending_text_chunk_is_published_before_other_events():
+    runner = _create_runner(StreamChunkCoalescingEntity(enabled=True, window_ms=60000, max_chars=256))
+
+    runner._publish_text_chunk(QueueTextChunkEvent(text="answer"))
+    runner._handle_event(MagicMock(), GraphRunSucceededEvent(outputs={}))
+
+    events = _published_events(runner)
+    assert isinstance(events[0], QueueTextChunkEvent)
+    assert events[0].text == "answer"
+    assert isinstance(events[1], QueueWorkflowSucceededEvent)
+
+
+def test_stream_chunk_coalescing_config():
+    config, keys = StreamChunkCoalescingConfigManager.validate_and_set_defaults({})
+    assert keys == ["stream_chunk_coalescing"]
+    assert config["stream_chunk_coalescing"] == {"enabled": False, "window_ms": 20, "max_chars": 256}
+    assert StreamChunkCoalescingConfigManager.convert(config) is None
+
+    config = {"stream_chunk_coalescing": {"enabled": True, "max_chars": 64}}
+    assert StreamChunkCoalescingConfigManager.convert(config) == StreamChunkCoalescingEntity(
+        enabled=True, window_ms=20, max_chars=64
+    )
+
+    with pytest.raises(ValueError):
+        StreamChunkCoalescingConfigManager.validate_and_set_defaults(
+            {"stream_chunk_coalescing": {"enabled": True, "max_chars": 0}}
+        )
@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from configs import dify_config
+from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.features.annotation_reply.annotation_index import AnnotationReplyIndex
+from core.app.features.annotation_reply.annotation_reply import AnnotationReplyFeature
+from extensions.ext_redis import redis_client
+
+
+@pytest.fixture(autouse=True)
+def _clear_tables():
+    AnnotationReplyIndex._tables.clear()
+    yield
+    AnnotationReplyIndex._tables.clear()
+
+
+def _mock_annotations(mock_db, annotations: list[tuple[str, str]]):
+    query = mock_db.session.query.return_value.where.return_value.order_by.return_value.limit.return_value
+    query.all.return_value = annotations
+    return query
+
+
+@patch("core.app.features.annotation_reply.annotation_index.db")
+def test_exact_match_ignores_whitespace(mock_db):
+    # annotations are loaded newest first
+    _mock_annotations(mock_db, [("newest", "What is  Dify?"), ("older", "What is Dify?"), ("other", "Pricing")])
+
+    assert AnnotationReplyIndex.get_annotation_id("app-id", " What is\nDify? ") == "newest"
+    assert AnnotationReplyIndex.get_annotation_id("app-id", "what is dify?") is None
+    assert AnnotationReplyIndex.get_annotation_id("app-id", "Pricing") == "other"
+    # the table is built once per version
+    mock_db.session.query.assert_called_once()
+
+
+@patch("core.app.features.annotation_reply.annotation_index.db")
+def test_table_is_rebuilt_when_version_changes(mock_db):
+    query = _mock_annotations(mock_db, [("a1", "hello")])
+    assert AnnotationReplyIndex.get_annotation_id("app-id", "hello") == "a1"
+
+    query.all.return_value = [("a2", "hello again")]
+    redis_client.get.return_value = b"1"  # type: ignore
+
+    assert AnnotationReplyIndex.get_annotation_id("app-id", "hello") is None
+    assert AnnotationReplyIndex.get_annotation_id("app-id", "hello again") == "a2"
+    assert mock_db.session.query.call_count == 2
+
+
+@patch("core.app.features.annotation_reply.annotation_index.db")
+def test_apps_with_too_many_annotations_are_not_indexed(mock_db):
+    _mock_annotations(mock_db, [("a1", "q1"), ("a2", "q2"), ("a3", "q3")])
+
+    with patch.object(dify_config, "ANNOTATION_REPLY_EXACT_MATCH_MAX_ANNOTATIONS", 2):
+        assert AnnotationReplyIndex.get_annotation_id("app-id", "q1") is None
+
+
+def test_invalidate_bumps_version():
+    AnnotationReplyIndex._tables["app-id"] = (b"0", {})
+
+    AnnotationReplyIndex.invalidate("app-id")
+
+    redis_client.incr.assert_called_once_with("annotation_reply_index_version:app-id")  # type: ignore
+    assert "app-id" not in AnnotationReplyIndex._tables
+
+
+@patch("core.app.features.annotation_reply.annotation_reply.AppAnnotationService")
+@patch("core.app.features.annotation_reply.annotation_reply.AnnotationReplyIndex")
+@patch("core.app.features.annotation_reply.annotation_reply.db")
+def test_exact_match_skips_vector_search(mock_db, mock_index, mock_annotation_service):
+    mock_index.get_annotation_id.return_value = "annotation-id"
+    annotation = MagicMock()
+    mock_annotation_service.get_annotation_by_id.return_value = annotation
+    feature = AnnotationReplyFeature()
+
+    with patch.object(feature, "_search_annotation") as mock_search:
+        result = feature.query(MagicMock(), MagicMock(), "hello", "user-id", InvokeFrom.SERVICE_API)
+
+    assert result is annotation
+    mock_search.assert_not_called()
+    assert mock_annotation_service.add_annotation_history.call_args.args[-1] == 1.0
@@ -122,37 +122,24 @@ class TestRateLimit:
         assert rate_limit.max_active_requests == 10
 
     @patch("time.time")
-    def test_should_clean_timeout_requests_from_active_list(self, mock_time, redis_patch):
-        """Test cleanup of timed-out requests."""
-        current_time = 1000.0
-        mock_time.return_value = current_time
-
-        # Setup mock Redis with timed-out requests
-        timeout_requests = {
-            b"req1": str(current_time - 700).encode(),  # 700 seconds ago (timeout)
-            b"req2": str(current_time - 100).encode(),  # 100 seconds ago (active)
-        }
-
+    def test_should_clean_timeout_requests_on_enter(self, mock_time, redis_patch):
+        """Test timed-out requests are swept by the enter script."""
+        mock_time.return_value = 1000.0
         redis_patch.configure_mock(
             **{
-                "exists.return_value": True,
-                "get.return_value": b"5",
-                "expire.return_value": True,
-                "hgetall.return_value": timeout_requests,
-                "hdel.return_value": 1,
+                "exists.return_value": False,
+                "setex.return_value": True,
             }
         )
 
         rate_limit = RateLimit("test_client", 5)
-        redis_patch.reset_mock()  # Reset to avoid counting initialization calls
-        rate_limit.flush_cache()
+        rate_limit.enter("req1")
 
-        # Verify timeout request was cleaned up
-        redis_patch.hdel.assert_called_once()
-        call_args = redis_patch.hdel.call_args[0]
-        assert call_args[0] == "dify:rate_limit:test_client:active_requests"
-        assert b"req1" in call_args  # Timeout request should be removed
-        assert b"req2" not in call_args  # Active request should remain
+        enter_script = redis_patch.register_script.return_value
+        enter_script.assert_called_once_with(
+            keys=["dify:rate_limit:test_client:active_requests_by_start_time"],
+            args=[1000.0, RateLimit._REQUEST_MAX_ALIVE_TIME, 5, "req1", RateLimit._ACTIVE_REQUESTS_KEY_TTL],
+        )
 
 
 class TestRateLimitEnterExit:
@@ -164,8 +151,7 @@ class TestRateLimitEnterExit:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.return_value": 2,
-                "hset.return_value": True,
+                "register_script.return_value.return_value": 3,
             }
         )
 
@@ -173,7 +159,7 @@ class TestRateLimitEnterExit:
         request_id = rate_limit.enter()
 
         assert request_id != RateLimit._UNLIMITED_REQUEST_ID
-        redis_patch.hset.assert_called_once()
+        redis_patch.register_script.return_value.assert_called_once()
 
     def test_should_generate_request_id_if_not_provided(self, redis_patch):
         """Test auto-generation of request ID."""
@@ -181,8 +167,7 @@ class TestRateLimitEnterExit:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.return_value": 0,
-                "hset.return_value": True,
+                "register_script.return_value.return_value": 1,
             }
         )
 
@@ -197,8 +182,7 @@ class TestRateLimitEnterExit:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.return_value": 0,
-                "hset.return_value": True,
+                "register_script.return_value.return_value": 1,
             }
         )
 
@@ -212,14 +196,16 @@ class TestRateLimitEnterExit:
         """Test request removal on exit."""
         redis_patch.configure_mock(
             **{
-                "hdel.return_value": 1,
+                "zrem.return_value": 1,
             }
         )
 
         rate_limit = RateLimit("test_client", 5)
         rate_limit.exit("test_request_id")
 
-        redis_patch.hdel.assert_called_once_with("dify:rate_limit:test_client:active_requests", "test_request_id")
+        redis_patch.zrem.assert_called_once_with(
+            "dify:rate_limit:test_client:active_requests_by_start_time", "test_request_id"
+        )
 
     def test_should_raise_quota_exceeded_when_at_limit(self, redis_patch):
         """Test quota exceeded error when at limit."""
@@ -227,7 +213,7 @@ class TestRateLimitEnterExit:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.return_value": 5,  # At limit
+                "register_script.return_value.return_value": 0,  # At limit
             }
         )
 
@@ -245,9 +231,8 @@ class TestRateLimitEnterExit:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.return_value": 4,  # Under limit after exit
-                "hset.return_value": True,
-                "hdel.return_value": 1,
+                "register_script.return_value.return_value": 5,  # Under limit after exit
+                "zrem.return_value": 1,
             }
         )
 
@@ -266,7 +251,6 @@ class TestRateLimitEnterExit:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.return_value": 0,
             }
         )
 
@@ -282,6 +266,33 @@ class TestRateLimitEnterExit:
         # Should have called setex again due to cache flush
         redis_patch.setex.assert_called()
 
+    @patch("time.time")
+    def test_should_reject_without_redis_when_local_requests_reach_limit(self, mock_time, redis_patch):
+        """Test requests of this process alone short-circuit the admission check."""
+        mock_time.return_value = 1000.0
+        redis_patch.configure_mock(
+            **{
+                "exists.return_value": False,
+                "setex.return_value": True,
+                "register_script.return_value.return_value": 1,
+            }
+        )
+
+        rate_limit = RateLimit("test_client", 2)
+        rate_limit.enter("req1")
+        rate_limit.enter("req2")
+        enter_script = redis_patch.register_script.return_value
+        enter_script.reset_mock()
+
+        with pytest.raises(AppInvokeQuotaExceededError):
+            rate_limit.enter("req3")
+        enter_script.assert_not_called()
+
+        # local requests older than the max alive time are not counted
+        mock_time.return_value = 1000.0 + RateLimit._REQUEST_MAX_ALIVE_TIME + 1
+        rate_limit.enter("req4")
+        enter_script.assert_called_once()
+
     def test_should_return_unlimited_id_when_disabled(self):
         """Test unlimited ID return when rate limiting disabled."""
         rate_limit = RateLimit("test_client", 0)
@@ -294,7 +305,7 @@ class TestRateLimitEnterExit:
         rate_limit = RateLimit("test_client", 0)
         rate_limit.exit(RateLimit._UNLIMITED_REQUEST_ID)
 
-        redis_patch.hdel.assert_not_called()
+        redis_patch.zrem.assert_not_called()
 
 
 class TestRateLimitGenerator:
@@ -306,7 +317,7 @@ class TestRateLimitGenerator:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hdel.return_value": 1,
+                "zrem.return_value": 1,
             }
         )
 
@@ -318,7 +329,9 @@ class TestRateLimitGenerator:
         result = list(wrapped_gen)
 
         assert result == ["item1", "item2", "item3"]
-        redis_patch.hdel.assert_called_once_with("dify:rate_limit:test_client:active_requests", request_id)
+        redis_patch.zrem.assert_called_once_with(
+            "dify:rate_limit:test_client:active_requests_by_start_time", request_id
+        )
 
     def test_should_handle_mapping_input_directly(self, sample_mapping):
         """Test direct return of mapping input."""
@@ -333,7 +346,7 @@ class TestRateLimitGenerator:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hdel.return_value": 1,
+                "zrem.return_value": 1,
             }
         )
 
@@ -346,7 +359,9 @@ class TestRateLimitGenerator:
         with pytest.raises(ValueError):
             list(wrapped_gen)
 
-        redis_patch.hdel.assert_called_once_with("dify:rate_limit:test_client:active_requests", request_id)
+        redis_patch.zrem.assert_called_once_with(
+            "dify:rate_limit:test_client:active_requests_by_start_time", request_id
+        )
 
     def test_should_cleanup_on_explicit_close(self, redis_patch, sample_generator):
         """Test cleanup on explicit generator close."""
@@ -354,7 +369,7 @@ class TestRateLimitGenerator:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hdel.return_value": 1,
+                "zrem.return_value": 1,
             }
         )
 
@@ -365,7 +380,7 @@ class TestRateLimitGenerator:
         wrapped_gen = rate_limit.generate(generator, request_id)
         wrapped_gen.close()
 
-        redis_patch.hdel.assert_called_once()
+        redis_patch.zrem.assert_called_once()
 
     def test_should_handle_generator_without_close_method(self, redis_patch):
         """Test handling generator without close method."""
@@ -373,7 +388,7 @@ class TestRateLimitGenerator:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hdel.return_value": 1,
+                "zrem.return_value": 1,
             }
         )
 
@@ -399,7 +414,7 @@ class TestRateLimitGenerator:
         wrapped_gen = rate_limit.generate(generator, "test_request")
         wrapped_gen.close()  # Should not raise error
 
-        redis_patch.hdel.assert_called_once()
+        redis_patch.zrem.assert_called_once()
 
     def test_should_prevent_iteration_after_close(self, redis_patch, sample_generator):
         """Test StopIteration after generator is closed."""
@@ -407,7 +422,7 @@ class TestRateLimitGenerator:
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hdel.return_value": 1,
+                "zrem.return_value": 1,
             }
         )
 
@@ -455,24 +470,21 @@ class TestRateLimitConcurrency:
 
     def test_should_handle_concurrent_enter_requests(self, redis_patch):
         """Test concurrent enter requests handling."""
-        # Setup mock to simulate realistic Redis behavior
+        # Setup mock to simulate the enter script, it never releases a request
         request_count = 0
 
-        def mock_hlen(key):
-            nonlocal request_count
-            return request_count
-
-        def mock_hset(key, field, value):
+        def mock_enter_script(keys, args):
             nonlocal request_count
+            if request_count >= args[2]:
+                return 0
             request_count += 1
-            return True
+            return request_count
 
         redis_patch.configure_mock(
             **{
                 "exists.return_value": False,
                 "setex.return_value": True,
-                "hlen.side_effect": mock_hlen,
-                "hset.side_effect": mock_hset,
+                "register_script.return_value.side_effect": mock_enter_script,
             }
         )
 
@@ -535,35 +547,27 @@ class TestRateLimitConcurrency:
         import threading
 
         lock = threading.Lock()
-        data = {}
-        hashes = {}
+        sorted_sets: dict[str, dict[str, float]] = {}
 
-        def mock_hlen(key):
+        def mock_enter_script(keys, args):
+            now, max_alive_time, max_active_requests, request_id, _ = args
             with lock:
-                return len(hashes.get(key, {}))
-
-        def mock_hset(key, field, value):
-            with lock:
-                if key not in hashes:
-                    hashes[key] = {}
-                hashes[key][field] = str(value).encode("utf-8")
-                return True
-
-        def mock_hdel(key, *fields):
+                requests = sorted_sets.setdefault(keys[0], {})
+                for key in [key for key, started_at in requests.items() if started_at <= now - max_alive_time]:
+                    del requests[key]
+                if len(requests) >= max_active_requests:
+                    return 0
+                requests[request_id] = now
+                return len(requests)
+
+        def mock_zrem(key, *members):
             with lock:
-                if key in hashes:
-                    count = 0
-                    for field in fields:
-                        if field in hashes[key]:
-                            del hashes[key][field]
-                            count += 1
-                    return count
-                return 0
+                requests = sorted_sets.get(key, {})
+                return sum(1 for member in members if requests.pop(member, None) is not None)
 
         return {
             "exists.return_value": False,
             "setex.return_value": True,
-            "hlen.side_effect": mock_hlen,
-            "hset.side_effect": mock_hset,
-            "hdel.side_effect": mock_hdel,
+            "register_script.return_value.side_effect": mock_enter_script,
+            "zrem.side_effect": mock_zrem,
         }
@@ -0,0 +1,86 @@
+import base64
+from unittest.mock import patch
+
+import pytest
+from cachetools import LRUCache
+
+from core.file import File, FileTransferMethod, FileType, file_manager
+
+CONTENT = bytes(range(256)) * 40
+
+
+def _stored_file(storage_key: str = "upload_files/tenant/image.png") -> File:
+    return File(
+        id="file-id",
+        tenant_id="tenant-id",
+        type=FileType.IMAGE,
+        transfer_method=FileTransferMethod.LOCAL_FILE,
+        related_id="upload-file-id",
+        filename="image.png",
+        extension=".png",
+        mime_type="image/png",
+        size=len(CONTENT),
+        storage_key=storage_key,
+    )
+
+
+def _chunks(content: bytes, size: int):
+    return iter([content[i : i + size] for i in range(0, len(content), size)])
+
+
+@pytest.fixture
+def encoded_file_cache():
+    cache: LRUCache[str, str] = LRUCache(maxsize=1024 * 1024, getsizeof=len)
+    with patch.object(file_manager, "_encoded_file_cache", cache):
+        yield cache
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000, len(CONTENT)])
+def test_encode_file_content_in_chunks(chunk_size):
+    with patch.object(file_manager, "storage") as mock_storage:
+        mock_storage.load.return_value = _chunks(CONTENT, chunk_size)
+
+        assert file_manager._encode_file_content("key") == base64.b64encode(CONTENT).decode("utf-8")
+        mock_storage.load.assert_called_once_with("key", stream=True)
+
+
+def test_encoded_stored_file_is_cached(encoded_file_cache):
+    with patch.object(file_manager, "storage") as mock_storage:
+        mock_storage.load.side_effect = lambda *args, **kwargs: _chunks(CONTENT, 1024)
+
+        first = file_manager._get_encoded_string(_stored_file())
+        second = file_manager._get_encoded_string(_stored_file())
+        other = file_manager._get_encoded_string(_stored_file("upload_files/tenant/other.png"))
+
+    assert first == second == other == base64.b64encode(CONTENT).decode("utf-8")
+    assert mock_storage.load.call_count == 2
+    assert encoded_file_cache.currsize == 2 * len(first)
+
+
+def test_file_larger_than_cache_is_not_cached():
+    cache: LRUCache[str, str] = LRUCache(maxsize=100, getsizeof=len)
+    with (
+        patch.object(file_manager, "_encoded_file_cache", cache),
+        patch.object(file_manager, "storage") as mock_storage,
+    ):
+        mock_storage.load.side_effect = lambda *args, **kwargs: _chunks(CONTENT, 1024)
+
+        file_manager._get_encoded_string(_stored_file())
+        file_manager._get_encoded_string(_stored_file())
+
+    assert mock_storage.load.call_count == 2
+    assert len(cache) == 0
+
+
+def test_cache_disabled(encoded_file_cache):
+    with (
+        patch.object(file_manager.dify_config, "MULTIMODAL_ENCODED_FILE_CACHE_SIZE", 0),
+        patch.object(file_manager, "storage") as mock_storage,
+    ):
+        mock_storage.load.side_effect = lambda *args, **kwargs: _chunks(CONTENT, 1024)
+
+        file_manager._get_encoded_string(_stored_file())
+        file_manager._get_encoded_string(_stored_file())
+
+    assert mock_storage.load.call_count == 2
+    assert len(encoded_file_cache) == 0
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.helper import api_token_cache
+from core.helper.api_token_cache import ApiTokenAuthContext, ApiTokenCache
+from extensions.ext_redis import redis_client
+
+
+@pytest.fixture(autouse=True)
+def _clear_local_cache():
+    api_token_cache._local_cache.clear()
+    yield
+    api_token_cache._local_cache.clear()
+
+
+def _auth_context() -> ApiTokenAuthContext:
+    return ApiTokenAuthContext(id="token-id", type="app", tenant_id="tenant-id", app_id="app-id", owner_account_id="a")
+
+
+def test_cache_key_does_not_contain_token():
+    cache = ApiTokenCache("app-secret", "app")
+
+    assert "app-secret" not in cache.cache_key
+    assert cache.cache_key != ApiTokenCache("app-secret", "dataset").cache_key
+
+
+def test_get_reads_redis_then_local_cache():
+    auth_context = _auth_context()
+    redis_client.get.return_value = auth_context.model_dump_json().encode()  # type: ignore
+
+    cache = ApiTokenCache("app-secret", "app")
+    assert cache.get() == auth_context
+    assert cache.get() == auth_context
+    redis_client.get.assert_called_once_with(cache.cache_key)  # type: ignore
+
+
+def test_delete_revokes_local_and_redis_cache():
+    cache = ApiTokenCache("app-secret", "app")
+    cache.set(_auth_context())
+    redis_client.setex.assert_called_once()  # type: ignore
+
+    cache.delete()
+
+    redis_client.delete.assert_called_once_with(cache.cache_key)  # type: ignore
+    assert cache.get() is None
+
+
+def test_cache_disabled():
+    cache = ApiTokenCache("app-secret", "app")
+
+    with patch("core.helper.api_token_cache.dify_config.SERVICE_API_AUTH_CACHE_TTL", 0):
+        cache.set(_auth_context())
+        assert cache.get() is None
+
+    redis_client.setex.assert_not_called()  # type: ignore
@@ -0,0 +1,195 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from core.mcp.error import MCPConnectionError
+from core.mcp.mcp_client_pool import MCPClientPool, MCPClientPoolKey
+
+
+class FakeMCPClient:
+    """Stand-in for MCPClient that records the session lifecycle."""
+
+    def __init__(self, alive: bool = True):
+        self.alive = alive
+        self.entered = 0
+        self.cleaned_up = 0
+        self.pings = 0
+        self.in_use = False
+
+    def __enter__(self):
+        self.entered += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    def ping(self):
+        self.pings += 1
+        if not self.alive:
+            raise MCPConnectionError("connection closed")
+
+    def invoke_tool(self, tool_name: str, tool_args: dict):
+        assert not self.in_use, "session used concurrently"
+        self.in_use = True
+        try:
+            return {"tool_name": tool_name, "tool_args": tool_args}
+        finally:
+            self.in_use = False
+
+    def cleanup(self):
+        self.cleaned_up += 1
+
+
+KEY = MCPClientPoolKey(tenant_id="tenant", provider_id="provider", server_url="http://localhost/mcp")
+
+
+def _create_pool(**kwargs) -> MCPClientPool:
+    options = {"max_idle_per_key": 2, "idle_timeout": 300, "health_check_interval": 30}
+    options.update(kwargs)
+    return MCPClientPool(**options)
+
+
+def test_client_is_reused_between_calls():
+    pool = _create_pool()
+    created: list[FakeMCPClient] = []
+
+    def factory():
+        created.append(FakeMCPClient())
+        return created[-1]
+
+    for _ in range(3):
+        with pool.client(KEY, factory) as client:
+            client.invoke_tool("tool", {})
+
+    assert len(created) == 1
+    assert created[0].entered == 1
+    assert created[0].cleaned_up == 0
+
+
+def test_clients_are_not_shared_between_keys():
+    pool = _create_pool()
+    other_key = MCPClientPoolKey(tenant_id="other", provider_id="provider", server_url="http://localhost/mcp")
+
+    with pool.client(KEY, FakeMCPClient) as client:
+        pass
+    with pool.client(other_key, FakeMCPClient) as other_client:
+        pass
+
+    assert client is not other_client
+
+
+def test_client_is_closed_when_call_fails():
+    pool = _create_pool()
+    created: list[FakeMCPClient] = []
+
+    def factory():
+        created.append(FakeMCPClient())
+        return created[-1]
+
+    with pytest.raises(MCPConnectionError):
+        with pool.client(KEY, factory):
+            raise MCPConnectionError("broken pipe")
+
+    with pool.client(KEY, factory):
+        pass
+
+    assert len(created) == 2
+    assert created[0].cleaned_up == 1
+
+
+def test_stale_client_is_health_checked_and_replaced():
+    pool = _create_pool(health_check_interval=10)
+    created: list[FakeMCPClient] = []
+
+    def factory():
+        created.append(FakeMCPClient())
+        return created[-1]
+
+    with patch("core.mcp.mcp_client_pool.time.monotonic", return_value=100.0):
+        with pool.client(KEY, factory):
+            pass
+
+    created[0].alive = False
+    with patch("core.mcp.mcp_client_pool.time.monotonic", return_value=120.0):
+        with pool.client(KEY, factory) as client:
+            pass
+
+    assert created[0].pings == 1
+    assert created[0].cleaned_up == 1
+    assert client is created[1]
+
+
+def test_idle_client_expires():
+    pool = _create_pool(idle_timeout=60)
+    created: list[FakeMCPClient] = []
+
+    def factory():
+        created.append(FakeMCPClient())
+        return created[-1]
+
+    with patch("core.mcp.mcp_client_pool.time.monotonic", return_value=100.0):
+        with pool.client(KEY, factory):
+            pass
+
+    with patch("core.mcp.mcp_client_pool.time.monotonic", return_value=200.0):
+        with pool.client(KEY, factory):
+            pass
+
+    assert len(created) == 2
+    assert created[0].cleaned_up == 1
+    assert created[0].pings == 0
+
+
+def test_remove_closes_idle_clients_of_provider():
+    pool = _create_pool()
+    with pool.client(KEY, FakeMCPClient) as client:
+        pass
+
+    pool.remove("tenant", "provider")
+
+    assert client.cleaned_up == 1
+    with pool.client(KEY, FakeMCPClient) as new_client:
+        pass
+    assert new_client is not client
+
+
+def test_pooling_disabled():
+    pool = _create_pool(max_idle_per_key=0)
+    with pool.client(KEY, FakeMCPClient) as client:
+        pass
+
+    assert client.entered == 1
+    assert client.cleaned_up == 1
+
+
+def test_concurrent_callers_get_exclusive_clients():
+    pool = _create_pool(max_idle_per_key=4)
+    created: list[FakeMCPClient] = []
+    lock = threading.Lock()
+    errors: list[BaseException] = []
+
+    def factory():
+        client = FakeMCPClient()
+        with lock:
+            created.append(client)
+        return client
+
+    def worker():
+        try:
+            for i in range(50):
+                with pool.client(KEY, factory) as client:
+                    client.invoke_tool("tool", {"i": i})
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(created) <= 8
+    pool.clear()
+    assert all(client.cleaned_up == 1 for client in created)
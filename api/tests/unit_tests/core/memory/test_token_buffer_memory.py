@@ -0,0 +1,186 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cachetools import TTLCache
+
+from core.memory import token_buffer_memory
+from core.memory.token_buffer_memory import TokenBufferMemory
+from core.model_runtime.entities import AssistantPromptMessage, TextPromptMessageContent, UserPromptMessage
+from models.model import AppMode, Message, MessageFile
+from models.workflow import Workflow
+
+
+def _messages(count: int, answered_last: bool = True) -> list[SimpleNamespace]:
+    """Messages of a single thread, newest first as they are queried."""
+    messages = [
+        SimpleNamespace(
+            id=f"message-{i}",
+            parent_message_id=f"message-{i - 1}" if i > 0 else None,
+            query=f"query {i}",
+            answer=f"answer {i}",
+            answer_tokens=10,
+            workflow_run_id=f"workflow-run-{i}",
+        )
+        for i in range(count)
+    ]
+    if not answered_last:
+        messages[-1].answer = ""
+        messages[-1].answer_tokens = 0
+    return list(reversed(messages))
+
+
+def _content_length(prompt_messages) -> int:
+    return sum(len(str(prompt_message.content)) for prompt_message in prompt_messages)
+
+
+@pytest.fixture(autouse=True)
+def history_files_cache():
+    cache: TTLCache = TTLCache(maxsize=16, ttl=600)
+    with patch.object(token_buffer_memory, "_history_files_cache", cache):
+        yield cache
+
+
+class _FakeSession:
+    """Returns the messages, message files and workflows set on it for the statements selecting them."""
+
+    def __init__(self):
+        self.messages: list = []
+        self.message_files: list = []
+        self.workflow_runs: list[tuple[str, str]] = []
+        self.workflows: list = []
+        self.statements: list = []
+
+    def scalars(self, stmt):
+        self.statements.append(stmt)
+        entity = stmt.column_descriptions[0]["entity"]
+        rows = {Message: self.messages, MessageFile: self.message_files, Workflow: self.workflows}[entity]
+        return MagicMock(all=MagicMock(return_value=rows))
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return MagicMock(tuples=MagicMock(return_value=self.workflow_runs))
+
+    def count_statements(self, entity) -> int:
+        return sum(1 for stmt in self.statements if stmt.column_descriptions[0]["entity"] is entity)
+
+
+@pytest.fixture
+def session():
+    session = _FakeSession()
+    with patch.object(token_buffer_memory, "db", SimpleNamespace(session=session)):
+        yield session
+
+
+def _memory(mode: AppMode = AppMode.CHAT) -> TokenBufferMemory:
+    conversation = MagicMock(id="conversation-id", mode=mode)
+    model_instance = MagicMock()
+    model_instance.get_llm_num_tokens.side_effect = _content_length
+    return TokenBufferMemory(conversation=conversation, model_instance=model_instance)
+
+
+def test_files_are_only_loaded_for_new_messages(session):
+    session.messages = _messages(3, answered_last=False)
+
+    history = _memory().get_history_prompt_messages(max_token_limit=10000)
+
+    assert [prompt_message.content for prompt_message in history] == ["query 0", "answer 0", "query 1", "answer 1"]
+    # the files of all messages are loaded with one query
+    assert session.count_statements(MessageFile) == 1
+
+    messages = _messages(4, answered_last=False)
+    messages[2].answer = "edited answer 1"
+    session.messages = messages
+    session.statements.clear()
+
+    history = _memory().get_history_prompt_messages(max_token_limit=10000)
+
+    assert [prompt_message.content for prompt_message in history] == [
+        "query 0",
+        "answer 0",
+        "query 1",
+        "edited answer 1",
+        "query 2",
+        "answer 2",
+    ]
+    # only the files of the message answered since the previous turn are loaded
+    assert session.count_statements(MessageFile) == 1
+    assert session.statements[-1].compile().params["message_id_1"] == ["message-2"]
+
+
+def test_cached_files_are_sent_again(session):
+    session.messages = _messages(1)
+    session.message_files = [SimpleNamespace(message_id="message-0")]
+    file_content = TextPromptMessageContent(data="file")
+
+    with (
+        patch.object(token_buffer_memory.FileUploadConfigManager, "convert") as mock_convert,
+        patch.object(token_buffer_memory.file_factory, "build_from_message_files", return_value=[MagicMock()]),
+        patch.object(token_buffer_memory.file_manager, "to_prompt_message_content", return_value=file_content),
+    ):
+        mock_convert.return_value.image_config = None
+        first = _memory().get_history_prompt_messages(max_token_limit=10000)
+        second = _memory().get_history_prompt_messages(max_token_limit=10000)
+
+    assert session.count_statements(MessageFile) == 1
+    assert mock_convert.call_count == 1
+    for history in (first, second):
+        assert isinstance(history[0], UserPromptMessage)
+        assert history[0].content == [file_content, TextPromptMessageContent(data="query 0")]
+        assert history[1] == AssistantPromptMessage(content="answer 0")
+
+
+def test_workflow_file_configs_are_resolved_once(session):
+    session.messages = _messages(3)
+    session.message_files = [SimpleNamespace(message_id=f"message-{i}") for i in range(3)]
+    session.workflow_runs = [(f"workflow-run-{i}", "workflow-id") for i in range(3)]
+    session.workflows = [MagicMock(id="workflow-id", features_dict={})]
+
+    with (
+        patch.object(token_buffer_memory.FileUploadConfigManager, "convert") as mock_convert,
+        patch.object(token_buffer_memory.file_factory, "build_from_message_files", return_value=[]) as mock_build,
+    ):
+        mock_convert.return_value.image_config = None
+        _memory(AppMode.ADVANCED_CHAT).get_history_prompt_messages(max_token_limit=10000)
+
+    mock_convert.assert_called_once_with({}, is_vision=False)
+    assert mock_build.call_count == 3
+    assert session.count_statements(MessageFile) == 1
+    assert session.count_statements(Workflow) == 1
+    assert len(session.statements) == 4
+
+
+def test_workflow_run_not_found(session):
+    session.messages = _messages(1)
+    session.message_files = [SimpleNamespace(message_id="message-0")]
+
+    with pytest.raises(ValueError, match="Workflow run not found: workflow-run-0"):
+        _memory(AppMode.ADVANCED_CHAT).get_history_prompt_messages(max_token_limit=10000)
+
+
+def test_cache_disabled(session, history_files_cache):
+    session.messages = _messages(2)
+
+    with patch.object(token_buffer_memory.dify_config, "CONVERSATION_HISTORY_CACHE_SIZE", 0):
+        _memory().get_history_prompt_messages(max_token_limit=10000)
+        _memory().get_history_prompt_messages(max_token_limit=10000)
+
+    assert session.count_statements(MessageFile) == 2
+    assert len(history_files_cache) == 0
+
+
+@pytest.mark.parametrize("max_token_limit", [0, 7, 30, 100, 1000])
+def test_prune_keeps_the_latest_messages_within_the_limit(max_token_limit):
+    prompt_messages = [
+        UserPromptMessage(content="x" * (i * 37 % 50 + 1)) if i % 2 == 0 else AssistantPromptMessage(content="y")
+        for i in range(40)
+    ]
+    memory = _memory()
+
+    # removing the oldest message one at a time until the rest fits
+    expected = list(prompt_messages)
+    while _content_length(expected) > max_token_limit and len(expected) > 1:
+        expected.pop(0)
+
+    assert memory._prune_prompt_messages(prompt_messages, max_token_limit) == expected
+    assert memory.model_instance.get_llm_num_tokens.call_count <= 7
@@ -0,0 +1,98 @@
+import pytest
+
+from core.moderation.base import ModerationAction
+from core.moderation.keywords.keywords import KeywordsModeration
+from core.moderation.keywords.matcher import KeywordsMatcher, get_keywords_matcher
+
+
+def _build_config(keywords: str, inputs_enabled: bool = True, outputs_enabled: bool = True) -> dict:
+    return {
+        "keywords": keywords,
+        "inputs_config": {"enabled": inputs_enabled, "preset_response": "inputs blocked"},
+        "outputs_config": {"enabled": outputs_enabled, "preset_response": "outputs blocked"},
+    }
+
+
+@pytest.mark.parametrize(
+    ("keywords", "text", "expected"),
+    [
+        (["bad"], "this is BAD", True),
+        (["bad"], "this is fine", False),
+        (["he", "she", "his", "hers"], "ushers", True),
+        (["abcd", "bc"], "xabcx", True),
+        (["abcd", "bcx"], "abcx", True),
+        (["abcd"], "abcabcd", True),
+        (["abcd"], "abcabc", False),
+        (["", "a"], "b", False),
+        ([], "anything", False),
+    ],
+)
+def test_keywords_matcher_search(keywords: list[str], text: str, expected: bool):
+    matcher = KeywordsMatcher(keywords)
+
+    assert matcher.search(text) is expected
+    assert matcher.search(text) is any(keyword and keyword.lower() in text.lower() for keyword in keywords)
+
+
+def test_keywords_stream_matcher_matches_across_chunks():
+    stream = KeywordsMatcher(["forbidden", "secret"]).stream()
+
+    assert stream.feed("this is a sec") is False
+    assert stream.feed("") is False
+    assert stream.feed("r") is False
+    assert stream.feed("et message") is True
+    # stays matched once a keyword has been seen
+    assert stream.feed("harmless") is True
+
+
+def test_get_keywords_matcher_is_cached_per_config():
+    assert get_keywords_matcher("a\nb") is get_keywords_matcher("a\nb")
+    assert get_keywords_matcher("a\nb") is not get_keywords_matcher("a\nc")
+
+
+def test_keywords_moderation_for_inputs():
+    moderation = KeywordsModeration(app_id="app", tenant_id="tenant", config=_build_config("foo\nbar"))
+
+    result = moderation.moderation_for_inputs({"name": "FooBar"}, query="")
+
+    assert result.flagged is True
+    assert result.action == ModerationAction.DIRECT_OUTPUT
+    assert result.preset_response == "inputs blocked"
+
+    result = moderation.moderation_for_inputs({"name": "baz"}, query="is it bar?")
+
+    assert result.flagged is True
+
+
+def test_keywords_moderation_for_outputs():
+    moderation = KeywordsModeration(app_id="app", tenant_id="tenant", config=_build_config("foo\nbar"))
+
+    assert moderation.moderation_for_outputs("nothing here").flagged is False
+
+    result = moderation.moderation_for_outputs("a foo appears")
+
+    assert result.flagged is True
+    assert result.preset_response == "outputs blocked"
+
+
+def test_keywords_moderation_outputs_stream_matcher():
+    moderation = KeywordsModeration(app_id="app", tenant_id="tenant", config=_build_config("foo"))
+    stream = moderation.create_outputs_stream_matcher()
+
+    assert stream is not None
+    assert stream.feed("f") is False
+    assert stream.feed("oo") is True
+
+    moderation = KeywordsModeration(
+        app_id="app", tenant_id="tenant", config=_build_config("foo", outputs_enabled=False)
+    )
+
+    assert moderation.create_outputs_stream_matcher() is None
+
+
+def test_keywords_stream_matcher_is_consistent_with_search_for_final_sigma():
+    matcher = KeywordsMatcher(["ΟΔΟΣ"])
+    stream = matcher.stream()
+
+    assert matcher.search("οδος") is True
+    assert stream.feed("ΟΔΟΣ") is True
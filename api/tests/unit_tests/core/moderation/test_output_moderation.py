@@ -0,0 +1,167 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from core.app.apps.base_app_queue_manager import AppQueueManager
+from core.moderation.base import ModerationAction, ModerationOutputsResult
+from core.moderation.output_moderation import ModerationRule, OutputModeration
+
+
+def _create_output_moderation(rule_type: str = "api") -> OutputModeration:
+    output_moderation = OutputModeration(
+        tenant_id="tenant",
+        app_id="app",
+        rule=ModerationRule(
+            type=rule_type,
+            config={
+                "keywords": "forbidden",
+                "inputs_config": {"enabled": False},
+                "outputs_config": {"enabled": True, "preset_response": "blocked"},
+            },
+        ),
+        queue_manager=MagicMock(spec=AppQueueManager),
+    )
+    # avoid starting a real worker thread when tokens are appended
+    output_moderation.thread = MagicMock()
+    return output_moderation
+
+
+@pytest.fixture
+def mock_sleep():
+    with patch("core.moderation.output_moderation.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+def test_worker_windowed_only_sends_unchecked_tail(app: Flask, mock_sleep: MagicMock):
+    output_moderation = _create_output_moderation()
+    output_moderation.buffer = ["abcdef", "ghij"]
+    moderation_buffers = []
+
+    def fake_moderation(tenant_id: str, app_id: str, moderation_buffer: str):
+        moderation_buffers.append(moderation_buffer)
+        if len(moderation_buffers) == 1:
+            output_moderation.append_new_token("klmno")
+        else:
+            output_moderation.thread_running = False
+        return ModerationOutputsResult(flagged=False, action=ModerationAction.DIRECT_OUTPUT)
+
+    with patch.object(OutputModeration, "moderation", side_effect=fake_moderation):
+        output_moderation.worker(flask_app=app, buffer_size=3, window_enabled=True, window_overlap_size=2)
+
+    assert moderation_buffers == ["abcdefghij", "ijklmno"]
+    output_moderation.queue_manager.publish.assert_not_called()
+    assert output_moderation.final_output is None
+
+
+def test_worker_windowed_overridden_replaces_window_only(app: Flask, mock_sleep: MagicMock):
+    output_moderation = _create_output_moderation()
+    output_moderation.buffer = ["abcdef", "ghij"]
+    results = iter(
+        [
+            ModerationOutputsResult(flagged=False, action=ModerationAction.OVERRIDDEN),
+            ModerationOutputsResult(flagged=True, action=ModerationAction.OVERRIDDEN, text="IJKLMNO"),
+        ]
+    )
+
+    def fake_moderation(tenant_id: str, app_id: str, moderation_buffer: str):
+        output_moderation.append_new_token("klmno")
+        return next(results)
+
+    def publish(event, pub_from):
+        output_moderation.thread_running = False
+
+    output_moderation.queue_manager.publish.side_effect = publish
+    with patch.object(OutputModeration, "moderation", side_effect=fake_moderation):
+        output_moderation.worker(flask_app=app, buffer_size=3, window_enabled=True, window_overlap_size=2)
+
+    event = output_moderation.queue_manager.publish.call_args.args[0]
+    # the checked prefix and the text appended during moderation are kept
+    assert event.text == "abcdefghIJKLMNOklmno"
+
+
+def test_worker_windowed_consecutive_overrides_keep_earlier_redactions(app: Flask, mock_sleep: MagicMock):
+    output_moderation = _create_output_moderation()
+    output_moderation.buffer = ["bad1 xx"]
+    moderation_buffers = []
+
+    def fake_moderation(tenant_id: str, app_id: str, moderation_buffer: str):
+        moderation_buffers.append(moderation_buffer)
+        if len(moderation_buffers) == 1:
+            output_moderation.append_new_token(" bad2 yy")
+        return ModerationOutputsResult(
+            flagged=True,
+            action=ModerationAction.OVERRIDDEN,
+            text=moderation_buffer.replace("bad1", "***").replace("bad2", "***"),
+        )
+
+    def publish(event, pub_from):
+        if len(moderation_buffers) == 2:
+            output_moderation.thread_running = False
+
+    output_moderation.queue_manager.publish.side_effect = publish
+    with patch.object(OutputModeration, "moderation", side_effect=fake_moderation):
+        output_moderation.worker(flask_app=app, buffer_size=3, window_enabled=True, window_overlap_size=2)
+
+    assert moderation_buffers == ["bad1 xx", "xx bad2 yy"]
+    events = [call.args[0] for call in output_moderation.queue_manager.publish.call_args_list]
+    assert [event.text for event in events] == ["*** xx bad2 yy", "*** xx *** yy"]
+
+
+def test_worker_sends_whole_buffer_when_window_disabled(app: Flask, mock_sleep: MagicMock):
+    output_moderation = _create_output_moderation()
+    output_moderation.buffer = ["abc", "def"]
+    moderation_buffers = []
+
+    def fake_moderation(tenant_id: str, app_id: str, moderation_buffer: str):
+        moderation_buffers.append(moderation_buffer)
+        if len(moderation_buffers) == 1:
+            output_moderation.append_new_token("ghi")
+            return None
+
+        return ModerationOutputsResult(flagged=True, action=ModerationAction.DIRECT_OUTPUT, preset_response="blocked")
+
+    with patch.object(OutputModeration, "moderation", side_effect=fake_moderation):
+        output_moderation.worker(flask_app=app, buffer_size=3)
+
+    assert moderation_buffers == ["abcdef", "abcdefghi"]
+    assert output_moderation.final_output == "blocked"
+    mock_sleep.assert_not_called()
+
+
+def test_moderation_completion_keeps_buffer(mock_sleep: MagicMock):
+    output_moderation = _create_output_moderation()
+    output_moderation.buffer = ["abc", "def"]
+
+    with patch.object(
+        OutputModeration,
+        "moderation",
+        return_value=ModerationOutputsResult(flagged=False, action=ModerationAction.DIRECT_OUTPUT),
+    ):
+        completion, flagged = output_moderation.moderation_completion("abcdef")
+
+    assert (completion, flagged) == ("abcdef", False)
+    assert output_moderation.buffer == ["abc", "def"]
+    assert output_moderation.is_final_chunk is True
+
+
+def test_worker_keywords_matches_across_chunks(app: Flask, mock_sleep: MagicMock):
+    output_moderation = _create_output_moderation(rule_type="keywords")
+    output_moderation.buffer = ["this is forb"]
+
+    def sleep(seconds: float):
+        if len(output_moderation.buffer) == 1:
+            # the second chunk arrives after the first one has been checked
+            output_moderation.append_new_token("idden")
+        else:
+            output_moderation.thread_running = False
+
+    mock_sleep.side_effect = sleep
+    with patch.object(OutputModeration, "moderation") as moderation:
+        output_moderation.worker(flask_app=app, buffer_size=3)
+
+    moderation.assert_not_called()
+    mock_sleep.assert_called_once()
+    assert output_moderation.final_output == "blocked"
+    event = output_moderation.queue_manager.publish.call_args.args[0]
+    assert event.text == "blocked"
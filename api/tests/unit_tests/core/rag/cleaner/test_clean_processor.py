@@ -0,0 +1,40 @@
+import pytest
+
+from core.rag.cleaner.clean_processor import CleanProcessor
+
+ALL_RULES = {
+    "rules": {
+        "pre_processing_rules": [
+            {"id": "remove_extra_spaces", "enabled": True},
+            {"id": "remove_urls_emails", "enabled": True},
+        ]
+    }
+}
+
+
+@pytest.mark.parametrize(
+    ("text", "process_rule", "expected"),
+    [
+        ("<|endoftext|>\x00 text\ufffe", {}, "<endoftext> text"),
+        ("a  b\t\tc\n\n\n\nd", ALL_RULES, "a b c\n\nd"),
+        ("a  b\n\n\n", {}, "a  b\n\n\n"),
+        ("mail me@example.com or see https://example.com/page.", ALL_RULES, "mail  or see "),
+        (
+            "![logo](https://example.com/logo.png) and https://example.com",
+            ALL_RULES,
+            "![image](https://example.com/logo.png) and ",
+        ),
+        # a url directly before an image swallows the image, as it always did
+        ("http://a![x](http://b)", ALL_RULES, ")"),
+    ],
+)
+def test_clean(text: str, process_rule: dict, expected: str):
+    assert CleanProcessor.clean(text, process_rule) == expected
+
+
+def test_clean_keeps_many_markdown_images():
+    text = "".join(f"![img](https://example.com/{i}.png) https://example.com/{i}\n" for i in range(5000))
+
+    cleaned = CleanProcessor.clean(text, ALL_RULES)
+
+    assert cleaned == "".join(f"![image](https://example.com/{i}.png) \n" for i in range(5000))
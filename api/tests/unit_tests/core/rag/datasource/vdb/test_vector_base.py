@@ -0,0 +1,52 @@
+from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.models.document import Document
+
+
+class _FakeVector(BaseVector):
+    def __init__(self, existing_ids: set[str]):
+        super().__init__("collection")
+        self.existing_ids = existing_ids
+
+    def get_type(self) -> str:
+        return "fake"
+
+    def create(self, texts, embeddings, **kwargs):
+        pass
+
+    def add_texts(self, documents, embeddings, **kwargs):
+        pass
+
+    def text_exists(self, id: str) -> bool:
+        return id in self.existing_ids
+
+    def delete_by_ids(self, ids: list[str]) -> None:
+        pass
+
+    def delete_by_metadata_field(self, key: str, value: str) -> None:
+        pass
+
+    def search_by_vector(self, query_vector, **kwargs):
+        return []
+
+    def search_by_full_text(self, query: str, **kwargs):
+        return []
+
+    def delete(self) -> None:
+        pass
+
+
+def test_filter_existing_ids_defaults_to_text_exists():
+    vector = _FakeVector(existing_ids={"a", "c"})
+
+    assert vector.filter_existing_ids(["a", "b", "c"]) == {"a", "c"}
+
+
+def test_filter_duplicate_texts_keeps_new_documents():
+    vector = _FakeVector(existing_ids={"a"})
+    documents = [
+        Document(page_content="a", metadata={"doc_id": "a"}),
+        Document(page_content="b", metadata={"doc_id": "b"}),
+        Document(page_content="no id", metadata={}),
+    ]
+
+    assert vector._filter_duplicate_texts(documents) == documents[1:]
@@ -0,0 +1,81 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from core.rag.datasource.vdb.vector_factory import Vector
+from core.rag.models.document import Document
+
+
+def _create_vector() -> Vector:
+    with (
+        patch.object(Vector, "_get_embeddings", return_value=MagicMock()),
+        patch.object(Vector, "_init_vector", return_value=MagicMock()),
+    ):
+        vector = Vector(dataset=MagicMock())
+    vector._embeddings.embed_documents_with_usage.side_effect = lambda texts: ([[1.0]] * len(texts), len(texts))
+    return vector
+
+
+def _documents(count: int) -> list[Document]:
+    return [Document(page_content=f"text {i}", metadata={"doc_id": str(i)}) for i in range(count)]
+
+
+@pytest.mark.parametrize("pipeline_depth", [0, 1, 2])
+def test_create_writes_all_batches_in_order(app: Flask, pipeline_depth: int):
+    vector = _create_vector()
+    documents = _documents(2500)
+
+    with patch("core.rag.datasource.vdb.vector_factory.dify_config.VECTOR_CREATE_PIPELINE_DEPTH", pipeline_depth):
+        tokens = vector.create(documents)
+
+    assert tokens == 2500
+    batches = [call.kwargs["texts"] for call in vector._vector_processor.create.call_args_list]
+    assert batches == [documents[:1000], documents[1000:2000], documents[2000:]]
+
+
+def test_create_embeds_next_batch_while_writing(app: Flask):
+    vector = _create_vector()
+    second_batch_embedded = threading.Event()
+    overlapped = []
+
+    def embed(texts: list[str]):
+        if texts[0] == "text 1000":
+            second_batch_embedded.set()
+        return [[1.0]] * len(texts), len(texts)
+
+    def create(texts: list[Document], embeddings: list, **kwargs):
+        if texts[0].page_content == "text 0":
+            overlapped.append(second_batch_embedded.wait(timeout=5))
+
+    vector._embeddings.embed_documents_with_usage.side_effect = embed
+    vector._vector_processor.create.side_effect = create
+    with patch("core.rag.datasource.vdb.vector_factory.dify_config.VECTOR_CREATE_PIPELINE_DEPTH", 1):
+        vector.create(_documents(2000))
+
+    assert overlapped == [True]
+
+
+def test_create_raises_failed_batch_and_stops(app: Flask):
+    vector = _create_vector()
+    vector._vector_processor.create.side_effect = [ValueError("insert failed"), None, None]
+
+    with patch("core.rag.datasource.vdb.vector_factory.dify_config.VECTOR_CREATE_PIPELINE_DEPTH", 1):
+        with pytest.raises(ValueError, match="insert failed"):
+            vector.create(_documents(3000))
+
+    assert vector._vector_processor.create.call_count == 1
+
+
+def test_add_texts_filters_existing_documents_with_bulk_check():
+    vector = _create_vector()
+    documents = _documents(1500)
+    vector._vector_processor.filter_existing_ids.side_effect = lambda ids: {id for id in ids if int(id) % 2 == 0}
+
+    vector.add_texts(documents, duplicate_check=True)
+
+    assert vector._vector_processor.filter_existing_ids.call_count == 2
+    vector._vector_processor.text_exists.assert_not_called()
+    created = vector._vector_processor.create.call_args.kwargs["texts"]
+    assert created == [document for document in documents if int(document.metadata["doc_id"]) % 2 == 1]
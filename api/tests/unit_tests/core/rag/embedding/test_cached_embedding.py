@@ -0,0 +1,83 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.model_runtime.entities.text_embedding_entities import EmbeddingUsage, TextEmbeddingResult
+from core.rag.embedding import cached_embedding
+from core.rag.embedding.cached_embedding import CacheEmbedding, get_text_embedding_num_tokens
+
+
+def _embedding_result(count: int, tokens: int) -> TextEmbeddingResult:
+    return TextEmbeddingResult(
+        model="model",
+        embeddings=[[1.0, 0.0] for _ in range(count)],
+        usage=EmbeddingUsage(
+            tokens=tokens,
+            total_tokens=tokens,
+            unit_price=Decimal(0),
+            price_unit=Decimal(0),
+            total_price=Decimal(0),
+            currency="USD",
+            latency=0.1,
+        ),
+    )
+
+
+def _model_instance(max_chunks: int = 1) -> MagicMock:
+    model_instance = MagicMock()
+    model_instance.provider = "provider"
+    model_instance.model = "model"
+    model_schema = model_instance.model_type_instance.get_model_schema.return_value
+    model_schema.model_properties = {"max_chunks": max_chunks}
+    return model_instance
+
+
+@pytest.fixture(autouse=True)
+def clear_tokens_cache():
+    cached_embedding._text_tokens_cache.clear()
+    yield
+    cached_embedding._text_tokens_cache.clear()
+
+
+@pytest.fixture
+def mock_db():
+    with patch("core.rag.embedding.cached_embedding.db") as mock_db:
+        mock_db.session.query.return_value.filter_by.return_value.first.return_value = None
+        yield mock_db
+
+
+def test_embed_documents_with_usage_takes_tokens_from_embedding_result(mock_db: MagicMock):
+    model_instance = _model_instance()
+    model_instance.invoke_text_embedding.side_effect = [_embedding_result(1, 3), _embedding_result(1, 5)]
+
+    embeddings, tokens = CacheEmbedding(model_instance).embed_documents_with_usage(["abc", "defgh"])
+
+    assert embeddings == [[1.0, 0.0], [1.0, 0.0]]
+    assert tokens == 8
+    model_instance.get_text_embedding_num_tokens.assert_not_called()
+
+
+def test_embed_documents_with_usage_memoizes_tokens_of_cached_texts(mock_db: MagicMock):
+    model_instance = _model_instance()
+    model_instance.invoke_text_embedding.return_value = _embedding_result(1, 3)
+    CacheEmbedding(model_instance).embed_documents_with_usage(["abc"])
+
+    cached = MagicMock()
+    cached.get_embedding.return_value = [0.0, 1.0]
+    mock_db.session.query.return_value.filter_by.return_value.first.return_value = cached
+    embeddings, tokens = CacheEmbedding(model_instance).embed_documents_with_usage(["abc"])
+
+    assert embeddings == [[0.0, 1.0]]
+    assert tokens == 3
+    model_instance.get_text_embedding_num_tokens.assert_not_called()
+
+
+def test_get_text_embedding_num_tokens_only_counts_missing_texts():
+    model_instance = _model_instance()
+    model_instance.get_text_embedding_num_tokens.side_effect = lambda texts: [len(text) for text in texts]
+
+    assert get_text_embedding_num_tokens(model_instance, ["a", "bb"]) == [1, 2]
+    assert get_text_embedding_num_tokens(model_instance, ["bb", "ccc"]) == [2, 3]
+
+    assert model_instance.get_text_embedding_num_tokens.call_args_list[1].args == (["ccc"],)
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from core.rag.extractor.csv_extractor import CSVExtractor
+
+
+def test_extract_reads_rows_in_chunks(tmp_path: Path):
+    file_path = tmp_path / "file.csv"
+    file_path.write_text("a,b\n1,x\n,y\n3,z\n")
+    extractor = CSVExtractor(str(file_path))
+    extractor.chunk_size = 2
+
+    documents = extractor.extract()
+
+    assert [document.page_content for document in documents] == ["a: 1;b: x", "a: nan;b: y", "a: 3;b: z"]
+    assert [document.metadata["row"] for document in documents] == [0, 1, 2]
+
+
+def test_extract_uses_source_column(tmp_path: Path):
+    file_path = tmp_path / "file.csv"
+    file_path.write_text("a,source\n1,first\n2,second\n")
+
+    documents = CSVExtractor(str(file_path), source_column="source").extract()
+
+    assert [document.metadata["source"] for document in documents] == ["first", "second"]
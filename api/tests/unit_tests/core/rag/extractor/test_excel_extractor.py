@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from core.rag.extractor.excel_extractor import ExcelExtractor
+
+
+def test_extract_xlsx_rows_with_hyperlinks(tmp_path: Path):
+    wb = Workbook()
+    sheet = wb.active
+    sheet.append(["name", "url", "count"])
+    sheet.append(["a", "link", 1])
+    sheet.append([None, None, None])
+    sheet.append(["b", None, 2.5])
+    sheet["B2"].hyperlink = "https://example.com"
+    # a sheet whose table does not start at A1
+    other_sheet = wb.create_sheet("other")
+    other_sheet["B3"] = "header"
+    other_sheet["B4"] = "value"
+    file_path = tmp_path / "file.xlsx"
+    wb.save(file_path)
+
+    documents = ExcelExtractor(str(file_path)).extract()
+
+    assert [document.page_content for document in documents] == [
+        '"name":"a";"url":"[link](https://example.com)";"count":"1"',
+        '"name":"b";"count":"2.5"',
+        '"header":"value"',
+    ]
+    assert all(document.metadata == {"source": str(file_path)} for document in documents)
+
+
+def test_load_xlsx_is_lazy(tmp_path: Path):
+    wb = Workbook()
+    sheet = wb.active
+    sheet.append(["n"])
+    for i in range(1000):
+        sheet.append([i])
+    file_path = tmp_path / "file.xlsx"
+    wb.save(file_path)
+
+    documents = ExcelExtractor(str(file_path)).load()
+
+    assert next(documents).page_content == '"n":"0"'
+    assert next(documents).page_content == '"n":"1"'
@@ -0,0 +1,99 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from core.rag.extractor.pdf_extractor import PdfExtractor
+
+
+def _make_pdf(texts: list[str]) -> bytes:
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in texts:
+        stream = f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] /Contents {len(objects)} 0 R"
+            " /Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref_offset = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return content
+
+
+@pytest.fixture
+def mock_storage():
+    files: dict[str, bytes] = {}
+
+    def load(filename: str) -> bytes:
+        if filename not in files:
+            raise FileNotFoundError(filename)
+        return files[filename]
+
+    with patch("core.rag.extractor.pdf_extractor.storage") as mock_storage:
+        mock_storage.load.side_effect = load
+        mock_storage.save.side_effect = files.__setitem__
+        yield files
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_extract_caches_pages_by_file_content(tmp_path: Path, mock_storage: dict[str, bytes]):
+    content = _make_pdf(["page 0", "page 1"])
+    first_path = tmp_path / "first.pdf"
+    first_path.write_bytes(content)
+    second_path = tmp_path / "second.pdf"
+    second_path.write_bytes(content)
+
+    documents = PdfExtractor(str(first_path)).extract()
+    assert [document.page_content for document in documents] == ["page 0", "page 1"]
+    assert len(mock_storage) == 1
+
+    with patch.object(PdfExtractor, "load") as load:
+        cached_documents = PdfExtractor(str(second_path)).extract()
+
+    load.assert_not_called()
+    assert [document.page_content for document in cached_documents] == ["page 0", "page 1"]
+    assert [document.metadata for document in cached_documents] == [
+        {"source": str(second_path), "page": 0},
+        {"source": str(second_path), "page": 1},
+    ]
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_extract_without_cache(tmp_path: Path, mock_storage: dict[str, bytes]):
+    file_path = tmp_path / "file.pdf"
+    file_path.write_bytes(_make_pdf(["page 0"]))
+
+    with patch("core.rag.extractor.pdf_extractor.dify_config.PDF_EXTRACTION_CACHE_ENABLED", False):
+        documents = PdfExtractor(str(file_path)).extract()
+
+    assert [document.page_content for document in documents] == ["page 0"]
+    assert mock_storage == {}
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_parallel_extraction_keeps_page_order(tmp_path: Path):
+    texts = [f"page {i}" for i in range(10)]
+    file_path = tmp_path / "file.pdf"
+    file_path.write_bytes(_make_pdf(texts))
+
+    with (
+        patch("core.rag.extractor.pdf_extractor.dify_config.PDF_EXTRACTION_MAX_WORKERS", 2),
+        patch("core.rag.extractor.pdf_extractor.dify_config.PDF_EXTRACTION_PARALLEL_MIN_PAGES", 5),
+        patch.object(PdfExtractor, "_extract_in_parallel", wraps=PdfExtractor._extract_in_parallel) as parallel,
+    ):
+        documents = list(PdfExtractor(str(file_path)).load())
+
+    parallel.assert_called_once()
+    assert [document.page_content for document in documents] == texts
+    assert [document.metadata["page"] for document in documents] == list(range(10))
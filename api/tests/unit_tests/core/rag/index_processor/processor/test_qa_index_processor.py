@@ -0,0 +1,95 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from core.rag.index_processor.processor.qa_index_processor import QAIndexProcessor
+from core.rag.models.document import Document
+
+
+@pytest.fixture
+def mock_sleep():
+    with patch("core.rag.index_processor.processor.qa_index_processor.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+@pytest.fixture
+def mock_redis():
+    with patch("core.rag.index_processor.processor.qa_index_processor.redis_client") as mock_redis:
+        mock_redis.get.return_value = None
+        yield mock_redis
+
+
+def _chunks(count: int) -> list[Document]:
+    return [Document(page_content=f"chunk {i}", metadata={"doc_id": str(i)}) for i in range(count)]
+
+
+def test_generate_qa_documents_keeps_chunk_order(app: Flask, mock_redis: MagicMock, mock_sleep: MagicMock):
+    with patch(
+        "core.rag.index_processor.processor.qa_index_processor.LLMGenerator.generate_qa_document",
+        side_effect=lambda tenant_id, text, language: f"Q1: {text}?\nA1: answer",
+    ):
+        qa_documents = QAIndexProcessor()._generate_qa_documents(app, "tenant", _chunks(25), "English")
+
+    assert [document.page_content for document in qa_documents] == [f"chunk {i}?" for i in range(25)]
+    assert all(document.metadata["answer"] == "answer" for document in qa_documents)
+
+
+def test_slow_chunk_does_not_block_other_workers(app: Flask, mock_redis: MagicMock, mock_sleep: MagicMock):
+    others_done = threading.Event()
+    done = []
+
+    def generate(tenant_id: str, text: str, language: str) -> str:
+        if text == "chunk 0":
+            # the first chunk only finishes once all the others are generated by the remaining workers
+            assert others_done.wait(timeout=5)
+        else:
+            done.append(text)
+            if len(done) == 19:
+                others_done.set()
+        return f"Q1: {text}?\nA1: answer"
+
+    with (
+        patch("core.rag.index_processor.processor.qa_index_processor.dify_config.QA_GENERATION_MAX_WORKERS", 2),
+        patch(
+            "core.rag.index_processor.processor.qa_index_processor.LLMGenerator.generate_qa_document",
+            side_effect=generate,
+        ),
+    ):
+        qa_documents = QAIndexProcessor()._generate_qa_documents(app, "tenant", _chunks(20), "English")
+
+    assert len(qa_documents) == 20
+
+
+def test_generate_qa_response_retries_with_backoff(app: Flask, mock_redis: MagicMock, mock_sleep: MagicMock):
+    with patch(
+        "core.rag.index_processor.processor.qa_index_processor.LLMGenerator.generate_qa_document",
+        side_effect=[ValueError("rate limited"), ValueError("rate limited"), "Q1: q\nA1: a"],
+    ) as generate:
+        response = QAIndexProcessor()._generate_qa_response("tenant", "chunk", "English")
+
+    assert response == "Q1: q\nA1: a"
+    assert generate.call_count == 3
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2]
+    mock_redis.setex.assert_called_once()
+
+
+def test_generate_qa_response_reuses_saved_response(app: Flask, mock_redis: MagicMock, mock_sleep: MagicMock):
+    mock_redis.get.return_value = b"Q1: q\nA1: a"
+
+    with patch("core.rag.index_processor.processor.qa_index_processor.LLMGenerator.generate_qa_document") as generate:
+        response = QAIndexProcessor()._generate_qa_response("tenant", "chunk", "English")
+
+    assert response == "Q1: q\nA1: a"
+    generate.assert_not_called()
+
+
+def test_wait_for_rate_limit(mock_redis: MagicMock, mock_sleep: MagicMock):
+    mock_redis.incr.side_effect = [3, 1]
+
+    with patch("core.rag.index_processor.processor.qa_index_processor.dify_config.QA_GENERATION_TENANT_RATE_LIMIT", 2):
+        QAIndexProcessor._wait_for_rate_limit("tenant")
+
+    assert mock_redis.incr.call_count == 2
+    mock_sleep.assert_called_once()
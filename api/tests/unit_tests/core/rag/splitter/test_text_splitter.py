@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+from core.rag.splitter.fixed_text_splitter import FixedRecursiveCharacterTextSplitter
+from core.rag.splitter.text_splitter import RecursiveCharacterTextSplitter
+
+
+def test_fixed_recursive_splitter_splits_long_chunks():
+    splitter = FixedRecursiveCharacterTextSplitter.from_encoder(
+        embedding_model_instance=None,
+        chunk_size=20,
+        chunk_overlap=6,
+        fixed_separator="\n\n",
+        separators=["\n", " ", ""],
+    )
+    text = (
+        "short one\n\n"
+        "the quick brown fox jumps over the lazy dog\nand runs away\n\n"
+        "abcdefghijklmnopqrstuvwxyzabcdefghijkl"
+    )
+
+    assert splitter.split_text(text) == [
+        "short one",
+        "the quick brown fox",
+        "fox jumps over the",
+        "the lazy dog",
+        "and runs away",
+        "abcdefghijklmnopqrst",
+        "opqrstuvwxyzabcdefgh",
+        "cdefghijkl",
+    ]
+
+
+def test_fixed_recursive_splitter_splits_characters_with_overlap():
+    splitter = FixedRecursiveCharacterTextSplitter.from_encoder(
+        embedding_model_instance=None, chunk_size=10, chunk_overlap=3, fixed_separator="", separators=[""]
+    )
+
+    assert splitter.split_text("abcdefghij\nklmnopqrstuvwxyz") == ["abcdefghij", "hijklmnopq", "opqrstuvwx", "vwxyz"]
+
+
+def test_merge_splits_reuses_measured_lengths():
+    length_function = MagicMock(side_effect=lambda texts: [len(text) for text in texts])
+    splitter = RecursiveCharacterTextSplitter(chunk_size=10, chunk_overlap=4, length_function=length_function)
+    splits = ["aaa", "bbb", "ccc", "ddd", "eee"]
+
+    docs = splitter._merge_splits(splits, " ", [3] * len(splits))
+
+    assert docs == ["aaa bbb", "bbb ccc", "ccc ddd", "ddd eee"]
+    # only the separator is measured, popped pieces are not measured again
+    length_function.assert_called_once_with([" "])
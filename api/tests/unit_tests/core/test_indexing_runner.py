@@ -0,0 +1,49 @@
+from unittest.mock import MagicMock, patch
+
+from core.indexing_runner import IndexingRunner
+from core.rag.models.document import Document
+
+
+def _text_docs(count: int) -> list[Document]:
+    return [Document(page_content=f"page {i}", metadata={}) for i in range(count)]
+
+
+def _create_runner() -> IndexingRunner:
+    with patch("core.indexing_runner.ModelManager"):
+        runner = IndexingRunner()
+    runner._transform = MagicMock(side_effect=lambda index_processor, dataset, text_docs, *args: list(text_docs))
+    return runner
+
+
+def test_transform_batches_splits_text_documents():
+    runner = _create_runner()
+    text_docs = _text_docs(5)
+
+    with patch("core.indexing_runner.dify_config.INDEXING_PIPELINE_BATCH_SIZE", 2):
+        batches = runner._transform_batches(MagicMock(), MagicMock(), text_docs, "English", {"mode": "custom"})
+
+        # the next batch is only transformed once the previous one is consumed
+        assert next(batches) == text_docs[:2]
+        assert runner._transform.call_count == 1
+        assert list(batches) == [text_docs[2:4], text_docs[4:]]
+
+
+def test_transform_batches_keeps_full_doc_parent_mode_in_one_batch():
+    runner = _create_runner()
+    text_docs = _text_docs(5)
+    process_rule = {"mode": "hierarchical", "rules": {"parent_mode": "full-doc"}}
+
+    with patch("core.indexing_runner.dify_config.INDEXING_PIPELINE_BATCH_SIZE", 2):
+        batches = list(runner._transform_batches(MagicMock(), MagicMock(), text_docs, "English", process_rule))
+
+    assert batches == [text_docs]
+
+
+def test_transform_batches_disabled():
+    runner = _create_runner()
+    text_docs = _text_docs(5)
+
+    with patch("core.indexing_runner.dify_config.INDEXING_PIPELINE_BATCH_SIZE", 0):
+        batches = list(runner._transform_batches(MagicMock(), MagicMock(), text_docs, "English", {"mode": "custom"}))
+
+    assert batches == [text_docs]
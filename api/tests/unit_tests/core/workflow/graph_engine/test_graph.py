@@ -789,3 +789,35 @@ def test_parallels_graph6():
 
     for node_id in ["code1", "code2"]:
         assert graph.node_parallel_mapping[node_id] == child_parallel.id
+
+
+def test_init_cached():
+    graph_config = {
+        "edges": [
+            {"id": "start-source-llm-target", "source": "start", "target": "llm"},
+            {"id": "llm-source-answer-target", "source": "llm", "target": "answer"},
+        ],
+        "nodes": [
+            {"data": {"type": "start"}, "id": "start"},
+            {"data": {"type": "llm"}, "id": "llm"},
+            {"data": {"type": "answer", "title": "answer", "answer": "1"}, "id": "answer"},
+        ],
+    }
+
+    graph = Graph.init_cached(workflow_id="test-init-cached", graph_config=graph_config)
+
+    assert graph.node_ids == ["start", "llm", "answer"]
+    assert Graph.init_cached(workflow_id="test-init-cached", graph_config=graph_config) is graph
+    # each root node gets its own graph
+    assert (
+        Graph.init_cached(workflow_id="test-init-cached", graph_config=graph_config, root_node_id="start") is not graph
+    )
+    # no caching without a workflow id
+    assert Graph.init_cached(workflow_id=None, graph_config=graph_config) is not graph
+
+    changed_graph_config = {
+        "edges": graph_config["edges"][:1],
+        "nodes": graph_config["nodes"][:2],
+    }
+    changed_graph = Graph.init_cached(workflow_id="test-init-cached", graph_config=changed_graph_config)
+    assert changed_graph.node_ids == ["start", "llm"]
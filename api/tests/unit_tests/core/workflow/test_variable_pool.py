@@ -27,7 +27,7 @@ from core.variables.variables import (
     VariableUnion,
 )
 from core.workflow.constants import CONVERSATION_VARIABLE_NODE_ID, ENVIRONMENT_VARIABLE_NODE_ID, SYSTEM_VARIABLE_NODE_ID
-from core.workflow.entities.variable_pool import VariablePool
+from core.workflow.entities.variable_pool import VariablePool, _compile_template
 from core.workflow.system_variable import SystemVariable
 from factories.variable_factory import build_segment, segment_to_variable
 
@@ -80,6 +80,50 @@ def test_use_long_selector(pool):
     assert result.value == "test_value"
 
 
+def test_get_unknown_node_does_not_add_it(pool):
+    assert pool.get(("unknown_node", "var")) is None
+    assert "unknown_node" not in pool.variable_dictionary
+
+
+def test_remove_node_variables(pool):
+    pool.add(("node_1", "a"), 1)
+    pool.add(("node_1", "b"), "b")
+
+    pool.remove(("node_1", "a"))
+    assert pool.get(("node_1", "a")) is None
+    assert pool.get(("node_1", "b")).value == "b"
+
+    pool.remove(("node_1",))
+    assert "node_1" not in pool.variable_dictionary
+    # removing missing variables is a no-op
+    pool.remove(("node_1", "b"))
+    pool.remove(("node_2",))
+
+
+def test_add_raw_value(pool):
+    value = [{"id": 1}, {"id": 2}]
+    pool.add(("node_1", "items"), value)
+
+    variable = pool.variable_dictionary["node_1"]["items"]
+    assert isinstance(variable, ArrayObjectVariable)
+    assert variable.value == value
+    assert variable.value is not value
+    assert variable.selector == ["node_1", "items"]
+
+
+def test_convert_template_reuses_compiled_template():
+    template = "Hi {{#node_1.name#}}, see example.com and {{#node_1.missing#}}."
+    first_pool = VariablePool.empty()
+    first_pool.add(("node_1", "name"), "Alice")
+    second_pool = VariablePool.empty()
+    second_pool.add(("node_1", "name"), "Bob")
+
+    assert first_pool.convert_template(template).text == "Hi Alice, see example.com and node_1.missing."
+    hits = _compile_template.cache_info().hits
+    assert second_pool.convert_template(template).text == "Hi Bob, see example.com and node_1.missing."
+    assert _compile_template.cache_info().hits == hits + 1
+
+
 class TestVariablePool:
     def test_constructor(self):
         # Test with minimal required SystemVariable
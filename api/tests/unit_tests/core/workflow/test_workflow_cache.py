@@ -0,0 +1,82 @@
+import json
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from core.workflow.workflow_cache import WorkflowCache
+from models.model import EndUser
+from models.workflow import Workflow
+
+
+@pytest.fixture(autouse=True)
+def _clear_workflow_cache():
+    WorkflowCache.clear()
+    yield
+    WorkflowCache.clear()
+
+
+def test_get_or_create_reuses_value_for_same_raw():
+    factory = MagicMock(side_effect=lambda: object())
+
+    first = WorkflowCache.get_or_create("workflow-1", "graph", "raw", factory)
+    second = WorkflowCache.get_or_create("workflow-1", "graph", "raw", factory)
+
+    assert first is second
+    assert factory.call_count == 1
+
+
+def test_get_or_create_rebuilds_when_raw_changed():
+    first = WorkflowCache.get_or_create("workflow-1", "graph", "raw-1", lambda: "value-1")
+    second = WorkflowCache.get_or_create("workflow-1", "graph", "raw-2", lambda: "value-2")
+
+    assert (first, second) == ("value-1", "value-2")
+
+
+def test_get_or_create_skips_cache_without_workflow_id():
+    factory = MagicMock(return_value="value")
+
+    WorkflowCache.get_or_create(None, "graph", "raw", factory)
+    WorkflowCache.get_or_create(None, "graph", "raw", factory)
+
+    assert factory.call_count == 2
+
+
+def test_invalidate_drops_all_values_of_workflow():
+    WorkflowCache.get_or_create("workflow-1", "graph", "raw", lambda: "value")
+    WorkflowCache.get_or_create("workflow-2", "graph", "raw", lambda: "value")
+
+    WorkflowCache.invalidate("workflow-1")
+
+    assert WorkflowCache.get_or_create("workflow-1", "graph", "raw", lambda: "new") == "new"
+    assert WorkflowCache.get_or_create("workflow-2", "graph", "raw", lambda: "new") == "value"
+
+
+def test_workflow_graph_dict_is_parsed_once():
+    graph = {"nodes": [{"id": "start", "data": {"type": "start"}}], "edges": []}
+    workflow = Workflow.new(
+        tenant_id="tenant_id",
+        app_id="app_id",
+        type="workflow",
+        version="draft",
+        graph=json.dumps(graph),
+        features="{}",
+        created_by="account_id",
+        environment_variables=[],
+        conversation_variables=[],
+    )
+
+    assert workflow.graph_dict == graph
+    assert workflow.graph_dict is workflow.graph_dict
+
+    # the exported graph is a private copy
+    mock_user = Mock(spec=EndUser)
+    mock_user.tenant_id = "tenant_id"
+    with patch("models.workflow.current_user", mock_user):
+        exported_graph = workflow.to_dict()["graph"]
+    assert exported_graph == graph
+    assert exported_graph is not workflow.graph_dict
+
+    graph["nodes"].append({"id": "end", "data": {"type": "end"}})
+    workflow.graph = json.dumps(graph)
+
+    assert workflow.graph_dict == graph
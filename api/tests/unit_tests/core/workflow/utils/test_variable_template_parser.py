@@ -46,3 +46,14 @@ def test_invalid_references():
         assert selectors == [], fail_msg
         parser = variable_template_parser.VariableTemplateParser(c.template)
         assert parser.extract_variable_selectors() == [], fail_msg
+
+
+def test_parser_reuses_extracted_keys():
+    template = "{{#node_id.name#}} is {{#node_id.age#}}, {{#node_id.name#}}!"
+    parser = variable_template_parser.VariableTemplateParser(template)
+    assert sorted(parser.extract()) == ["#node_id.age#", "#node_id.name#"]
+
+    hits = variable_template_parser._extract_variable_keys.cache_info().hits
+    other_parser = variable_template_parser.VariableTemplateParser(template)
+    assert variable_template_parser._extract_variable_keys.cache_info().hits == hits + 1
+    assert other_parser.format({"#node_id.name#": "Bob", "#node_id.age#": 3}) == "Bob is 3, Bob!"
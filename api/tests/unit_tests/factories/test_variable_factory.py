@@ -279,6 +279,32 @@ def test_build_segment_array_any_with_nested_arrays():
     assert segment.value_type == SegmentType.ARRAY_ANY
 
 
+def test_build_segment_array_of_arrays():
+    segment = variable_factory.build_segment([[{"a": 1}], []])
+    assert isinstance(segment, ArrayAnySegment)
+    assert segment.value == [[{"a": 1}], []]
+
+
+def test_build_segment_rejects_unsupported_nested_value():
+    with pytest.raises(ValueError, match="not supported value"):
+        variable_factory.build_segment(["string", [object()]])
+
+
+def test_segment_to_variable_without_validation():
+    segment = variable_factory.build_segment([{"a": 1}, {"b": 2}])
+
+    variable = variable_factory.segment_to_variable(segment=segment, selector=["node", "out"], validate=False)
+
+    assert isinstance(variable, ArrayObjectVariable)
+    assert variable.value is segment.value
+    assert variable.name == "out"
+    assert variable.selector == ["node", "out"]
+    assert (
+        variable.model_dump()
+        == variable_factory.segment_to_variable(segment=segment, selector=["node", "out"], id=variable.id).model_dump()
+    )
+
+
 def test_build_segment_array_any_mixed_with_files():
     """Test building ArrayAnySegment from list with files and other types."""
     file = File(
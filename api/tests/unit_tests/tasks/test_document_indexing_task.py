@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock, patch
+
+from core.indexing_runner import DocumentIsPausedError
+from tasks.document_indexing_task import _run_concurrently, _run_document
+
+
+@patch("tasks.document_indexing_task.db")
+@patch("tasks.document_indexing_task.IndexingRunner")
+def test_run_document_returns_indexing_status(mock_runner_cls, mock_db):
+    document = MagicMock()
+    mock_db.session.query.return_value.where.return_value.first.return_value = document
+    mock_db.session.query.return_value.where.return_value.scalar.return_value = "completed"
+
+    assert _run_document(MagicMock(), "document-1") == "completed"
+    mock_runner_cls.return_value.run.assert_called_once_with([document])
+    mock_db.session.close.assert_called_once()
+
+
+@patch("tasks.document_indexing_task.db")
+@patch("tasks.document_indexing_task.IndexingRunner")
+def test_run_document_isolates_failures(mock_runner_cls, mock_db):
+    mock_runner_cls.return_value.run.side_effect = [DocumentIsPausedError("paused"), RuntimeError("boom")]
+
+    assert _run_document(MagicMock(), "document-1") == "paused"
+    assert _run_document(MagicMock(), "document-2") == "error"
+    assert mock_db.session.close.call_count == 2
+
+
+@patch("tasks.document_indexing_task.db")
+def test_run_document_skips_deleted_document(mock_db):
+    mock_db.session.query.return_value.where.return_value.first.return_value = None
+
+    assert _run_document(MagicMock(), "document-1") == "deleted"
+
+
+@patch("tasks.document_indexing_task._run_document")
+def test_run_concurrently_indexes_every_document(mock_run_document):
+    mock_run_document.side_effect = lambda flask_app, document_id: "error" if document_id == "b" else "completed"
+
+    _run_concurrently("dataset-1", ["a", "b", "c"], max_workers=2)
+
+    assert sorted(call.args[1] for call in mock_run_document.call_args_list) == ["a", "b", "c"]